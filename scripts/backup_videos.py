@@ -45,7 +45,21 @@ from urllib.parse import urlsplit
 import requests
 from retry import retry
 
-from common import LOG, DEFAULT_TIMEOUT, _rate_limit, _respect_retry_after
+from common import (
+    LOG,
+    DEFAULT_TIMEOUT,
+    _rate_limit,
+    _respect_retry_after,
+    add_concurrency_args,
+    add_hedging_args,
+    add_rate_limit_args,
+    concurrency_slot,
+    configure_concurrency,
+    configure_hedging,
+    configure_rate_limits,
+    hedged_get,
+    log_host_pauses,
+)
 
 # Retry config for network calls. The source object store is slow and flaky, so
 # we retry generously with exponential backoff (1s, 2s, 4s, ... capped at 120s).
@@ -114,10 +128,15 @@ def _download_request(url: str, tmp_path: Path, timeout: int):
 
     Retries with exponential backoff on network errors and unexpected status
     codes. A 404 raises VideoNotFound, which is not retried. On a 429/503 with a
-    Retry-After header we sleep as instructed before letting the retry fire.
+    Retry-After header every request to the host (the retry included) waits as
+    instructed.
     """
-    _rate_limit()
-    with requests.get(url, stream=True, timeout=timeout) as response:
+    _rate_limit(url)
+    with (
+        concurrency_slot(url) as slot,
+        hedged_get(url, timeout) as response,
+    ):
+        slot.response = response
         if response.status_code == 404:
             raise VideoNotFound(url)
         if response.status_code != 200:
@@ -136,8 +155,11 @@ def _download_request(url: str, tmp_path: Path, timeout: int):
 @retry(**RETRY_KWARGS)
 def _remote_content_length(url: str, timeout: int):
     """Return the remote Content-Length via a HEAD request, or None if unknown."""
-    _rate_limit()
-    response = requests.head(url, timeout=timeout, allow_redirects=True)
+    _rate_limit(url)
+    with concurrency_slot(url) as slot:
+        response = slot.response = requests.head(
+            url, timeout=timeout, allow_redirects=True
+        )
     if response.status_code == 404:
         return None
     if response.status_code != 200:
@@ -297,12 +319,21 @@ def main():
         default=DEFAULT_TIMEOUT,
         help=f"Per-request timeout in seconds (default: {DEFAULT_TIMEOUT}).",
     )
+    add_rate_limit_args(parser)
+    add_concurrency_args(parser)
+    add_hedging_args(parser)
     parser.add_argument(
         "-d", "--debug", action="store_true", help="Enable debug logging."
     )
     args = parser.parse_args()
 
     LOG.setLevel(logging.DEBUG if args.debug else logging.INFO)
+    configure_rate_limits(args.rate, args.rate_burst, args.rate_limit)
+    concurrency = configure_concurrency(
+        args.adaptive_concurrency, args.num_workers, args.max_concurrency
+    )
+    num_threads = args.max_concurrency if concurrency else args.num_workers
+    hedger = configure_hedging(args.hedge, args.hedge_budget, num_threads)
 
     if not args.data_file.exists():
         parser.error(f"Data file not found: {args.data_file}")
@@ -335,17 +366,28 @@ def main():
             url, args.dest, args.include_host, args.verify, args.dry_run, args.timeout
         )
 
-    with ThreadPoolExecutor(max_workers=args.num_workers) as executor:
-        futures = {executor.submit(run, url): url for url in urls}
-        for future in as_completed(futures):
-            record = future.result()
-            records.append(record)
-            with lock:
-                done += 1
-                if done % 100 == 0 or done == total:
-                    LOG.info(f"Progress: {done}/{total}")
+    # With adaptive concurrency the controller decides how many of these
+    # threads are downloading at any moment.
+    try:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            futures = {executor.submit(run, url): url for url in urls}
+            for future in as_completed(futures):
+                record = future.result()
+                records.append(record)
+                with lock:
+                    done += 1
+                    if done % 100 == 0 or done == total:
+                        LOG.info(f"Progress: {done}/{total}")
+    finally:
+        if hedger is not None:
+            hedger.close()
 
     summary = write_manifest(args.dest, records, args.data_file)
+    if concurrency is not None:
+        concurrency.log_stats()
+    if hedger is not None:
+        hedger.log_stats()
+    log_host_pauses()
 
     LOG.info(
         "Done. ok=%(ok)d skipped=%(skipped)d missing=%(missing)d failed=%(failed)d "
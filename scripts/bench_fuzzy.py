@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""
+Micro-benchmark for the "did you mean" index in fuzzy_index.py, over a
+fuzzy_index.json from make_fuzzy_index.py.
+
+"scan" works out the Levenshtein distance from the query to every term, the
+brute-force way to answer it. "index" is FuzzyIndex.did_you_mean, which only
+works out the distance to terms sharing enough trigrams with the query. Both
+must give identical suggestions; the script fails if they don't. The queries
+are terms with typos added (make_fuzzy_index.sample_queries).
+
+Usage:
+
+    uv run python bench_fuzzy.py --index ../assets/data/fuzzy_index.json --queries 1000
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from common import LOG
+from fuzzy_index import FuzzyIndex
+from make_fuzzy_index import DST, sample_queries
+
+
+def time_queries(lookup, queries, rounds: int) -> float:
+    """Return queries per second of [lookup] over [queries], best of
+    [rounds]."""
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for query in queries:
+            lookup(query)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return len(queries) / best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--index", type=Path, default=DST)
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=200,
+        help="How many misspelled terms to look up (default: 200).",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="Times to run every query; the best round is reported (default: 3).",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    LOG.setLevel(logging.INFO)
+    started = time.perf_counter()
+    index = FuzzyIndex.load(args.index)
+    LOG.info(f"Loaded {len(index.terms)} terms in {time.perf_counter() - started:.2f}s")
+    queries = sample_queries(index.terms, args.queries, args.seed)
+
+    found = 0
+    for query in queries:
+        suggestions = index.did_you_mean(query)
+        if suggestions != index.did_you_mean_scan(query):
+            LOG.error(f"The index and the scan disagree on {query!r}")
+            return 1
+        found += bool(suggestions)
+
+    scan = time_queries(index.did_you_mean_scan, queries, args.rounds)
+    indexed = time_queries(index.did_you_mean, queries, args.rounds)
+    LOG.info(
+        f"{len(queries)} queries ({found} with suggestions), best of "
+        f"{args.rounds} rounds: scan {scan:.1f} queries/s, index "
+        f"{indexed:.1f} queries/s ({indexed / scan:.1f}x)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+"""
+Micro-benchmark for the scrape_signbank page parser, run over saved word pages
+so it measures parsing alone with no network in the way.
+
+"before" builds two trees per page, which is what parse_information used to do
+(one for the word and sub-page links, another inside parse_subpage). "after" is
+the current parse_word_page, which builds one tree and runs every extractor on
+it. Both must produce identical results; the script fails if they don't.
+
+Usage:
+
+    # Save a handful of word pages to parse, e.g.
+    mkdir -p saved_pages
+    curl -s -o saved_pages/hello-1.html https://www.auslan.org.au/dictionary/words/hello-1.html
+
+    uv run python bench_parse.py --pages-dir saved_pages --rounds 5
+
+    # Or use every word page from a scrape's page archive.
+    uv run python bench_parse.py --archive page_archives/pages-20250101T040000Z.zip
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from common import (
+    DEFAULT_PARSER_BACKEND,
+    LOG,
+    PARSER_BACKENDS,
+    make_soup,
+    set_parser_backend,
+)
+from page_archive import load_corpus
+from scrape_signbank import (
+    parse_sub_entry,
+    parse_subpage_urls,
+    parse_word,
+    parse_word_page,
+)
+
+
+def parse_word_page_two_trees(text: str, url: str):
+    """The old parse path: one tree for the word page, a second for its SubEntry."""
+    soup = make_soup(text)
+    word = parse_word(soup)
+    sub_entry = parse_sub_entry(make_soup(text), word, url)
+    return word, sub_entry, parse_subpage_urls(soup)
+
+
+def time_parser(parse, pages, rounds: int) -> float:
+    """Return parses per second of [parse] over [pages], best of [rounds]."""
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for url, text in pages:
+            parse(text, url)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return len(pages) / best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    corpus_args = parser.add_mutually_exclusive_group(required=True)
+    corpus_args.add_argument(
+        "--pages-dir",
+        type=Path,
+        help="Directory of saved word pages (*.html).",
+    )
+    corpus_args.add_argument(
+        "--archive",
+        type=Path,
+        help="A page archive from scrape_signbank.py --archive-dir.",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="Times to parse the whole set; the best round is reported (default: 3).",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=PARSER_BACKENDS,
+        default=DEFAULT_PARSER_BACKEND,
+        help=f"HTML tree builder to parse with (default: {DEFAULT_PARSER_BACKEND}).",
+    )
+    args = parser.parse_args()
+
+    LOG.setLevel(logging.INFO)
+    set_parser_backend(args.parser)
+
+    pages = []
+    for name, text in load_corpus(args.pages_dir, args.archive):
+        try:
+            parse_word_page(text, name)
+        except Exception as e:
+            LOG.debug(f"Skipping {name}, it doesn't parse as a word page: {e}")
+            continue
+        pages.append((name, text))
+    if not pages:
+        parser.error("No parseable word pages found")
+
+    for url, text in pages:
+        if parse_word_page_two_trees(text, url) != parse_word_page(text, url):
+            LOG.error(f"Old and new parsers disagree on {url}")
+            return 1
+
+    before = time_parser(parse_word_page_two_trees, pages, args.rounds)
+    after = time_parser(parse_word_page, pages, args.rounds)
+    LOG.info(
+        f"{len(pages)} pages, best of {args.rounds} rounds: before {before:.1f} "
+        f"parses/s, after {after:.1f} parses/s ({after / before:.2f}x)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
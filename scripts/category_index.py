@@ -0,0 +1,73 @@
+"""
+A compact word -> categories reverse index of categories.json.
+
+categories.json maps each category to its words, but everything that uses it
+wants the other way round: which categories is this word in? The index is
+that, built once by scrape_categories.py instead of by everyone who reads
+categories.json:
+
+{
+    "version": "<hash of the rest>",
+    "categories": ["Animals", "Numbers", ...],
+    "words": {"aeroplane": [0, 12], ...}
+}
+
+Categories are numbered by their position in "categories" (categories.json's
+order) and each word lists its category ids in ascending order, i.e. in
+categories.json's order too. The version is a hash of the content, so anyone
+holding an older copy can tell whether it changed without comparing it all.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List
+
+
+def _version(categories: List[str], words: Dict[str, List[int]]) -> str:
+    content = json.dumps(
+        {"categories": categories, "words": words},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def build_category_index(data: Dict[str, List[str]]) -> dict:
+    """The index for [data], the category -> words map scrape_categories.py
+    writes as categories.json."""
+    categories = list(data)
+    words = {}
+    for category_id, category in enumerate(categories):
+        for word in data[category]:
+            words.setdefault(word, []).append(category_id)
+    words = {word: words[word] for word in sorted(words)}
+    return {
+        "version": _version(categories, words),
+        "categories": categories,
+        "words": words,
+    }
+
+
+def write_category_index(path: Path, index: dict):
+    with open(path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+
+def load_category_index(path: Path) -> dict:
+    """Load an index, raising if its content doesn't match its version."""
+    with open(path) as f:
+        index = json.load(f)
+    if _version(index["categories"], index["words"]) != index["version"]:
+        raise ValueError(f"{path} doesn't match its version, it's been modified")
+    return index
+
+
+def index_word_to_categories(index: dict) -> Dict[str, List[str]]:
+    """Word -> category names, as load_word_to_categories gives from
+    categories.json."""
+    categories = index["categories"]
+    return {
+        word: [categories[category_id] for category_id in category_ids]
+        for word, category_ids in index["words"].items()
+    }
@@ -0,0 +1,230 @@
+"""
+Change detection for incremental scrapes: which word pages can be skipped
+because nothing about them has changed since the last run.
+
+Most weeks almost nothing on Signbank changes, yet a full scrape fetches every
+word page and its sub-pages. The letter result pages are cheap (a few hundred
+fetches) and list every word, so we always fetch those, and fingerprint each
+word's row in them. The state file remembers, per word page URL, its row
+fingerprint from the last run, the entry it produced, and a fingerprint of that
+entry. A word page is only fetched again if it:
+
+- is new (we have no state for it),
+- has a row that changed,
+- failed last time, or its entry in the data we're building on is missing or
+  isn't the one we recorded (e.g. the data was restored from an older copy),
+- or shares its entry with another URL (so which one wins stays as in a full
+  scrape).
+
+Everything else is carried over unchanged from --existing-file. Words that
+disappear from the index are reported and dropped from the state. Their data
+is kept, as a full scrape over --existing-file would keep it.
+
+A row can stay the same while its page changes (a new video, say), so every
+letter gets a forced full refresh once it's more than --full-refresh-days
+old. A full refresh also counts how many entries changed without their row
+changing, i.e. what the fast path missed since the last refresh, so we can
+tell whether the interval is safe.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from common import LOG
+
+STATE_VERSION = 1
+
+DEFAULT_FULL_REFRESH_DAYS = 28
+
+
+def entry_fingerprint(info: dict) -> str:
+    """
+    Fingerprint of an entry's data (as from Entry.get_dict()). Categories are
+    left out: they're attached afterwards from scrape_categories.py's output,
+    not scraped from the word page.
+    """
+    info = {k: v for k, v in info.items() if k != "categories"}
+    data = json.dumps(info, sort_keys=True).encode()
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _rows_by_url(index: List[Tuple[str, str, str]]) -> Dict[str, Tuple[str, str]]:
+    """
+    URL -> (row fingerprint, letter) from the index, in order. A word page can
+    be listed in more than one row (one per keyword, say); its fingerprint
+    then covers all of them.
+    """
+    rows = {}
+    for url, row, letter in index:
+        rows.setdefault(url, ([], letter))[0].append(row)
+    return {
+        url: (row_list[0] if len(row_list) == 1 else _combine(row_list), letter)
+        for url, (row_list, letter) in rows.items()
+    }
+
+
+def _combine(fingerprints: List[str]) -> str:
+    return hashlib.sha256("\n".join(sorted(fingerprints)).encode()).hexdigest()[:16]
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class ChangeState:
+    """
+    The state file at [path]: word page URL -> {"letter", "row", "word",
+    "entry"}, plus when each letter last had a full refresh. Missing or from an
+    older version means everything gets fetched.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.words: Dict[str, dict] = {}
+        self.last_full_refresh: Dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                state = json.load(f)
+            if state.get("version") == STATE_VERSION:
+                self.words = state["words"]
+                self.last_full_refresh = state["last_full_refresh"]
+            else:
+                LOG.warning(f"Ignoring {self.path}, it's from an older version")
+
+    def full_refresh_due(self, letters: Iterable[str], max_age_days: int) -> bool:
+        """Whether any of [letters] hasn't had a full refresh in
+        [max_age_days]."""
+        cutoff = _now() - datetime.timedelta(days=max_age_days)
+        for letter in letters:
+            last = self.last_full_refresh.get(letter)
+            if last is None or datetime.datetime.fromisoformat(last) < cutoff:
+                return True
+        return False
+
+    def plan(
+        self,
+        index: List[Tuple[str, str, str]],
+        word_to_info: dict,
+        full_refresh: bool,
+    ) -> List[str]:
+        """
+        Given (word page URL, row fingerprint, letter) for every word page in
+        the letter pages, in order, return the URLs to fetch, in the same
+        order. The rest are carried over from [word_to_info].
+        """
+        rows = _rows_by_url(index)
+        if full_refresh:
+            LOG.info(f"Change detection: full refresh, fetching all {len(rows)}")
+            return [url for url, _, _ in index]
+
+        # Entries more than one URL produces: fetch them all, or none.
+        shared = Counter(known["word"] for known in self.words.values())
+        reasons = Counter()
+        urls = []
+        for url, (row, _) in rows.items():
+            known = self.words.get(url)
+            if known is None:
+                reason = "new"
+            elif known["row"] != row:
+                reason = "changed"
+            elif known["word"] not in word_to_info:
+                reason = "missing"
+            elif entry_fingerprint(word_to_info[known["word"]]) != known["entry"]:
+                reason = "stale"
+            elif shared[known["word"]] > 1:
+                reason = "shared"
+            else:
+                reasons["unchanged"] += 1
+                continue
+            reasons[reason] += 1
+            urls.append(url)
+        LOG.info(
+            f"Change detection: fetching {len(urls)} of {len(rows)} word pages "
+            f"({reasons['new']} new, {reasons['changed']} changed, "
+            f"{reasons['missing']} missing from the data, {reasons['stale']} "
+            f"stale in the data, {reasons['shared']} sharing an entry), "
+            f"carrying over {reasons['unchanged']}"
+        )
+        return urls
+
+    def record(
+        self,
+        letters: Iterable[str],
+        index: List[Tuple[str, str, str]],
+        fetched: List[str],
+        entries: list,
+        full_refresh: bool,
+    ):
+        """
+        Update the state after scraping [letters]. [index] is (URL, row
+        fingerprint, letter) for every word page in their letter pages,
+        [fetched] the URLs we fetched and [entries] what came of them (each
+        Entry knows its URL; ones that failed are simply absent).
+        """
+        letters = set(letters)
+        by_url = {entry.url: entry for entry in entries}
+        fetched = set(fetched)
+        changed = missed = 0
+        rows = _rows_by_url(index)
+        for url, (row, letter) in rows.items():
+            if url not in fetched:
+                # Carried over: nothing new to learn.
+                continue
+            old = self.words.get(url)
+            entry = by_url.get(url)
+            if entry is None:
+                # Failed; try again next time.
+                self.words.pop(url, None)
+                continue
+            fingerprint = entry_fingerprint(entry.get_dict()[entry.entry_in_english])
+            if old is not None and old.get("entry") != fingerprint:
+                changed += 1
+                if old["row"] == row:
+                    missed += 1
+            self.words[url] = {
+                "letter": letter,
+                "row": row,
+                "word": entry.entry_in_english,
+                "entry": fingerprint,
+            }
+
+        removed = [
+            url
+            for url, known in self.words.items()
+            if known["letter"] in letters and url not in rows
+        ]
+        for url in removed:
+            del self.words[url]
+        if removed:
+            LOG.info(
+                f"Change detection: {len(removed)} word pages are no longer "
+                "listed; their data is kept"
+            )
+
+        LOG.info(f"Change detection: {changed} known entries changed")
+        if full_refresh:
+            if missed:
+                LOG.warning(
+                    f"Full refresh found {missed} entries that changed without "
+                    "their row in the letter pages changing; incremental runs "
+                    "since the last full refresh missed these"
+                )
+            stamp = _now().isoformat(timespec="seconds")
+            for letter in letters:
+                self.last_full_refresh[letter] = stamp
+
+    def save(self):
+        state = {
+            "version": STATE_VERSION,
+            "last_full_refresh": self.last_full_refresh,
+            "words": self.words,
+        }
+        tmp_path = self.path.with_name(self.path.name + ".part")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+"""
+Check that every HTML parser backend (PARSER_BACKENDS in common.py) extracts
+exactly the same data from a corpus of saved Signbank pages.
+
+The scrapers can run on a faster tree builder than html.parser via --parser,
+but tree builders disagree on broken markup, and Signbank's markup isn't
+always tidy. Before switching backends, run this over a corpus of saved pages:
+it runs every page-level parser the scrapers use (word pages, letter result
+pages, category result pages and the home page's category dropdown) over
+every page with every backend and fails if any backend disagrees with
+html.parser, either in the data it extracts (Entry/SubEntry fields, word
+URLs, category words) or in whether the page parses at all.
+
+Usage:
+
+    uv run python check_parser_parity.py --pages-dir saved_pages
+
+    # A page archive from scrape_signbank.py --archive-dir makes a good corpus.
+    uv run python check_parser_parity.py --archive page_archives/pages-20250101T040000Z.zip
+
+Exit codes: 0 all backends agree; 1 some page parsed differently.
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from common import DEFAULT_PARSER_BACKEND, LOG, PARSER_BACKENDS, set_parser_backend
+from page_archive import load_corpus
+from scrape_categories import parse_categories, parse_results_page
+from scrape_signbank import parse_letter_page, parse_word_page
+
+# Every page-level parser the scrapers use. Each is run over every page; most
+# raise on pages of the wrong kind, and raising is part of what's compared.
+EXTRACTORS = {
+    "word_page": lambda text, name: parse_word_page(text, name),
+    "letter_page": lambda text, name: parse_letter_page(text),
+    "category_results_page": lambda text, name: parse_results_page(text),
+    "categories_dropdown": lambda text, name: parse_categories(text),
+}
+
+
+def run_extractors(pages, backend: str) -> dict:
+    """Return (page name, extractor name) -> outcome for one backend. An outcome
+    is ("ok", result) or ("error", exception type name)."""
+    set_parser_backend(backend)
+    outcomes = {}
+    for name, text in pages:
+        for extractor_name, extractor in EXTRACTORS.items():
+            try:
+                outcome = ("ok", extractor(text, name))
+            except Exception as e:
+                outcome = ("error", type(e).__name__)
+            outcomes[(name, extractor_name)] = outcome
+    return outcomes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    corpus_args = parser.add_mutually_exclusive_group(required=True)
+    corpus_args.add_argument(
+        "--pages-dir",
+        type=Path,
+        help="Directory of saved Signbank pages (*.html).",
+    )
+    corpus_args.add_argument(
+        "--archive",
+        type=Path,
+        help="A page archive from scrape_signbank.py --archive-dir.",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="*",
+        choices=PARSER_BACKENDS,
+        default=list(PARSER_BACKENDS),
+        help="Backends to compare against html.parser (default: all of them).",
+    )
+    parser.add_argument("-d", "--debug", action="store_true")
+    args = parser.parse_args()
+
+    LOG.setLevel(logging.DEBUG if args.debug else logging.INFO)
+
+    pages = load_corpus(args.pages_dir, args.archive)
+    if not pages:
+        parser.error("No pages found")
+
+    # Parsing with html.parser also logs (e.g. unexpected region images); only
+    # the differences are interesting here.
+    LOG.setLevel(logging.ERROR)
+    reference = run_extractors(pages, DEFAULT_PARSER_BACKEND)
+    LOG.setLevel(logging.DEBUG if args.debug else logging.INFO)
+    parsed = sum(1 for outcome in reference.values() if outcome[0] == "ok")
+    LOG.info(
+        f"{len(pages)} pages, {parsed} successful extractions with "
+        f"{DEFAULT_PARSER_BACKEND}"
+    )
+
+    mismatches = 0
+    for backend in args.backends:
+        if backend == DEFAULT_PARSER_BACKEND:
+            continue
+        outcomes = run_extractors(pages, backend)
+        backend_mismatches = 0
+        for key, expected in reference.items():
+            if outcomes[key] != expected:
+                backend_mismatches += 1
+                name, extractor_name = key
+                LOG.error(
+                    f"{backend} disagrees with {DEFAULT_PARSER_BACKEND} on "
+                    f"{extractor_name} for {name}: {outcomes[key]!r} != {expected!r}"
+                )
+        LOG.info(f"{backend}: {backend_mismatches} mismatches")
+        mismatches += backend_mismatches
+
+    if mismatches:
+        LOG.error(f"{mismatches} mismatches; don't switch backends until fixed.")
+        return 1
+    LOG.info("All backends agree.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
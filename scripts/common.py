@@ -1,11 +1,24 @@
+import argparse
 import asyncio
+import hashlib
+import importlib.util
+import json
 import logging
+import os
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from email.utils import parsedate_to_datetime
+from pathlib import Path
 from typing import List, Optional
+from urllib.parse import urlsplit
 
 import requests
-from retry import retry
+from bs4 import BeautifulSoup, FeatureNotFound
+from requests.structures import CaseInsensitiveDict
+
+from page_archive import PageArchiveReader
 
 LOG = logging.getLogger(__name__)
 formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
@@ -52,29 +65,449 @@ USER_AGENT = (
 )
 
 
-def make_session() -> requests.Session:
-    """A requests Session with our User-Agent set."""
+def make_session(pool_size: Optional[int] = None) -> requests.Session:
+    """A requests Session with our User-Agent set. Pass [pool_size] if more
+    than 10 threads will share it, so each can keep its own connection."""
     session = requests.Session()
     session.headers["User-Agent"] = USER_AGENT
+    if pool_size is not None:
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
     return session
 
 
+# Tree builders BeautifulSoup can parse Signbank pages with. html.parser is pure
+# Python and always available but slow; lxml is C-accelerated and several times
+# faster, but isn't a runtime dependency; it's in the dev group, which `uv run`
+# installs.
+# check_parser_parity.py proves every backend extracts identical data from a
+# corpus of saved pages; run it before switching the default.
+PARSER_BACKENDS = ("html.parser", "lxml")
+DEFAULT_PARSER_BACKEND = "html.parser"
+_parser_backend = DEFAULT_PARSER_BACKEND
+
+
+def set_parser_backend(name: str):
+    """Make every make_soup() call use the [name] tree builder. Raises if it
+    isn't one of PARSER_BACKENDS or isn't installed."""
+    global _parser_backend
+    if name not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend {name!r}, expected one of {PARSER_BACKENDS}"
+        )
+    try:
+        BeautifulSoup("", name)
+    except FeatureNotFound as e:
+        raise ValueError(
+            f"Parser backend {name!r} isn't installed. Run with "
+            f"`uv run --with {name} ...`."
+        ) from e
+    _parser_backend = name
+
+
+def get_parser_backend() -> str:
+    return _parser_backend
+
+
+def make_soup(text: str) -> BeautifulSoup:
+    """Parse [text] with the configured parser backend."""
+    return BeautifulSoup(text, _parser_backend)
+
+
 # Default timeout for HTTP requests.
 DEFAULT_TIMEOUT = 180
 
-# Rate limiting settings.
-MIN_REQUEST_INTERVAL = 0.1  # Minimum seconds between requests.
-_last_request_time = 0
+# Default per-host rate limit: requests per second, and how many requests may
+# go back to back after a quiet spell. 10/s with no burst is one request every
+# 0.1s, the limit we've always scraped at.
+DEFAULT_RATE_LIMIT = 10.0
+DEFAULT_RATE_BURST = 1
+
+
+class RateLimiter:
+    """
+    Per-host token buckets. Each host gets [rate] tokens a second, holding at
+    most [burst]; every request spends one, waiting for it if the bucket is
+    empty. Hosts are independent, so e.g. the Signbank scrape and Nectar media
+    downloads don't slow each other down, and each can be given its own limit.
+
+    A request reserves its token under a lock and only then sleeps, so
+    concurrent callers queue up behind one another at exactly [rate] instead of
+    all seeing the same idle bucket and firing together. That makes it safe to
+    share between threads and coroutines alike: wait() sleeps the calling
+    thread, wait_async() the calling task.
+    """
+
+    def __init__(
+        self, rate: float = DEFAULT_RATE_LIMIT, burst: int = DEFAULT_RATE_BURST
+    ):
+        self.default = (rate, burst)
+        self._limits = {}
+        # host -> (tokens, as of when). Tokens go negative when requests have
+        # reserved ones that haven't accrued yet.
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def set_limit(self, host: str, rate: float, burst: int = DEFAULT_RATE_BURST):
+        """Limit [host] to [rate] requests a second (0 for no limit)."""
+        with self._lock:
+            self._limits[host.lower()] = (rate, burst)
+            self._buckets.pop(host.lower(), None)
+
+    def reserve(self, url: str) -> float:
+        """Take a token for [url]'s host, returning how long to wait before
+        using it."""
+        host = (urlsplit(url).hostname or "").lower()
+        rate, burst = self._limits.get(host, self.default)
+        if rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate) - 1
+            self._buckets[host] = (tokens, now)
+        return -tokens / rate if tokens < 0 else 0.0
+
+    def wait(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_rate_limiter = RateLimiter()
+
+
+def _rate_limit(url: str):
+    """Wait our turn to request [url], to avoid overwhelming its host: until
+    any Retry-After pause on the host is over, then for a token."""
+    _host_pauses.wait(url)
+    _rate_limiter.wait(url)
+
+
+async def _rate_limit_async(url: str):
+    """_rate_limit for coroutines: waits on the event loop, not the thread."""
+    await _host_pauses.wait_async(url)
+    await _rate_limiter.wait_async(url)
+
+
+def configure_rate_limits(
+    default_rate: float = DEFAULT_RATE_LIMIT,
+    default_burst: int = DEFAULT_RATE_BURST,
+    host_limits: Optional[List[str]] = None,
+) -> RateLimiter:
+    """
+    Replace the shared rate limiter. [host_limits] are HOST=RATE[:BURST]
+    overrides as given to --rate-limit, e.g. "www.auslan.org.au=5:2".
+    """
+    global _rate_limiter
+    limiter = RateLimiter(default_rate, default_burst)
+    for spec in host_limits or []:
+        host, sep, limit = spec.partition("=")
+        rate, _, burst = limit.partition(":")
+        try:
+            if not sep or not host:
+                raise ValueError
+            limiter.set_limit(
+                host, float(rate), int(burst) if burst else DEFAULT_RATE_BURST
+            )
+        except ValueError:
+            raise ValueError(
+                f"Bad rate limit {spec!r}, expected HOST=RATE[:BURST]"
+            ) from None
+    _rate_limiter = limiter
+    return limiter
+
+
+def add_rate_limit_args(parser):
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE_LIMIT,
+        help="Requests per second to make to each host (default: "
+        f"{DEFAULT_RATE_LIMIT:g}; 0 for no limit).",
+    )
+    parser.add_argument(
+        "--rate-burst",
+        type=int,
+        default=DEFAULT_RATE_BURST,
+        help="How many requests to a host may go back to back before --rate "
+        f"applies (default: {DEFAULT_RATE_BURST}).",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="append",
+        metavar="HOST=RATE[:BURST]",
+        help="Override --rate/--rate-burst for one host. Repeatable.",
+    )
+
+
+# Adaptive concurrency (--adaptive-concurrency). Each host starts at the
+# script's --num-workers and is adjusted AIMD-style between 1 and
+# --max-concurrency: one more slot after every window of requests that came
+# back healthy, half as many as soon as the host pushes back.
+DEFAULT_MAX_CONCURRENCY = 64
+# Fewest requests a window needs before we judge it (a window is also at least
+# one full round of the current limit).
+CONCURRENCY_MIN_WINDOW = 20
+# Only grow while the window's p95 latency is within this factor (plus a little
+# slack, in seconds, so jitter on fast responses doesn't count) of the best
+# window p95 seen, i.e. while the host isn't queueing our requests.
+CONCURRENCY_LATENCY_TOLERANCE = 1.5
+CONCURRENCY_LATENCY_SLACK = 0.05
+# ... and while at most this fraction of the window failed.
+CONCURRENCY_MAX_ERROR_RATE = 0.05
+# How often to log each host's current concurrency, in seconds.
+CONCURRENCY_LOG_INTERVAL = 30
+
+OK = "ok"
+ERROR = "error"
+THROTTLED = "throttled"
+
+
+def _classify_outcome(response, exc) -> tuple:
+    """(OK | ERROR | THROTTLED, reason) for one request. 429/503, anything
+    with a Retry-After and timeouts mean the host wants us to slow down."""
+    if response is not None:
+        if response.status_code in (429, 503):
+            return THROTTLED, str(response.status_code)
+        if "Retry-After" in response.headers:
+            return THROTTLED, "Retry-After"
+        if response.status_code >= 500:
+            return ERROR, str(response.status_code)
+        return OK, None
+    if exc is None:
+        return OK, None
+    if isinstance(exc, (TimeoutError, requests.exceptions.Timeout)):
+        return THROTTLED, "timeout"
+    return ERROR, type(exc).__name__
+
+
+class _HostConcurrency:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        # Bumped on every decrease, so requests that were already in flight
+        # when we backed off can't make us back off again.
+        self.epoch = 0
+        self.latencies = []
+        self.errors = 0
+        self.best_p95 = None
+        self.last_p95 = None
+        self.lowest = self.highest = limit
+        self.decreases = 0
+        # (loop, future) for coroutines waiting on a slot.
+        self.waiters = []
+
+
+class ConcurrencyController:
+    """
+    AIMD control of how many requests we have in flight to each host, so we
+    neither crawl along at a fixed guess on a good day nor burn the retry
+    ladder on a bad one.
+
+    Every request holds a slot for its host while it runs (see
+    concurrency_slot). After each window of completed requests, if their p95
+    latency is close to the best we've seen and hardly any failed, the host
+    gets one more slot. The first 429/503, Retry-After or timeout halves its
+    slots at once. Each host's limit is logged every CONCURRENCY_LOG_INTERVAL
+    seconds, and log_stats() sums up the run.
+
+    Slots can be taken from threads and coroutines alike, so callers need at
+    least --max-concurrency workers for the limit to have room to grow.
+    """
+
+    def __init__(self, initial: int, maximum: int = DEFAULT_MAX_CONCURRENCY):
+        self.initial = max(1, min(initial, maximum))
+        self.maximum = maximum
+        self._cond = threading.Condition()
+        self._hosts = {}
+        self._last_log = time.monotonic()
+
+    def _host(self, url: str):
+        host = (urlsplit(url).hostname or "").lower()
+        if host not in self._hosts:
+            self._hosts[host] = _HostConcurrency(self.initial)
+        return host, self._hosts[host]
+
+    def enter(self, url: str) -> int:
+        """Block until [url]'s host has a free slot and take it. Returns the
+        epoch to hand back to leave()."""
+        with self._cond:
+            _, state = self._host(url)
+            while state.in_flight >= state.limit:
+                self._cond.wait()
+            state.in_flight += 1
+            return state.epoch
+
+    async def enter_async(self, url: str) -> int:
+        """enter() for coroutines: waits on the event loop, not the thread."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                _, state = self._host(url)
+                if state.in_flight < state.limit:
+                    state.in_flight += 1
+                    return state.epoch
+                waiter = loop.create_future()
+                state.waiters.append((loop, waiter))
+            await waiter
+
+    def leave(self, url: str, epoch: int, latency: float, outcome: str, reason):
+        """Give back the slot from enter(), adjusting the host's limit."""
+        with self._cond:
+            host, state = self._host(url)
+            state.in_flight -= 1
+            if outcome == THROTTLED:
+                if epoch == state.epoch and state.limit > 1:
+                    old = state.limit
+                    state.limit = max(1, state.limit // 2)
+                    state.epoch += 1
+                    state.decreases += 1
+                    state.lowest = min(state.lowest, state.limit)
+                    state.latencies, state.errors = [], 0
+                    LOG.warning(
+                        f"{host} pushed back ({reason}); concurrency {old} -> "
+                        f"{state.limit}"
+                    )
+            else:
+                state.latencies.append(latency)
+                state.errors += outcome == ERROR
+                if len(state.latencies) >= max(CONCURRENCY_MIN_WINDOW, state.limit):
+                    self._end_window(state)
+            self._maybe_log()
+            waiters, state.waiters = state.waiters, []
+            self._cond.notify_all()
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    def _end_window(self, state: _HostConcurrency):
+        latencies = sorted(state.latencies)
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        if state.best_p95 is None or p95 < state.best_p95:
+            state.best_p95 = p95
+        threshold = (
+            state.best_p95 * CONCURRENCY_LATENCY_TOLERANCE + CONCURRENCY_LATENCY_SLACK
+        )
+        healthy = (
+            state.errors <= CONCURRENCY_MAX_ERROR_RATE * len(latencies)
+            and p95 <= threshold
+        )
+        if healthy and state.limit < self.maximum:
+            state.limit += 1
+            state.highest = max(state.highest, state.limit)
+        state.last_p95 = p95
+        state.latencies, state.errors = [], 0
+
+    def _maybe_log(self):
+        now = time.monotonic()
+        if now - self._last_log < CONCURRENCY_LOG_INTERVAL:
+            return
+        self._last_log = now
+        for host, state in self._hosts.items():
+            p95 = state.last_p95
+            LOG.info(
+                f"Concurrency for {host}: {state.limit} "
+                f"({state.in_flight} in flight"
+                + (f", p95 {p95 * 1000:.0f}ms" if p95 is not None else "")
+                + ")"
+            )
+
+    def log_stats(self):
+        for host, state in self._hosts.items():
+            LOG.info(
+                f"Adaptive concurrency for {host}: started at {self.initial}, "
+                f"ended at {state.limit} (ranged {state.lowest}-{state.highest}), "
+                f"backed off {state.decreases} times"
+            )
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class RequestSlot:
+    """
+    A request's hold on its host's concurrency, from concurrency_slot(). Set
+    .response once there is one; it (or the exception that escapes, if
+    there's no response) tells the controller how the request went.
+    """
+
+    def __init__(self, controller: Optional[ConcurrencyController], url: str):
+        self.controller = controller
+        self.url = url
+        self.response = None
+
+    def __enter__(self):
+        if self.controller is not None:
+            self._epoch = self.controller.enter(self.url)
+        self._started = time.monotonic()
+        return self
 
+    async def __aenter__(self):
+        if self.controller is not None:
+            self._epoch = await self.controller.enter_async(self.url)
+        self._started = time.monotonic()
+        return self
 
-def _rate_limit():
-    """Simple rate limiting to avoid overwhelming the server."""
-    global _last_request_time
-    now = time.time()
-    elapsed = now - _last_request_time
-    if elapsed < MIN_REQUEST_INTERVAL:
-        time.sleep(MIN_REQUEST_INTERVAL - elapsed)
-    _last_request_time = time.time()
+    def __exit__(self, exc_type, exc, tb):
+        if self.controller is not None:
+            outcome, reason = _classify_outcome(self.response, exc)
+            self.controller.leave(
+                self.url,
+                self._epoch,
+                time.monotonic() - self._started,
+                outcome,
+                reason,
+            )
+        return False
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+_concurrency: Optional[ConcurrencyController] = None
+
+
+def concurrency_slot(url: str) -> RequestSlot:
+    """Hold a slot for a request to [url] (with or async with). A no-op unless
+    configure_concurrency() turned adaptive concurrency on."""
+    return RequestSlot(_concurrency, url)
+
+
+def configure_concurrency(
+    enabled: bool, initial: int, maximum: int = DEFAULT_MAX_CONCURRENCY
+) -> Optional[ConcurrencyController]:
+    """Turn adaptive concurrency on (starting each host at [initial]) or off.
+    Returns the controller, or None if off."""
+    global _concurrency
+    _concurrency = ConcurrencyController(initial, maximum) if enabled else None
+    return _concurrency
+
+
+def add_concurrency_args(parser):
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Start each host at --num-workers concurrent requests, then adapt: "
+        "grow while latency holds steady, halve on 429/503, Retry-After or "
+        "timeouts.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="With --adaptive-concurrency, the most concurrent requests to "
+        f"any one host (default: {DEFAULT_MAX_CONCURRENCY}).",
+    )
 
 
 # Cap on how long we'll honor a server's Retry-After header (seconds), so a
@@ -82,15 +515,15 @@ def _rate_limit():
 RETRY_AFTER_CAP = 120
 
 
-def _respect_retry_after(response):
+def _retry_after_delay(response) -> Optional[float]:
     """
-    If the server sent a Retry-After header (typically with a 429 or 503),
-    sleep for the requested duration (capped) so we back off politely. Supports
-    both the integer-seconds and HTTP-date forms of the header.
+    How long the server's Retry-After header (typically sent with a 429 or
+    503) asks us to wait, capped at RETRY_AFTER_CAP, or None if it didn't ask.
+    Supports both the integer-seconds and HTTP-date forms of the header.
     """
     header = response.headers.get("Retry-After")
     if not header:
-        return
+        return None
     delay = None
     try:
         delay = float(header)
@@ -100,28 +533,770 @@ def _respect_retry_after(response):
         except (TypeError, ValueError):
             delay = None
     if delay and delay > 0:
-        delay = min(delay, RETRY_AFTER_CAP)
-        LOG.warning(f"Server asked us to back off; sleeping {delay:.0f}s (Retry-After)")
-        time.sleep(delay)
-
-
-@retry(
-    exceptions=(requests.exceptions.RequestException, RuntimeError),
-    delay=1,
-    backoff=2,
-    max_delay=120,
-    tries=10,
-    logger=LOG,
-)
+        return min(delay, RETRY_AFTER_CAP)
+    return None
+
+
+class HostPauses:
+    """
+    Per-host "send nothing before" times, set from Retry-After.
+
+    When one worker gets told to back off, every request to that host waits
+    out the pause (in _rate_limit), rather than the other workers carrying on,
+    collecting 429s of their own and each starting its own sleep. A throttling
+    storm becomes one pause for the whole host, which ends as soon as the
+    longest Retry-After we were given does. Safe to share between threads and
+    coroutines.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._until = {}
+        # host -> (seconds of wall-clock time paused, Retry-After responses)
+        self._stats = {}
+
+    def pause(self, url: str, delay: float) -> bool:
+        """Hold requests to [url]'s host for [delay] seconds from now. Returns
+        whether that started a pause or extended one by at least a second, i.e.
+        whether it's news worth logging."""
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            now = time.monotonic()
+            until = self._until.get(host, now)
+            paused, responses = self._stats.get(host, (0.0, 0))
+            extra = now + delay - max(until, now)
+            if extra > 0:
+                self._until[host] = now + delay
+                paused += extra
+            self._stats[host] = (paused, responses + 1)
+        return extra >= min(1, delay)
+
+    def remaining(self, url: str) -> float:
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            return self._until.get(host, 0) - time.monotonic()
+
+    def wait(self, url: str):
+        # Loop, since the pause can be extended while we sleep.
+        while (delay := self.remaining(url)) > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str):
+        while (delay := self.remaining(url)) > 0:
+            await asyncio.sleep(delay)
+
+    def log_stats(self):
+        for host, (paused, responses) in self._stats.items():
+            LOG.info(
+                f"Paused all requests to {host} for {paused:.0f}s in total, after "
+                f"{responses} Retry-After responses"
+            )
+
+
+_host_pauses = HostPauses()
+
+
+def log_host_pauses():
+    _host_pauses.log_stats()
+
+
+def _respect_retry_after(response):
+    """
+    If the server sent a Retry-After header, pause every request to its host
+    for the requested duration (capped) so we back off politely. Returns
+    straight away; the next request to the host waits in _rate_limit.
+    """
+    delay = _retry_after_delay(response)
+    if delay and _host_pauses.pause(response.url, delay):
+        host = urlsplit(response.url).hostname
+        LOG.warning(
+            f"Server asked us to back off; pausing requests to {host} for "
+            f"{delay:.0f}s (Retry-After)"
+        )
+
+
+# load_url's retry ladder (AsyncFetcher.load_url's too): 1s, 2s, 4s, ...
+# capped at 120s, 10 tries.
+RETRY_DELAY = 1
+RETRY_BACKOFF = 2
+RETRY_MAX_DELAY = 120
+RETRY_TRIES = 10
+
+# With a RetryGuard, retries may make up at most this fraction of the requests
+# sent in the last RETRY_BUDGET_WINDOW seconds, plus DEFAULT_RETRY_BUDGET_MIN so
+# a trickle of failures on a quiet run still gets retried.
+DEFAULT_RETRY_BUDGET = 0.2
+DEFAULT_RETRY_BUDGET_MIN = 10
+RETRY_BUDGET_WINDOW = 300
+# How often to log that retries are being refused, in seconds.
+RETRY_BUDGET_LOG_INTERVAL = 60
+# A host's circuit breaker opens after this many failed requests in a row
+# (errors, 5xx, 429s, timeouts) and lets one probe through after this many
+# seconds. Every failed probe doubles the wait, up to BREAKER_MAX_COOLDOWN.
+DEFAULT_BREAKER_FAILURES = 10
+DEFAULT_BREAKER_COOLDOWN = 30
+BREAKER_MAX_COOLDOWN = 300
+
+
+class HostUnavailableError(RuntimeError):
+    """A request wasn't sent, since its host's circuit breaker is open.
+    Deliberately not something load_url retries."""
+
+
+class _HostBreaker:
+    def __init__(self, cooldown: float):
+        self.cooldown = cooldown
+        # Failed requests in a row.
+        self.failures = 0
+        # When a probe may be sent, while the breaker is open.
+        self.open_until = None
+        self.opened_at = None
+        self.probing = False
+        self.times_opened = 0
+        self.seconds_open = 0.0
+        self.failed_fast = 0
+
+
+class RetryGuard:
+    """
+    Limits on how hard load_url retries when a host is down: a retry budget
+    shared by every request, and a circuit breaker per host.
+
+    On its own, load_url's ladder retries each URL for about ten minutes, on
+    every worker at once, so an outage costs hours. Under a RetryGuard,
+    retries may only be a fraction of the requests recently sent, so once
+    most requests are failing the budget runs dry and failures are raised
+    straight away instead of retried. And after [breaker_failures] failures in
+    a row a host's breaker opens: requests to it raise HostUnavailableError
+    without being sent, until [cooldown] seconds have passed and one request
+    at a time is let through to probe whether it's back. A successful probe
+    closes the breaker, a failed one reopens it for twice as long. Safe to
+    share between threads and coroutines.
+    """
+
+    def __init__(
+        self,
+        budget: float,
+        budget_min: int,
+        breaker_failures: int,
+        cooldown: float,
+    ):
+        self.budget = budget
+        self.budget_min = budget_min
+        self.breaker_failures = breaker_failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        # When each request and retry in the budget window was sent.
+        self._sent = deque()
+        self._retried = deque()
+        self._hosts = {}
+        self._last_refusal_log = None
+        self.retries = 0
+        self.refused_retries = 0
+
+    def _host(self, url: str):
+        host = (urlsplit(url).hostname or "").lower()
+        if host not in self._hosts:
+            self._hosts[host] = _HostBreaker(self.cooldown)
+        return host, self._hosts[host]
+
+    def _trim(self, now: float):
+        for sent in (self._sent, self._retried):
+            while sent and sent[0] < now - RETRY_BUDGET_WINDOW:
+                sent.popleft()
+
+    def admit(self, url: str) -> bool:
+        """Before sending a request to [url]: raises HostUnavailableError if
+        its host's breaker is open, otherwise returns whether the request is
+        the probe."""
+        with self._lock:
+            now = time.monotonic()
+            host, state = self._host(url)
+            probe = False
+            if state.open_until is not None:
+                if state.probing or now < state.open_until:
+                    state.failed_fast += 1
+                    raise HostUnavailableError(
+                        f"Not sending {url}: {host} is down (circuit breaker "
+                        f"open after {state.failures} failed requests in a row)"
+                    )
+                state.probing = probe = True
+                LOG.info(f"Probing whether {host} is back with {url}")
+            self._sent.append(now)
+            self._trim(now)
+            return probe
+
+    def release(self, url: str, probe: bool, response, exc):
+        """After a request admit() let through: how it went, i.e. the
+        [response] if there is one, else the [exc] it raised."""
+        with self._lock:
+            now = time.monotonic()
+            host, state = self._host(url)
+            if exc is not None and not isinstance(exc, Exception):
+                # Cancelled or interrupted, so it tells us nothing. If it was
+                # the probe, the next request gets to probe instead.
+                if probe:
+                    state.probing = False
+                return
+            outcome, reason = _classify_outcome(response, exc)
+            if outcome == OK:
+                if state.open_until is not None:
+                    LOG.info(f"{host} is back, closing its circuit breaker")
+                    state.seconds_open += now - state.opened_at
+                    state.open_until = state.opened_at = None
+                    state.cooldown = self.cooldown
+                state.failures = 0
+                state.probing = False
+                return
+            state.failures += 1
+            if probe:
+                state.cooldown = min(state.cooldown * 2, BREAKER_MAX_COOLDOWN)
+                state.open_until = now + state.cooldown
+                state.probing = False
+                LOG.warning(
+                    f"{host} is still down ({reason}), next probe in "
+                    f"{state.cooldown:.0f}s"
+                )
+            elif (
+                state.open_until is None
+                and self.breaker_failures
+                and state.failures >= self.breaker_failures
+            ):
+                state.open_until = now + state.cooldown
+                state.opened_at = now
+                state.times_opened += 1
+                LOG.warning(
+                    f"{state.failures} requests to {host} failed in a row (last: "
+                    f"{reason}), opening its circuit breaker: failing requests "
+                    f"to it fast, probing again in {state.cooldown:.0f}s"
+                )
+
+    def allow_retry(self, url: str) -> bool:
+        """Whether a request to [url] that just failed may be retried, taking
+        the retry out of the budget if so."""
+        with self._lock:
+            now = time.monotonic()
+            _, state = self._host(url)
+            if state.open_until is not None:
+                # The retry would only fail fast.
+                return False
+            self._trim(now)
+            allowed = self.budget_min + self.budget * len(self._sent)
+            if len(self._retried) >= allowed:
+                self.refused_retries += 1
+                last_log = self._last_refusal_log
+                if last_log is None or now - last_log >= RETRY_BUDGET_LOG_INTERVAL:
+                    self._last_refusal_log = now
+                    LOG.warning(
+                        f"Retry budget exhausted ({len(self._retried)} retries "
+                        f"for {len(self._sent)} requests in the last "
+                        f"{RETRY_BUDGET_WINDOW}s), failing without retrying "
+                        f"({self.refused_retries} refused so far)"
+                    )
+                return False
+            self._retried.append(now)
+            self.retries += 1
+            return True
+
+    def log_stats(self):
+        LOG.info(
+            f"Retries: {self.retries} made, {self.refused_retries} refused by "
+            f"the retry budget"
+        )
+        for host, state in self._hosts.items():
+            if not state.times_opened:
+                continue
+            seconds_open = state.seconds_open
+            if state.opened_at is not None:
+                seconds_open += time.monotonic() - state.opened_at
+            LOG.info(
+                f"Circuit breaker for {host} opened {state.times_opened} times, "
+                f"open for {seconds_open:.0f}s in total, failed "
+                f"{state.failed_fast} requests fast"
+            )
+
+
+class GuardedAttempt:
+    """
+    One attempt at a request, from guarded_attempt(). Set .response once
+    there is one; it (or the exception that escapes, if there's no response)
+    tells the RetryGuard whether the host is up.
+    """
+
+    def __init__(self, guard: Optional[RetryGuard], url: str):
+        self.guard = guard
+        self.url = url
+        self.response = None
+
+    def __enter__(self):
+        if self.guard is not None:
+            self._probe = self.guard.admit(self.url)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.guard is not None:
+            self.guard.release(self.url, self._probe, self.response, exc)
+        return False
+
+
+_retry_guard: Optional[RetryGuard] = None
+
+
+def guarded_attempt(url: str) -> GuardedAttempt:
+    """Wrap one attempt at a request to [url] (with). Raises
+    HostUnavailableError if its host's breaker is open. A no-op unless
+    configure_retry_guard() was called."""
+    return GuardedAttempt(_retry_guard, url)
+
+
+def _should_retry(url: str, exc: Exception) -> bool:
+    if isinstance(exc, HostUnavailableError):
+        return False
+    guard = _retry_guard
+    return guard is None or guard.allow_retry(url)
+
+
+def configure_retry_guard(
+    budget: float, budget_min: int, breaker_failures: int, cooldown: float
+) -> RetryGuard:
+    """Put load_url's retries under a RetryGuard, returning it for its
+    stats. A [breaker_failures] of 0 leaves out the circuit breaker."""
+    global _retry_guard
+    _retry_guard = RetryGuard(budget, budget_min, breaker_failures, cooldown)
+    return _retry_guard
+
+
+def add_retry_guard_args(parser):
+    parser.add_argument(
+        "--retry-budget",
+        type=float,
+        default=DEFAULT_RETRY_BUDGET,
+        help="Retries may be at most this fraction of the requests sent in the "
+        f"last {RETRY_BUDGET_WINDOW}s, plus --retry-budget-min (default: "
+        f"{DEFAULT_RETRY_BUDGET}).",
+    )
+    parser.add_argument(
+        "--retry-budget-min",
+        type=int,
+        default=DEFAULT_RETRY_BUDGET_MIN,
+        help="Retries allowed in any window however few requests were sent "
+        f"(default: {DEFAULT_RETRY_BUDGET_MIN}).",
+    )
+    parser.add_argument(
+        "--breaker-failures",
+        type=int,
+        default=DEFAULT_BREAKER_FAILURES,
+        help="Stop sending requests to a host after this many fail in a row, "
+        f"bar one probe at a time (default: {DEFAULT_BREAKER_FAILURES}, 0 to "
+        "never stop).",
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=DEFAULT_BREAKER_COOLDOWN,
+        help="Seconds before probing a host that's stopped being sent "
+        f"requests, doubling after every failed probe up to "
+        f"{BREAKER_MAX_COOLDOWN} (default: {DEFAULT_BREAKER_COOLDOWN}).",
+    )
+
+
+# Hedged media downloads: the fewest requests to a host we need to have timed
+# before we know its p95 time to first byte and start hedging, and how many of
+# the most recent we keep.
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW = 200
+# At most this fraction of requests get a duplicate.
+DEFAULT_HEDGE_BUDGET = 0.1
+
+
+class Hedger:
+    """
+    Hedged GETs for the slow, flaky media host, where one stuck connection
+    can hold a worker for the whole DEFAULT_TIMEOUT before the retry ladder
+    even starts.
+
+    get() sends the request and, if its response headers haven't arrived
+    within the host's p95 time to first byte (of the last HEDGE_WINDOW
+    requests, once there are HEDGE_MIN_SAMPLES), sends a duplicate and returns
+    whichever answers first, closing the other when it does. Only [budget] of
+    all requests may be hedged, so a slow host at most gets that much extra
+    load. Responses are streamed, so "answers" means its headers arrived; the
+    body is read by the caller. Duplicates wait for the rate limit like any
+    request, but don't take a concurrency slot.
+
+    The requests run on a pool of their own, two per caller thread, so it
+    needs [num_threads], the most callers there'll be at once. close() it
+    when done, so its threads don't outlive the downloads.
+    """
+
+    def __init__(self, budget: float, num_threads: int):
+        self.budget = budget
+        self._pool = ThreadPoolExecutor(
+            max_workers=2 * num_threads, thread_name_prefix="hedge"
+        )
+        self._lock = threading.Lock()
+        # host -> time to first byte of its most recent requests.
+        self._samples = {}
+        # host -> [requests, hedged, duplicate answered first]
+        self._stats = {}
+
+    def _host(self, url: str) -> str:
+        return (urlsplit(url).hostname or "").lower()
+
+    def _p95(self, host: str) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(host, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    def _send(self, url: str, timeout: int, hedge: bool) -> requests.Response:
+        if hedge:
+            _rate_limit(url)
+        started = time.monotonic()
+        response = requests.get(url, stream=True, timeout=timeout)
+        with self._lock:
+            samples = self._samples.setdefault(
+                self._host(url), deque(maxlen=HEDGE_WINDOW)
+            )
+            samples.append(time.monotonic() - started)
+        return response
+
+    def get(self, url: str, timeout: int) -> requests.Response:
+        """requests.get(url, stream=True, timeout=timeout), hedged."""
+        host = self._host(url)
+        with self._lock:
+            stats = self._stats.setdefault(host, [0, 0, 0])
+            stats[0] += 1
+        deadline = self._p95(host)
+        primary = self._pool.submit(self._send, url, timeout, False)
+        futures = [primary]
+        if deadline is not None and not wait(futures, timeout=deadline).done:
+            with self._lock:
+                hedge = stats[1] + 1 <= self.budget * stats[0]
+                stats[1] += hedge
+            if hedge:
+                LOG.debug(f"No answer from {url} after {deadline:.1f}s, hedging")
+                futures.append(self._pool.submit(self._send, url, timeout, True))
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    continue
+                if future is not primary:
+                    with self._lock:
+                        stats[2] += 1
+                for other in futures:
+                    if other is not future:
+                        other.add_done_callback(_close_response)
+                return future.result()
+        raise primary.exception()
+
+    def close(self):
+        """Stop the pool without waiting: queued requests are cancelled, and
+        ones in flight are only waited for by their own timeout."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def log_stats(self):
+        for host, (sent, hedged, won) in self._stats.items():
+            p95 = self._p95(host)
+            LOG.info(
+                f"Hedging for {host}: hedged {hedged} of {sent} requests"
+                + (f" (p95 first byte {p95:.1f}s)" if p95 is not None else "")
+                + f", the duplicate answered first {won} times"
+            )
+
+
+def _close_response(future):
+    if future.exception() is None:
+        future.result().close()
+
+
+_hedger: Optional[Hedger] = None
+
+
+def hedged_get(url: str, timeout: int) -> requests.Response:
+    """requests.get(url, stream=True, timeout=timeout), hedged if
+    configure_hedging() turned hedging on."""
+    hedger = _hedger
+    if hedger is None:
+        return requests.get(url, stream=True, timeout=timeout)
+    return hedger.get(url, timeout)
+
+
+def configure_hedging(
+    enabled: bool, budget: float, num_threads: int
+) -> Optional[Hedger]:
+    """Turn hedged_get's hedging on (or off), returning the Hedger for its
+    stats. The caller close()s it once done downloading."""
+    global _hedger
+    if _hedger is not None:
+        _hedger.close()
+    _hedger = Hedger(budget, num_threads) if enabled else None
+    return _hedger
+
+
+def add_hedging_args(parser):
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="If a download hasn't started answering within the host's p95 "
+        "time to first byte, send a duplicate and use whichever answers first.",
+    )
+    parser.add_argument(
+        "--hedge-budget",
+        type=float,
+        default=DEFAULT_HEDGE_BUDGET,
+        help="With --hedge, the most downloads that may get a duplicate, as a "
+        f"fraction of all of them (default: {DEFAULT_HEDGE_BUDGET}).",
+    )
+
+
+class HttpCache:
+    """
+    A size-bounded on-disk cache of 200 responses, revalidated with conditional
+    GETs.
+
+    Each cached response is a body file plus a JSON sidecar holding the URL,
+    headers and validators (ETag / Last-Modified). load_url sends the
+    validators as If-None-Match / If-Modified-Since, and on a 304 serves the
+    body from disk instead of downloading it again. Only responses that carry
+    a validator are stored, since nothing else can be revalidated. When the
+    bodies exceed max_bytes the least recently used ones are evicted.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (body size, last used), for eviction without rescanning.
+        self._index = {}
+        for body_path in self.directory.glob("*.body"):
+            stat = body_path.stat()
+            self._index[body_path.stem] = (stat.st_size, stat.st_mtime)
+        self.stored = 0
+        self.revalidated = 0
+        self.revalidated_bytes = 0
+        self.evicted = 0
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return key, self.directory / f"{key}.body", self.directory / f"{key}.json"
+
+    def _read_meta(self, url: str) -> Optional[dict]:
+        _, _, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        # Guard against a (vanishingly unlikely) hash collision.
+        return meta if meta["url"] == url else None
+
+    def validators(self, url: str) -> dict:
+        """Conditional request headers for [url], empty if it isn't cached."""
+        meta = self._read_meta(url)
+        if meta is None:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url: str, not_modified: requests.Response):
+        """
+        Build the cached response for [url] after the server answered
+        [not_modified] (a 304), or return None if it's no longer cached.
+        """
+        key, body_path, _ = self._paths(url)
+        meta = self._read_meta(url)
+        if meta is None:
+            return None
+        try:
+            body = body_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        os.utime(body_path, (now, now))
+        with self._lock:
+            self._index[key] = (len(body), now)
+            self.revalidated += 1
+            self.revalidated_bytes += len(body)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = meta["url"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = meta["encoding"]
+        response.request = not_modified.request
+        response._content = body
+        return response
+
+    def store(self, url: str, response: requests.Response):
+        """Cache a 200 [response] for [url] if it has a validator."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        key, body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+        }
+        body = response.content
+        # Write via temp files + rename so a concurrent reader or an
+        # interrupted run never sees a partial entry. Body first: a sidecar
+        # without its body just reads as a miss.
+        suffix = f".{threading.get_ident()}.part"
+        tmp_body = body_path.with_name(body_path.name + suffix)
+        tmp_body.write_bytes(body)
+        os.replace(tmp_body, body_path)
+        tmp_meta = meta_path.with_name(meta_path.name + suffix)
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+        with self._lock:
+            self._index[key] = (len(body), time.time())
+            self.stored += 1
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes. Called with
+        the lock held."""
+        total = sum(size for size, _ in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_bytes:
+                break
+            for suffix in (".json", ".body"):
+                try:
+                    (self.directory / f"{key}{suffix}").unlink()
+                except FileNotFoundError:
+                    pass
+            del self._index[key]
+            total -= size
+            self.evicted += 1
+
+    def log_stats(self):
+        with self._lock:
+            total = sum(size for size, _ in self._index.values())
+            LOG.info(
+                f"HTTP cache: {self.revalidated} responses served from disk after "
+                f"a 304 ({self.revalidated_bytes} bytes not re-downloaded), "
+                f"{self.stored} stored, {self.evicted} evicted, {len(self._index)} "
+                f"entries ({total} bytes) in {self.directory}"
+            )
+
+
+# The cache load_url revalidates against, if configure_http_cache was called.
+_http_cache: Optional[HttpCache] = None
+
+DEFAULT_HTTP_CACHE_MAX_MB = 2048
+
+
+def configure_http_cache(directory: Optional[Path], max_mb: int) -> Optional[HttpCache]:
+    """Make load_url (and so get_pages_html) use an on-disk conditional-GET
+    cache in [directory], or no cache if [directory] is None."""
+    global _http_cache
+    _http_cache = HttpCache(directory, max_mb * 1024 * 1024) if directory else None
+    return _http_cache
+
+
+def add_http_cache_args(parser):
+    parser.add_argument(
+        "--http-cache-dir",
+        type=Path,
+        help="Cache responses here and revalidate them with conditional GETs "
+        "on later runs, so unchanged pages aren't downloaded again.",
+    )
+    parser.add_argument(
+        "--http-cache-max-mb",
+        type=int,
+        default=DEFAULT_HTTP_CACHE_MAX_MB,
+        help="Evict least recently used cache entries beyond this size "
+        f"(default: {DEFAULT_HTTP_CACHE_MAX_MB}).",
+    )
+
+
+# Pages load_url records to (a PageArchiveWriter) or replays from instead of
+# the network (a PageArchiveReader), if configure_page_archive was called. See
+# page_archive.py.
+_page_archive = None
+
+
+def configure_page_archive(archive):
+    """Make load_url record every page it fetches into [archive], or serve
+    every page from it without the network, depending on whether it's a
+    PageArchiveWriter or a PageArchiveReader. None turns archiving off."""
+    global _page_archive
+    _page_archive = archive
+    return archive
+
+
 def load_url(url: str, timeout: int = DEFAULT_TIMEOUT) -> requests.Response:
     """
     Load a URL with retry logic.
     Raises RuntimeError on non-200 status codes after retries are exhausted.
     Retries with exponential backoff: 1s, 2s, 4s, 8s, 16s, 32s, 64s, 120s, 120s...
+    unless a RetryGuard (see configure_retry_guard) says not to.
     """
+    archive = _page_archive
+    if isinstance(archive, PageArchiveReader):
+        return archive.load(url)
+    delay = RETRY_DELAY
+    for attempt in range(1, RETRY_TRIES + 1):
+        try:
+            return _load_url_once(url, timeout)
+        except (requests.exceptions.RequestException, RuntimeError) as e:
+            if attempt == RETRY_TRIES or not _should_retry(url, e):
+                raise
+            LOG.warning(f"{e}, retrying in {delay} seconds...")
+            time.sleep(delay)
+            delay = min(delay * RETRY_BACKOFF, RETRY_MAX_DELAY)
+
+
+def _load_url_once(url: str, timeout: int) -> requests.Response:
     LOG.debug(f"Getting HTML for URL: {url}")
-    _rate_limit()
-    response = requests.get(url, timeout=timeout)
+    cache = _http_cache
+    with guarded_attempt(url) as attempt:
+        _rate_limit(url)
+        headers = cache.validators(url) if cache is not None else {}
+        with concurrency_slot(url) as slot:
+            response = slot.response = requests.get(
+                url, timeout=timeout, headers=headers
+            )
+        revalidated = False
+        if response.status_code == 304 and cache is not None:
+            cached = cache.load(url, response)
+            if cached is not None:
+                response = cached
+                revalidated = True
+            else:
+                # Evicted since we sent the validators; fetch it unconditionally.
+                _rate_limit(url)
+                with concurrency_slot(url) as slot:
+                    response = slot.response = requests.get(url, timeout=timeout)
+        attempt.response = response
+    if response.status_code in (429, 503):
+        _respect_retry_after(response)
+    _check_status(url, response)
+    _record_response(url, response, revalidated)
+    return response
+
+
+def _check_status(url: str, response: requests.Response):
     if response.status_code != 200:
         # Include enough detail to tell a blocked scraper (WAF / captcha /
         # rate limiting) apart from the site just being down.
@@ -131,7 +1306,16 @@ def load_url(url: str, timeout: int = DEFAULT_TIMEOUT) -> requests.Response:
             f"Our user agent: {response.request.headers.get('User-Agent')!r}. "
             f"Start of body: {response.text[:500]!r}"
         )
-    return response
+
+
+def _record_response(url: str, response: requests.Response, revalidated: bool):
+    """Hand a successful response to the HTTP cache and page archive, if any."""
+    cache = _http_cache
+    if cache is not None and not revalidated:
+        cache.store(url, response)
+    archive = _page_archive
+    if archive is not None:
+        archive.add(url, response)
 
 
 def load_url_safe(
@@ -148,6 +1332,383 @@ def load_url_safe(
         return None
 
 
+def load_journal(path: Path) -> List[dict]:
+    """
+    The records in a JSON lines checkpoint journal, in order. If the last
+    append was interrupted, the partial line is cut off so later appends start
+    on a fresh line; whatever it recorded just gets redone.
+    """
+    records = []
+    with open(path, "rb+") as f:
+        offset = 0
+        for line_num, line in enumerate(f, 1):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("no newline")
+                record = json.loads(line)
+            except ValueError:
+                LOG.warning(f"Dropping incomplete line {line_num} of {path}")
+                f.truncate(offset)
+                break
+            records.append(record)
+            offset += len(line)
+    return records
+
+
+def append_journal(path: Path, record: dict):
+    """Append a record to a checkpoint journal. Flushed to disk before
+    returning, so a crash straight after can't lose it."""
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# Maximum concurrent requests an AsyncFetcher makes, across all hosts, and
+# the most keep-alive connections it holds open to any one host.
+DEFAULT_MAX_IN_FLIGHT = 64
+DEFAULT_CONNECTIONS_PER_HOST = 32
+
+
+class AsyncFetcher:
+    """
+    An asyncio-native HTTP engine, an alternative to running load_url on a
+    ThreadPoolExecutor (one blocked OS thread per in-flight request, and no
+    connection reuse since load_url doesn't use a Session).
+
+    Requests go through one aiohttp session with a pool of keep-alive
+    connections per host, and at most max_in_flight of them run at once no
+    matter how many coroutines are waiting, so hundreds of requests can be in
+    flight without hundreds of threads. load_url() has load_url's semantics:
+    the same retry ladder, the same RuntimeError diagnostics on a non-200, and
+    it uses the HTTP cache and page archive just the same. It also honours
+    Retry-After on a 429/503 before retrying, without blocking the loop.
+
+    get_pages_html and fetch_page accept one in place of an executor. aiohttp
+    isn't a hard dependency, it's the `async` extra: `uv run --extra async`.
+
+        async with AsyncFetcher(max_in_flight=200) as fetcher:
+            pages = await get_pages_html(fetcher, urls)
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        connections_per_host: int = DEFAULT_CONNECTIONS_PER_HOST,
+        timeout: int = DEFAULT_TIMEOUT,
+    ):
+        self.max_in_flight = max_in_flight
+        self.connections_per_host = connections_per_host
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._session = None
+
+    async def __aenter__(self):
+        try:
+            import aiohttp
+        except ImportError as e:
+            raise RuntimeError(
+                "The asyncio HTTP engine needs aiohttp. Run with "
+                "`uv run --extra async ...`."
+            ) from e
+        # What request() raises when the request itself fails, as opposed to
+        # getting an unwanted status (the analogue of RequestException).
+        self.request_errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.max_in_flight,
+                limit_per_host=self.connections_per_host,
+            ),
+            headers={"User-Agent": USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            # Honour HTTP(S)_PROXY like requests does.
+            trust_env=True,
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+
+    async def request(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        allow_redirects: bool = True,
+        body_cap: Optional[int] = None,
+    ) -> requests.Response:
+        """
+        One GET, no retries and no status check, returned as a
+        requests.Response so callers can treat it like any other. With
+        [body_cap], read at most that many bytes of the body.
+        """
+        async with self._semaphore:
+            await _rate_limit_async(url)
+            async with (
+                concurrency_slot(url) as slot,
+                self._session.get(
+                    url, headers=headers, allow_redirects=allow_redirects
+                ) as response,
+            ):
+                if body_cap is None:
+                    body = await response.read()
+                else:
+                    body = await response.content.read(body_cap)
+                converted = requests.Response()
+                converted.status_code = response.status
+                converted.reason = response.reason
+                converted.url = str(response.url)
+                converted.headers = CaseInsensitiveDict(response.headers)
+                converted.encoding = requests.utils.get_encoding_from_headers(
+                    converted.headers
+                )
+                converted.request = requests.Request(
+                    "GET", url, headers=dict(response.request_info.headers)
+                ).prepare()
+                converted._content = body
+                slot.response = converted
+                return converted
+
+    async def _load_url_once(self, url: str) -> requests.Response:
+        LOG.debug(f"Getting HTML for URL: {url}")
+        cache = _http_cache
+        with guarded_attempt(url) as attempt:
+            headers = cache.validators(url) if cache is not None else {}
+            response = await self.request(url, headers=headers)
+            revalidated = False
+            if response.status_code == 304 and cache is not None:
+                cached = cache.load(url, response)
+                if cached is not None:
+                    response = cached
+                    revalidated = True
+                else:
+                    # Evicted since we sent the validators; fetch it
+                    # unconditionally.
+                    response = await self.request(url)
+            attempt.response = response
+        if response.status_code in (429, 503):
+            _respect_retry_after(response)
+        _check_status(url, response)
+        _record_response(url, response, revalidated)
+        return response
+
+    async def load_url(self, url: str) -> requests.Response:
+        """load_url, natively on the event loop."""
+        archive = _page_archive
+        if isinstance(archive, PageArchiveReader):
+            return archive.load(url)
+        delay = RETRY_DELAY
+        for attempt in range(1, RETRY_TRIES + 1):
+            try:
+                return await self._load_url_once(url)
+            except (*self.request_errors, RuntimeError) as e:
+                if attempt == RETRY_TRIES or not _should_retry(url, e):
+                    raise
+                LOG.warning(f"{e!r}, retrying in {delay} seconds...")
+                await asyncio.sleep(delay)
+                delay = min(delay * RETRY_BACKOFF, RETRY_MAX_DELAY)
+
+    async def load_url_safe(self, url: str) -> Optional[requests.Response]:
+        """load_url_safe, natively on the event loop."""
+        try:
+            return await self.load_url(url)
+        except Exception as e:
+            LOG.warning(f"Failed to load URL {url}: {e}")
+            return None
+
+
+# How long fetch_page keeps pages in memory to answer repeat requests with, and
+# the most it keeps. Off unless asked for (--recent-pages-ttl): a retry of a
+# page that came back bad has to fetch it again, not get the same page back.
+# Concurrent requests for a page always share one fetch.
+DEFAULT_RECENT_PAGES_TTL = 0
+DEFAULT_RECENT_PAGES_MAX_MB = 32
+
+
+class PageCoalescer:
+    """
+    Request coalescing for fetch_page. Concurrent requests for the same URL
+    share one fetch (singleflight), and pages fetched in the last [ttl]
+    seconds are answered from memory, keeping at most [max_bytes] of them
+    (least recently used go first). Failures are shared with whoever was
+    waiting on the same fetch, but never remembered, and callers forget
+    (forget_recent_page) pages that fetched fine but didn't parse.
+
+    Everything happens on the event loop, so it needs no locking.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._in_flight: dict = {}
+        # URL -> (expiry, response, size), least recently used first.
+        self._recent: OrderedDict = OrderedDict()
+        self._recent_bytes = 0
+        self.requests = 0
+        self.fetched = 0
+        self.coalesced = 0
+        self.hits = 0
+
+    async def get(self, url: str, fetch):
+        """The response for [url], from memory, from a fetch already in
+        flight, or else from awaiting fetch()."""
+        self.requests += 1
+        recent = self._recent.get(url)
+        if recent is not None:
+            expiry, response, _ = recent
+            if time.monotonic() < expiry:
+                self._recent.move_to_end(url)
+                self.hits += 1
+                return response
+            self.forget(url)
+
+        in_flight = self._in_flight.get(url)
+        if in_flight is not None:
+            self.coalesced += 1
+            # Shielded, so one waiter being cancelled doesn't cancel the fetch
+            # for the others.
+            return await asyncio.shield(in_flight)
+
+        task = asyncio.ensure_future(fetch())
+        self._in_flight[url] = task
+        task.add_done_callback(lambda task: self._fetch_done(url, task))
+        self.fetched += 1
+        response = await asyncio.shield(task)
+        self._remember(url, response)
+        return response
+
+    def _fetch_done(self, url: str, task):
+        del self._in_flight[url]
+        if not task.cancelled():
+            # Whoever awaited it has it already. This just stops asyncio
+            # complaining when nobody was left waiting.
+            task.exception()
+
+    def _remember(self, url: str, response):
+        if self.ttl <= 0:
+            return
+        size = len(response.content or b"")
+        if size > self.max_bytes:
+            return
+        self.forget(url)
+        self._recent[url] = (time.monotonic() + self.ttl, response, size)
+        self._recent_bytes += size
+        while self._recent_bytes > self.max_bytes:
+            self.forget(next(iter(self._recent)))
+
+    def forget(self, url: str):
+        recent = self._recent.pop(url, None)
+        if recent is not None:
+            self._recent_bytes -= recent[2]
+
+    def forget_all(self):
+        self._recent.clear()
+        self._recent_bytes = 0
+
+    def log_stats(self):
+        if not self.requests:
+            return
+        LOG.info(
+            f"Page requests: {self.requests}, fetched {self.fetched}, "
+            f"{self.coalesced} shared a fetch already in flight, "
+            f"{self.hits} answered from recent pages"
+        )
+
+
+_page_coalescer = PageCoalescer(
+    DEFAULT_RECENT_PAGES_TTL, DEFAULT_RECENT_PAGES_MAX_MB * 1024 * 1024
+)
+
+
+def configure_page_coalescing(ttl: float, max_mb: int) -> PageCoalescer:
+    """Set up fetch_page's coalescing, returning it for its stats. A [ttl] of
+    0 still coalesces concurrent requests but remembers nothing."""
+    global _page_coalescer
+    _page_coalescer = PageCoalescer(ttl, max_mb * 1024 * 1024)
+    return _page_coalescer
+
+
+def forget_recent_page(url: str):
+    """Stop answering requests for [url] from memory, e.g. because the page
+    didn't parse and a retry should fetch it again."""
+    _page_coalescer.forget(url)
+
+
+def forget_recent_pages():
+    """forget_recent_page for every page, e.g. before retrying a whole
+    letter."""
+    _page_coalescer.forget_all()
+
+
+def add_page_coalescing_args(parser):
+    parser.add_argument(
+        "--recent-pages-ttl",
+        type=float,
+        default=DEFAULT_RECENT_PAGES_TTL,
+        help="Answer repeat requests for a page fetched in the last this many "
+        f"seconds from memory (default: {DEFAULT_RECENT_PAGES_TTL}, off). "
+        "Pages that don't parse are never reused. Concurrent requests for a "
+        "page always share one fetch.",
+    )
+    parser.add_argument(
+        "--recent-pages-max-mb",
+        type=int,
+        default=DEFAULT_RECENT_PAGES_MAX_MB,
+        help="The most recent pages to keep in memory, in MB (default: "
+        f"{DEFAULT_RECENT_PAGES_MAX_MB}).",
+    )
+
+
+async def _fetch_page(executor, url: str):
+    if isinstance(executor, AsyncFetcher):
+        return await executor.load_url(url)
+    return await asyncio.get_running_loop().run_in_executor(executor, load_url, url)
+
+
+async def fetch_page(executor, url: str, continue_on_error: bool = False):
+    """
+    load_url (or load_url_safe with [continue_on_error]) for one URL, either on
+    [executor]'s threads or natively if [executor] is an AsyncFetcher.
+    Requests for a URL that's already being fetched, or with
+    --recent-pages-ttl was just fetched, are answered with that same response
+    (see PageCoalescer).
+    """
+    try:
+        return await _page_coalescer.get(url, lambda: _fetch_page(executor, url))
+    except Exception as e:
+        if not continue_on_error:
+            raise
+        LOG.warning(f"Failed to load URL {url}: {e}")
+        return None
+
+
+def parse_http_engine(engine: str) -> str:
+    """--http-engine, for argparse: fails up front if asyncio is asked for
+    without aiohttp, rather than once the scrape has started."""
+    if engine == "asyncio" and importlib.util.find_spec("aiohttp") is None:
+        raise argparse.ArgumentTypeError(
+            "asyncio needs aiohttp, the async extra: `uv run --extra async ...`"
+        )
+    return engine
+
+
+def add_http_engine_args(parser):
+    parser.add_argument(
+        "--http-engine",
+        type=parse_http_engine,
+        choices=("threads", "asyncio"),
+        default="threads",
+        help="Fetch on a pool of --num-workers threads (default), or natively "
+        "with asyncio, which needs aiohttp (uv run --extra async).",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=DEFAULT_MAX_IN_FLIGHT,
+        help="With --http-engine asyncio, the most requests in flight at once "
+        f"(default: {DEFAULT_MAX_IN_FLIGHT}).",
+    )
+
+
 async def get_pages_html(
     executor,
     urls: List[str],
@@ -157,7 +1718,7 @@ async def get_pages_html(
     Get the HTML of a list of URLs concurrently.
 
     Args:
-        executor: ThreadPoolExecutor for running requests.
+        executor: ThreadPoolExecutor for running requests, or an AsyncFetcher.
         urls: List of URLs to fetch.
         continue_on_error: If True, continue processing even if some URLs fail.
                           If False (default), raise on first failure after retries exhausted.
@@ -168,9 +1729,7 @@ async def get_pages_html(
     Raises:
         Exception: If continue_on_error is False and any URL fails after retries.
     """
-    loop = asyncio.get_running_loop()
-    loader = load_url_safe if continue_on_error else load_url
-    futures = [loop.run_in_executor(executor, loader, url) for url in urls]
+    futures = [fetch_page(executor, url, continue_on_error) for url in urls]
     results = await asyncio.gather(*futures, return_exceptions=True)
 
     htmls = []
@@ -211,7 +1770,7 @@ async def get_pages_html_with_urls(
     This is useful when you need to know which URL each response came from.
 
     Args:
-        executor: ThreadPoolExecutor for running requests.
+        executor: ThreadPoolExecutor for running requests, or an AsyncFetcher.
         urls: List of URLs to fetch.
         continue_on_error: If True, continue processing even if some URLs fail.
                           If False (default), raise on first failure after retries exhausted.
@@ -222,9 +1781,7 @@ async def get_pages_html_with_urls(
     Raises:
         Exception: If continue_on_error is False and any URL fails after retries.
     """
-    loop = asyncio.get_running_loop()
-    loader = load_url_safe if continue_on_error else load_url
-    futures = [loop.run_in_executor(executor, loader, url) for url in urls]
+    futures = [fetch_page(executor, url, continue_on_error) for url in urls]
     results = await asyncio.gather(*futures, return_exceptions=True)
 
     successful = []
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+"""
+Delta updates between published versions of data-v2.json.
+
+Each published version of data-v2.json is named by its latest_version
+timestamp. Rather than download the whole file whenever latest_version
+changes, a client holding an older version can fetch the patches that lead
+from its version to the latest, which for a weekly update that touched a
+handful of entries is a few KB instead of MBs.
+
+A patch from one version to the next (make_delta) compares the two versions
+entry by entry, and rebuilds the new list of entries from runs of unchanged
+old ones plus the entries that were added or changed:
+
+{
+    "format": 1,
+    "from_version": "1785548726",
+    "to_version": "1786153526",
+    "ops": [["copy", 0, 120], ["insert", [{...entry...}]], ["copy", 121, 4000]]
+}
+
+apply_delta(old, patch) gives exactly the new data, so json.dumps(..., indent=2)
+of it is byte-for-byte the new data-v2.json. make_data_delta.py checks that
+before publishing a patch.
+
+Patches live in DELTAS_DIR alongside deltas.json, which lists the chain of
+patches that ends at the latest version, oldest first:
+
+{
+    "latest_version": "1786153526",
+    "deltas": [{"from": "...", "to": "...", "file": "....json", "bytes": 1234}, ...]
+}
+
+The chain holds at most MAX_DELTAS patches, and is dropped whenever a patch
+can't be made (no previous version, or the patch wouldn't be smaller than the
+file). A client whose version isn't in the chain, or whose patches would add
+up to more than the file, downloads the full file instead (see plan_update).
+
+As a script, this is the client side: it brings a data-v2.json of a given
+version up to date from the patches.
+
+    uv run python data_delta.py --data old-data-v2.json --version 1785548726 \\
+        --output data-v2.json
+"""
+
+import argparse
+import difflib
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from common import LOG
+
+DELTA_FORMAT = 1
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "assets" / "data"
+DELTAS_DIR = DATA_DIR / "deltas"
+DELTAS_INDEX_NAME = "deltas.json"
+
+# Most patches kept in the chain. A client more than this many versions
+# behind downloads the full file.
+MAX_DELTAS = 8
+
+
+def _entry_key(entry: dict) -> str:
+    return json.dumps(entry, sort_keys=True)
+
+
+def make_delta(old: dict, new: dict, from_version: str, to_version: str) -> dict:
+    """The patch that turns [old] into [new], both data-v2.json as json.load
+    gives it."""
+    old_entries = old["data"]
+    new_entries = new["data"]
+    matcher = difflib.SequenceMatcher(
+        None,
+        [_entry_key(entry) for entry in old_entries],
+        [_entry_key(entry) for entry in new_entries],
+        autojunk=False,
+    )
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["copy", i1, i2 - i1])
+        elif j2 > j1:
+            ops.append(["insert", new_entries[j1:j2]])
+    return {
+        "format": DELTA_FORMAT,
+        "from_version": from_version,
+        "to_version": to_version,
+        "ops": ops,
+    }
+
+
+def apply_delta(old: dict, patch: dict) -> dict:
+    """The data [patch] turns [old] into."""
+    if patch.get("format") != DELTA_FORMAT:
+        raise ValueError(f"Not a format {DELTA_FORMAT} patch")
+    entries = []
+    for op in patch["ops"]:
+        if op[0] == "copy":
+            _, start, count = op
+            if start + count > len(old["data"]):
+                raise ValueError(
+                    f"Patch copies entries {start}-{start + count}, but the data "
+                    f"only has {len(old['data'])}; is it the right version?"
+                )
+            entries.extend(old["data"][start : start + count])
+        elif op[0] == "insert":
+            entries.extend(op[1])
+        else:
+            raise ValueError(f"Unknown patch op {op[0]!r}")
+    return {"data": entries}
+
+
+def summarise_delta(old: dict, new: dict) -> str:
+    """What changed, by entry_in_english, for the log."""
+    old_by_word = {entry["entry_in_english"]: entry for entry in old["data"]}
+    new_by_word = {entry["entry_in_english"]: entry for entry in new["data"]}
+    added = new_by_word.keys() - old_by_word.keys()
+    removed = old_by_word.keys() - new_by_word.keys()
+    changed = [
+        word
+        for word in new_by_word.keys() & old_by_word.keys()
+        if new_by_word[word] != old_by_word[word]
+    ]
+    return f"{len(added)} entries added, {len(changed)} changed, {len(removed)} removed"
+
+
+def dump_delta(patch: dict) -> str:
+    return json.dumps(patch, separators=(",", ":"))
+
+
+def delta_file_name(from_version: str, to_version: str) -> str:
+    return f"{from_version}-{to_version}.json"
+
+
+def load_deltas_index(deltas_dir: Path) -> Optional[dict]:
+    path = deltas_dir / DELTAS_INDEX_NAME
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def plan_update(
+    index: Optional[dict], version: str, full_bytes: Optional[int] = None
+) -> Optional[List[dict]]:
+    """
+    The patches (deltas.json records) that bring [version] up to date, in
+    order, or None if the full file should be downloaded instead: [version]
+    isn't in the chain, or the patches add up to at least [full_bytes].
+    An empty list means [version] is the latest.
+    """
+    if index is None:
+        return None
+    if version == index["latest_version"]:
+        return []
+    deltas = index["deltas"]
+    for i, delta in enumerate(deltas):
+        if delta["from"] == version:
+            chain = deltas[i:]
+            break
+    else:
+        return None
+    if full_bytes is not None and sum(d["bytes"] for d in chain) >= full_bytes:
+        return None
+    return chain
+
+
+def update_data(
+    data: dict, version: str, deltas_dir: Path, full_bytes: Optional[int] = None
+) -> Optional[dict]:
+    """[data], of [version], brought up to the latest version with the
+    patches in [deltas_dir], or None if that needs the full file."""
+    chain = plan_update(load_deltas_index(deltas_dir), version, full_bytes)
+    if chain is None:
+        return None
+    for delta in chain:
+        with open(deltas_dir / delta["file"]) as f:
+            patch = json.load(f)
+        if (patch["from_version"], patch["to_version"]) != (delta["from"], delta["to"]):
+            raise ValueError(f"{delta['file']} isn't the patch deltas.json says")
+        data = apply_delta(data, patch)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--data", type=Path, required=True)
+    parser.add_argument(
+        "--version", required=True, help="The latest_version --data is from."
+    )
+    parser.add_argument("--deltas-dir", type=Path, default=DELTAS_DIR)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    LOG.setLevel("INFO")
+    with open(args.data) as f:
+        data = json.load(f)
+    updated = update_data(data, args.version, args.deltas_dir)
+    if updated is None:
+        LOG.error(
+            f"No chain of patches from version {args.version}, download the "
+            "full file instead"
+        )
+        sys.exit(1)
+    with open(args.output, "w") as f:
+        json.dump(updated, f, indent=2)
+    LOG.info(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
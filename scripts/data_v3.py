@@ -0,0 +1,221 @@
+"""
+data-v3.bin, a compact binary encoding of data-v2.json.
+
+data-v2.json is mostly repeated keys ("video_links", "definitions", ...),
+indentation and strings that recur on entry after entry: the same keywords,
+definition headings, category names and media directories. data-v3 holds
+exactly the same data without any of that: every string that recurs is
+stored once in a string table and referred to by its index, and every number
+is a varint (LEB128: 7 bits per byte, low bits first, high bit set on all but
+the last byte).
+
+Layout, where "string" is a varint byte length then that many bytes of UTF-8
+and "list of X" is a varint count then that many Xs:
+
+    magic             b"ADV3"
+    format version    varint, FORMAT_VERSION
+    string tables     list of string each, in this order: keywords,
+                      definition headings, categories, media prefixes
+                      (a video path up to and including its last "/"), entry
+                      types. Most used first, so the common ones get 1-byte ids.
+    entries           list of entry:
+        entry_in_english    string
+        sub_entries         list of sub entry:
+            video_links         list of (prefix id, string rest of the path)
+            keywords            list of keyword id
+            definitions         list of (heading id, list of string)
+            regions             list of varint
+        categories          list of category id
+        entry_type          entry type id
+
+decode_data_v3 turns it back into the dict json.load gives for data-v2.json,
+down to the order of every key, so json.dumps(decoded, indent=2) reproduces
+data-v2.json byte for byte. See make_data_v3.py, which checks exactly that.
+"""
+
+from collections import Counter
+from typing import Dict, List, Tuple
+
+MAGIC = b"ADV3"
+FORMAT_VERSION = 1
+
+ENTRY_KEYS = ["entry_in_english", "sub_entries", "categories", "entry_type"]
+SUB_ENTRY_KEYS = ["video_links", "keywords", "definitions", "regions"]
+
+# The string tables, in the order they're stored.
+TABLES = ["keywords", "headings", "categories", "media_prefixes", "entry_types"]
+
+
+def _check_keys(what: str, d: dict, keys: List[str]):
+    # The decoder rebuilds dicts with these keys in this order, so anything
+    # else would silently not round-trip.
+    if list(d) != keys:
+        raise ValueError(f"Expected {what} keys {keys}, got {list(d)}")
+
+
+def _split_media_path(path: str) -> Tuple[str, str]:
+    prefix, slash, rest = path.rpartition("/")
+    return prefix + slash, rest
+
+
+class _Writer:
+    def __init__(self):
+        self.out = bytearray()
+
+    def varint(self, n: int):
+        if not isinstance(n, int) or isinstance(n, bool) or n < 0:
+            raise ValueError(f"Can only store non-negative ints, not {n!r}")
+        while n >= 0x80:
+            self.out.append((n & 0x7F) | 0x80)
+            n >>= 7
+        self.out.append(n)
+
+    def string(self, s: str):
+        if not isinstance(s, str):
+            raise ValueError(f"Expected a string, not {s!r}")
+        encoded = s.encode("utf-8")
+        self.varint(len(encoded))
+        self.out += encoded
+
+
+class _Reader:
+    def __init__(self, blob: bytes):
+        self.blob = memoryview(blob)
+        self.pos = 0
+
+    def varint(self) -> int:
+        n = shift = 0
+        while True:
+            byte = self.blob[self.pos]
+            self.pos += 1
+            n |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return n
+            shift += 7
+
+    def string(self) -> str:
+        length = self.varint()
+        s = str(self.blob[self.pos : self.pos + length], "utf-8")
+        self.pos += length
+        return s
+
+
+def _build_tables(data: dict) -> Dict[str, List[str]]:
+    """Each string table, most used first (ties in order of first use)."""
+    counts = {table: Counter() for table in TABLES}
+    for entry in data["data"]:
+        _check_keys("entry", entry, ENTRY_KEYS)
+        for sub_entry in entry["sub_entries"]:
+            _check_keys("sub entry", sub_entry, SUB_ENTRY_KEYS)
+            for path in sub_entry["video_links"]:
+                counts["media_prefixes"][_split_media_path(path)[0]] += 1
+            counts["keywords"].update(sub_entry["keywords"])
+            counts["headings"].update(sub_entry["definitions"].keys())
+        counts["categories"].update(entry["categories"])
+        counts["entry_types"][entry["entry_type"]] += 1
+    # Counter.most_common keeps first-use order for ties.
+    return {table: [s for s, _ in counts[table].most_common()] for table in TABLES}
+
+
+def encode_data_v3(data: dict) -> bytes:
+    """data-v3.bin for [data], data-v2.json as json.load gives it. Raises
+    ValueError on anything data-v3 can't hold exactly."""
+    if list(data) != ["data"]:
+        raise ValueError(f"Expected only a 'data' key, got {list(data)}")
+    tables = _build_tables(data)
+    ids = {
+        table: {s: i for i, s in enumerate(strings)}
+        for table, strings in tables.items()
+    }
+
+    w = _Writer()
+    w.out += MAGIC
+    w.varint(FORMAT_VERSION)
+    for table in TABLES:
+        w.varint(len(tables[table]))
+        for s in tables[table]:
+            w.string(s)
+
+    w.varint(len(data["data"]))
+    for entry in data["data"]:
+        w.string(entry["entry_in_english"])
+        w.varint(len(entry["sub_entries"]))
+        for sub_entry in entry["sub_entries"]:
+            w.varint(len(sub_entry["video_links"]))
+            for path in sub_entry["video_links"]:
+                prefix, rest = _split_media_path(path)
+                w.varint(ids["media_prefixes"][prefix])
+                w.string(rest)
+            w.varint(len(sub_entry["keywords"]))
+            for keyword in sub_entry["keywords"]:
+                w.varint(ids["keywords"][keyword])
+            w.varint(len(sub_entry["definitions"]))
+            for heading, definitions in sub_entry["definitions"].items():
+                w.varint(ids["headings"][heading])
+                w.varint(len(definitions))
+                for definition in definitions:
+                    w.string(definition)
+            w.varint(len(sub_entry["regions"]))
+            for region in sub_entry["regions"]:
+                w.varint(region)
+        w.varint(len(entry["categories"]))
+        for category in entry["categories"]:
+            w.varint(ids["categories"][category])
+        w.varint(ids["entry_types"][entry["entry_type"]])
+    return bytes(w.out)
+
+
+def decode_data_v3(blob: bytes) -> dict:
+    """The data-v2.json dict that [blob] (data-v3.bin) encodes."""
+    if blob[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a data-v3 file")
+    r = _Reader(blob)
+    r.pos = len(MAGIC)
+    version = r.varint()
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"data-v3 format version {version}, this reader handles {FORMAT_VERSION}"
+        )
+    tables = {}
+    for table in TABLES:
+        tables[table] = [r.string() for _ in range(r.varint())]
+    keywords = tables["keywords"]
+    headings = tables["headings"]
+    categories = tables["categories"]
+    prefixes = tables["media_prefixes"]
+
+    entries = []
+    for _ in range(r.varint()):
+        entry_in_english = r.string()
+        sub_entries = []
+        for _ in range(r.varint()):
+            video_links = []
+            for _ in range(r.varint()):
+                prefix = prefixes[r.varint()]
+                video_links.append(prefix + r.string())
+            sub_keywords = [keywords[r.varint()] for _ in range(r.varint())]
+            definitions = {}
+            for _ in range(r.varint()):
+                heading = headings[r.varint()]
+                definitions[heading] = [r.string() for _ in range(r.varint())]
+            regions = [r.varint() for _ in range(r.varint())]
+            sub_entries.append(
+                {
+                    "video_links": video_links,
+                    "keywords": sub_keywords,
+                    "definitions": definitions,
+                    "regions": regions,
+                }
+            )
+        entry_categories = [categories[r.varint()] for _ in range(r.varint())]
+        entries.append(
+            {
+                "entry_in_english": entry_in_english,
+                "sub_entries": sub_entries,
+                "categories": entry_categories,
+                "entry_type": tables["entry_types"][r.varint()],
+            }
+        )
+    if r.pos != len(blob):
+        raise ValueError(f"{len(blob) - r.pos} unexpected bytes after the data")
+    return {"data": entries}
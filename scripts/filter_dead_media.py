@@ -55,6 +55,7 @@ Exit codes:
 """
 
 import argparse
+import asyncio
 import datetime
 import hashlib
 import json
@@ -69,8 +70,16 @@ import requests
 
 from common import (
     LOG,
+    AsyncFetcher,
     _rate_limit,
     _respect_retry_after,
+    add_concurrency_args,
+    add_http_engine_args,
+    add_rate_limit_args,
+    concurrency_slot,
+    configure_concurrency,
+    configure_rate_limits,
+    log_host_pauses,
     make_session,
     strip_media_base,
 )
@@ -143,10 +152,8 @@ def classify_response(response, body: bytes) -> str:
     return INCONCLUSIVE
 
 
-def probe(session, url: str, timeout: int, round_num: int) -> dict:
-    """One Range GET against [url], returning a full evidence record."""
-    _rate_limit()
-    record = {
+def _new_record(round_num: int) -> dict:
+    return {
         "ts": utc_now_iso(),
         "round": round_num,
         "status": None,
@@ -158,33 +165,49 @@ def probe(session, url: str, timeout: int, round_num: int) -> dict:
         "elapsed_ms": None,
         "error": None,
     }
+
+
+def _fill_record(record: dict, response, body: bytes):
+    """Record [response]'s evidence; [body] is only looked at on non-2xx."""
+    record["status"] = response.status_code
+    record["headers"] = {
+        name: response.headers[name]
+        for name in REPORT_HEADERS
+        if name in response.headers
+    }
+    if response.status_code not in (200, 206):
+        record["body_sha256"] = hashlib.sha256(body).hexdigest()
+        record["body_snippet"] = repr(body[:200])
+        record["body_matches_swift_404"] = body == SWIFT_404_BODY
+    record["classification"] = classify_response(response, body)
+
+
+def probe(session, url: str, timeout: int, round_num: int) -> dict:
+    """One Range GET against [url], returning a full evidence record."""
+    _rate_limit(url)
+    record = _new_record(round_num)
     started = time.time()
     try:
         # stream=True so a host that ignores the Range header can't make us
         # download a whole video; we only read the body on non-2xx answers.
-        with session.get(
-            url,
-            headers={"Range": "bytes=0-0"},
-            timeout=timeout,
-            allow_redirects=False,
-            stream=True,
-        ) as response:
-            record["status"] = response.status_code
-            record["headers"] = {
-                name: response.headers[name]
-                for name in REPORT_HEADERS
-                if name in response.headers
-            }
+        with (
+            concurrency_slot(url) as slot,
+            session.get(
+                url,
+                headers={"Range": "bytes=0-0"},
+                timeout=timeout,
+                allow_redirects=False,
+                stream=True,
+            ) as response,
+        ):
+            slot.response = response
             body = b""
             if response.status_code not in (200, 206):
                 for chunk in response.iter_content(256):
                     body += chunk
                     if len(body) > BODY_CAP:
                         break
-                record["body_sha256"] = hashlib.sha256(body).hexdigest()
-                record["body_snippet"] = repr(body[:200])
-                record["body_matches_swift_404"] = body == SWIFT_404_BODY
-            record["classification"] = classify_response(response, body)
+            _fill_record(record, response, body)
             if response.status_code in (429, 503):
                 _respect_retry_after(response)
     except requests.exceptions.RequestException as e:
@@ -193,6 +216,73 @@ def probe(session, url: str, timeout: int, round_num: int) -> dict:
     return record
 
 
+async def probe_async(fetcher: AsyncFetcher, url: str, round_num: int) -> dict:
+    """probe() on an AsyncFetcher, with the fetcher's timeout."""
+    record = _new_record(round_num)
+    started = time.time()
+    try:
+        # body_cap plays the part of stream=True above.
+        response = await fetcher.request(
+            url,
+            headers={"Range": "bytes=0-0"},
+            allow_redirects=False,
+            body_cap=BODY_CAP + 1,
+        )
+        _fill_record(record, response, response.content)
+        if response.status_code in (429, 503):
+            _respect_retry_after(response)
+    except fetcher.request_errors as e:
+        record["error"] = str(e) or repr(e)
+    record["elapsed_ms"] = int((time.time() - started) * 1000)
+    return record
+
+
+def num_threads(args) -> int:
+    # With adaptive concurrency the controller decides how many of the threads
+    # are probing at any moment.
+    if args.adaptive_concurrency:
+        return args.max_concurrency
+    return args.num_workers
+
+
+def probe_round(session, urls: list, args, round_num: int) -> list:
+    """Probe every URL once on --num-workers threads: [(url, record)]."""
+    records = []
+    done = 0
+    lock = Lock()
+    total = len(urls)
+    with ThreadPoolExecutor(max_workers=num_threads(args)) as executor:
+        futures = {
+            executor.submit(probe, session, url, args.timeout, round_num): url
+            for url in urls
+        }
+        for future in as_completed(futures):
+            records.append((futures[future], future.result()))
+            with lock:
+                done += 1
+                if done % 100 == 0 or done == total:
+                    LOG.info(f"Round {round_num} progress: {done}/{total}")
+    return records
+
+
+async def probe_round_async(urls: list, args, round_num: int) -> list:
+    """probe_round with up to --max-in-flight probes at once on an AsyncFetcher."""
+    records = []
+    total = len(urls)
+    async with AsyncFetcher(
+        max_in_flight=args.max_in_flight, timeout=args.timeout
+    ) as fetcher:
+
+        async def run(url):
+            return url, await probe_async(fetcher, url, round_num)
+
+        for future in asyncio.as_completed([run(url) for url in urls]):
+            records.append(await future)
+            if len(records) % 100 == 0 or len(records) == total:
+                LOG.info(f"Round {round_num} progress: {len(records)}/{total}")
+    return records
+
+
 def check_urls(session, urls: list, args) -> dict:
     """Resolve every URL to alive or dead, or leave it unresolved.
 
@@ -212,29 +302,19 @@ def check_urls(session, urls: list, args) -> dict:
                 f"{args.recheck_delay}s before re-probing"
             )
             time.sleep(args.recheck_delay)
-        done = 0
-        lock = Lock()
-        total = len(undecided)
-        with ThreadPoolExecutor(max_workers=args.num_workers) as executor:
-            futures = {
-                executor.submit(probe, session, url, args.timeout, round_num): url
-                for url in sorted(undecided)
-            }
-            for future in as_completed(futures):
-                url = futures[future]
-                record = future.result()
-                state = results[url]
-                state["attempts"].append(record)
-                if record["classification"] == ALIVE:
-                    state["result"] = "alive"
-                elif record["classification"] == AUTHENTIC_404:
-                    state["authentic_404s"] += 1
-                    if state["authentic_404s"] >= args.dead_attempts:
-                        state["result"] = "dead"
-                with lock:
-                    done += 1
-                    if done % 100 == 0 or done == total:
-                        LOG.info(f"Round {round_num} progress: {done}/{total}")
+        if args.http_engine == "asyncio":
+            records = asyncio.run(probe_round_async(sorted(undecided), args, round_num))
+        else:
+            records = probe_round(session, sorted(undecided), args, round_num)
+        for url, record in records:
+            state = results[url]
+            state["attempts"].append(record)
+            if record["classification"] == ALIVE:
+                state["result"] = "alive"
+            elif record["classification"] == AUTHENTIC_404:
+                state["authentic_404s"] += 1
+                if state["authentic_404s"] >= args.dead_attempts:
+                    state["result"] = "dead"
         undecided = {url for url in undecided if results[url]["result"] is None}
     return results
 
@@ -319,6 +399,7 @@ def main() -> int:
         help="Directory for report.json (default: media_filter_report).",
     )
     parser.add_argument("--num-workers", type=int, default=8)
+    add_http_engine_args(parser)
     parser.add_argument(
         "--timeout", type=int, default=30, help="Per-request timeout in seconds."
     )
@@ -360,10 +441,16 @@ def main() -> int:
         action="store_true",
         help="Classify and report, but never write --output.",
     )
+    add_rate_limit_args(parser)
+    add_concurrency_args(parser)
     parser.add_argument("-d", "--debug", action="store_true")
     args = parser.parse_args()
 
     LOG.setLevel(logging.DEBUG if args.debug else logging.INFO)
+    configure_rate_limits(args.rate, args.rate_burst, args.rate_limit)
+    concurrency = configure_concurrency(
+        args.adaptive_concurrency, args.num_workers, args.max_concurrency
+    )
 
     if args.dead_attempts > args.max_rounds:
         parser.error("--dead-attempts cannot exceed --max-rounds")
@@ -384,8 +471,11 @@ def main() -> int:
         urls = urls[: args.limit]
         LOG.info(f"Limiting to first {len(urls)} URLs")
 
-    session = make_session()
+    session = make_session(pool_size=num_threads(args))
     results = check_urls(session, urls, args)
+    if concurrency is not None:
+        concurrency.log_stats()
+    log_host_pauses()
 
     alive_first_try = []
     alive_after_retry = []
@@ -0,0 +1,227 @@
+"""
+A typo-tolerant index over the entries' names and keywords, so a search that
+finds nothing (see search_index.py) can still offer "did you mean ...".
+
+It's a trigram index over the same normalised terms as search_index.json.
+Each term is padded as "  term " and broken into its overlapping three
+character pieces. A term within edit distance d of the query shares all but
+at most 3d of the query's trigrams, and all but 3d of its own. So the
+candidates are the terms that share enough trigrams with the query, and only
+those have their Levenshtein distance worked out. Queries too short for that
+bound to rule anything out fall back to the terms of about the same length.
+The answers are exactly those of a scan over every term
+(FuzzyIndex.did_you_mean_scan), just much faster.
+
+{
+    "version": "<hash of the rest>",
+    "entries": ["be", "and", ...],
+    "terms": ["a", "a lot", "aardvark", ...],
+    "term_entries": [[1], [17, 402], ...],
+    "trigrams": {"  a": [0, 1, 2, ...], "aar": [2, ...], ...}
+}
+
+entries, terms and term_entries are as in search_index.json (entries in rank
+order). trigrams maps each trigram to the ids of the terms containing it, in
+ascending order.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from search_index import normalise
+
+# The distance allowed by default: one edit for short queries, two otherwise.
+SHORT_QUERY_LENGTH = 5
+
+
+def _version(index: dict) -> str:
+    content = json.dumps(
+        {key: value for key, value in index.items() if key != "version"},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def trigrams(term: str) -> set:
+    """The distinct trigrams of [term], padded so its start and end count."""
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """The edit distance between [a] and [b]. With [max_distance], anything
+    above it comes back as max_distance + 1, which is quicker to find: only
+    the cells within max_distance of the diagonal are worked out."""
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is None:
+        max_distance = len(a)
+    out_of_range = max_distance + 1
+    if len(a) - len(b) > max_distance:
+        return out_of_range
+    previous = [min(j, out_of_range) for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [out_of_range] * (len(b) + 1)
+        current[0] = min(i, out_of_range)
+        for j in range(low, high + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != b[j - 1]),
+            )
+        if min(current[low - 1 : high + 1]) > max_distance:
+            return out_of_range
+        previous = current
+    return min(previous[-1], out_of_range)
+
+
+def default_max_distance(query: str) -> int:
+    return 1 if len(query) <= SHORT_QUERY_LENGTH else 2
+
+
+def build_fuzzy_index(search_index: dict) -> dict:
+    """The fuzzy index over the terms of [search_index], as built by
+    build_search_index or loaded from search_index.json."""
+    postings: Dict[str, List[int]] = {}
+    for term_id, term in enumerate(search_index["terms"]):
+        for trigram in trigrams(term):
+            postings.setdefault(trigram, []).append(term_id)
+    index = {
+        "entries": search_index["entries"],
+        "terms": search_index["terms"],
+        "term_entries": search_index["term_entries"],
+        "trigrams": {trigram: postings[trigram] for trigram in sorted(postings)},
+    }
+    return {"version": _version(index), **index}
+
+
+def build_name_index(names: Iterable[str]) -> dict:
+    """The fuzzy index over just [names], each its own entry (in the order
+    given, which ties go by). Far cheaper than going through
+    build_search_index when only the names matter."""
+    entries = list(names)
+    term_to_entries: Dict[str, List[int]] = {}
+    for entry_id, name in enumerate(entries):
+        term = normalise(name)
+        if term:
+            term_to_entries.setdefault(term, []).append(entry_id)
+    terms = sorted(term_to_entries)
+    return build_fuzzy_index(
+        {
+            "entries": entries,
+            "terms": terms,
+            "term_entries": [term_to_entries[term] for term in terms],
+        }
+    )
+
+
+def write_fuzzy_index(path: Path, index: dict):
+    with open(path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+
+class FuzzyIndex:
+    """Queries over a fuzzy index, built by build_fuzzy_index or loaded with
+    FuzzyIndex.load."""
+
+    def __init__(self, index: dict):
+        self.version = index["version"]
+        self.entries: List[str] = index["entries"]
+        self.terms: List[str] = index["terms"]
+        self.term_entries: List[List[int]] = index["term_entries"]
+        self.trigrams: Dict[str, List[int]] = index["trigrams"]
+        # Trigram counts, and the terms by length for queries too short to
+        # filter by trigrams.
+        self._term_trigrams = [len(trigrams(term)) for term in self.terms]
+        self._by_length: Dict[int, List[int]] = {}
+        for term_id, term in enumerate(self.terms):
+            self._by_length.setdefault(len(term), []).append(term_id)
+
+    @classmethod
+    def load(cls, path: Path) -> "FuzzyIndex":
+        """Load an index, raising if its content doesn't match its version."""
+        with open(path) as f:
+            index = json.load(f)
+        if _version(index) != index["version"]:
+            raise ValueError(f"{path} doesn't match its version, it's been modified")
+        return cls(index)
+
+    def entries_for(self, term: str) -> List[str]:
+        """The entries [term] (as did_you_mean gives it) is the name or a
+        keyword of, best first."""
+        i = self.terms.index(term)
+        return [self.entries[entry_id] for entry_id in self.term_entries[i]]
+
+    def _candidates(self, query: str, max_distance: int) -> Iterable[int]:
+        query_trigrams = trigrams(query)
+        if len(query_trigrams) <= 3 * max_distance:
+            # Every term could be in range, as far as trigrams go.
+            for length in range(
+                len(query) - max_distance, len(query) + max_distance + 1
+            ):
+                yield from self._by_length.get(length, ())
+            return
+        shared: Dict[int, int] = {}
+        for trigram in query_trigrams:
+            for term_id in self.trigrams.get(trigram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+        for term_id, count in shared.items():
+            needed = max(len(query_trigrams), self._term_trigrams[term_id])
+            if count >= needed - 3 * max_distance:
+                yield term_id
+
+    def _rank(
+        self, query: str, term_ids: Iterable[int], max_distance: int, limit: int
+    ) -> List[Tuple[str, int]]:
+        found = []
+        for term_id in term_ids:
+            distance = levenshtein(query, self.terms[term_id], max_distance)
+            if distance <= max_distance:
+                # Ties go to the term of the best ranked entry.
+                found.append((distance, self.term_entries[term_id][0], term_id))
+        found.sort()
+        return [
+            (self.terms[term_id], distance) for distance, _, term_id in found[:limit]
+        ]
+
+    def did_you_mean(
+        self, query: str, limit: int = 5, max_distance: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """Up to [limit] (term, distance) pairs for the terms within
+        [max_distance] edits of [query], nearest first and then by their
+        best entry's rank. An exact match comes first with distance 0.
+        max_distance defaults to default_max_distance(query)."""
+        query = normalise(query)
+        if not query:
+            return []
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+        return self._rank(
+            query, self._candidates(query, max_distance), max_distance, limit
+        )
+
+    def did_you_mean_scan(
+        self, query: str, limit: int = 5, max_distance: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """did_you_mean by working out the distance to every term (stopping
+        early once it's out of range), without the index. For checking and
+        benchmarking the index."""
+        query = normalise(query)
+        if not query:
+            return []
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+        found = []
+        for term_id, term in enumerate(self.terms):
+            distance = levenshtein(query, term, max_distance)
+            if distance <= max_distance:
+                found.append((distance, self.term_entries[term_id][0], term_id))
+        found.sort()
+        return [
+            (self.terms[term_id], distance) for distance, _, term_id in found[:limit]
+        ]
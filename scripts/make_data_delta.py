@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+"""
+Publish the patch from the previous version of data-v2.json to the new one,
+adding it to the chain of patches in assets/data/deltas/ (see data_delta.py).
+move_data.sh runs this with the data-v2.json it's replacing.
+
+A patch is only published once applying it to the previous version has been
+checked to reproduce the new data-v2.json byte for byte, and only if it's
+smaller than the file. Otherwise, or without a previous version, the chain is
+dropped and clients download the full file. The chain keeps the last
+MAX_DELTAS patches.
+
+--verify checks the published chain instead: that it's unbroken, ends at
+--new-version, and that its last patch turns --old into --new exactly.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from common import LOG
+from data_delta import (
+    DATA_DIR,
+    DELTAS_DIR,
+    DELTAS_INDEX_NAME,
+    MAX_DELTAS,
+    apply_delta,
+    delta_file_name,
+    dump_delta,
+    load_deltas_index,
+    make_delta,
+    summarise_delta,
+)
+
+
+def check_patch(old: dict, patch: dict, new_text: str) -> bool:
+    """Whether [patch] turns [old] into exactly [new_text], the new
+    data-v2.json's content (which make_data_v2.py writes with indent=2)."""
+    if json.dumps(apply_delta(old, patch), indent=2) == new_text:
+        return True
+    LOG.error(
+        f"The patch from {patch['from_version']} to {patch['to_version']} "
+        "doesn't reproduce the new data exactly"
+    )
+    return False
+
+
+def write_index(deltas_dir: Path, latest_version: str, deltas: list):
+    """Write deltas.json and delete any patch no longer in the chain."""
+    deltas_dir.mkdir(parents=True, exist_ok=True)
+    keep = {delta["file"] for delta in deltas} | {DELTAS_INDEX_NAME}
+    for path in deltas_dir.glob("*.json"):
+        if path.name not in keep:
+            path.unlink()
+    index = {"latest_version": latest_version, "deltas": deltas}
+    path = deltas_dir / DELTAS_INDEX_NAME
+    with open(path, "w") as f:
+        json.dump(index, f, indent=2)
+
+
+def publish(args, old_text: str, new_text: str):
+    deltas_dir = args.deltas_dir
+    if not old_text:
+        LOG.info("No previous version, dropping the chain of patches")
+        write_index(deltas_dir, args.new_version, [])
+        return
+
+    old = json.loads(old_text)
+    new = json.loads(new_text)
+    patch = make_delta(old, new, args.old_version, args.new_version)
+    if not check_patch(old, patch, new_text):
+        sys.exit(1)
+    patch_text = dump_delta(patch)
+    patch_bytes = len(patch_text.encode())
+    new_bytes = len(new_text.encode())
+    if patch_bytes >= new_bytes:
+        LOG.info(
+            f"The patch ({patch_bytes} bytes) is no smaller than the file "
+            f"({new_bytes} bytes), dropping the chain of patches"
+        )
+        write_index(deltas_dir, args.new_version, [])
+        return
+
+    index = load_deltas_index(deltas_dir)
+    deltas = []
+    if index is not None and index["latest_version"] == args.old_version:
+        deltas = index["deltas"]
+    elif index is not None:
+        LOG.info(
+            f"The chain ends at {index['latest_version']}, not "
+            f"{args.old_version}; starting a new one"
+        )
+    file_name = delta_file_name(args.old_version, args.new_version)
+    deltas_dir.mkdir(parents=True, exist_ok=True)
+    with open(deltas_dir / file_name, "w") as f:
+        f.write(patch_text)
+    deltas = deltas + [
+        {
+            "from": args.old_version,
+            "to": args.new_version,
+            "file": file_name,
+            "bytes": patch_bytes,
+        }
+    ]
+    write_index(deltas_dir, args.new_version, deltas[-MAX_DELTAS:])
+    LOG.info(
+        f"Wrote {file_name}: {summarise_delta(old, new)}, {patch_bytes} bytes "
+        f"({patch_bytes / new_bytes:.1%} of the file). The chain has "
+        f"{min(len(deltas), MAX_DELTAS)} patches"
+    )
+
+
+def verify(args, old_text: str, new_text: str) -> bool:
+    index = load_deltas_index(args.deltas_dir)
+    if index is None:
+        LOG.error(f"No {DELTAS_INDEX_NAME} in {args.deltas_dir}")
+        return False
+    if index["latest_version"] != args.new_version:
+        LOG.error(
+            f"The chain ends at {index['latest_version']}, not {args.new_version}"
+        )
+        return False
+    deltas = index["deltas"]
+    for before, after in zip(deltas, deltas[1:]):
+        if before["to"] != after["from"]:
+            LOG.error(
+                f"The chain is broken between {before['file']} and {after['file']}"
+            )
+            return False
+    for delta in deltas:
+        path = args.deltas_dir / delta["file"]
+        if not path.exists() or path.stat().st_size != delta["bytes"]:
+            LOG.error(f"{path} is missing or isn't the size deltas.json says")
+            return False
+    if not deltas:
+        LOG.info("The chain is empty, clients download the full file")
+        return True
+    last = deltas[-1]
+    if last["to"] != args.new_version:
+        LOG.error(f"The last patch ends at {last['to']}, not {args.new_version}")
+        return False
+    if args.old_version != last["from"]:
+        LOG.error(f"The last patch starts at {last['from']}, not {args.old_version}")
+        return False
+    with open(args.deltas_dir / last["file"]) as f:
+        patch = json.load(f)
+    if not check_patch(json.loads(old_text), patch, new_text):
+        return False
+    LOG.info(f"The chain of {len(deltas)} patches checks out")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--old",
+        type=Path,
+        required=True,
+        help="The previous data-v2.json. Missing or empty if there isn't one.",
+    )
+    parser.add_argument("--old-version", required=True)
+    parser.add_argument("--new", type=Path, default=DATA_DIR / "data-v2.json")
+    parser.add_argument("--new-version", required=True)
+    parser.add_argument("--deltas-dir", type=Path, default=DELTAS_DIR)
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check the published chain instead of adding to it.",
+    )
+    args = parser.parse_args()
+
+    LOG.setLevel("INFO")
+    old_text = args.old.read_text() if args.old.exists() else ""
+    new_text = args.new.read_text()
+    if args.verify:
+        if not verify(args, old_text, new_text):
+            sys.exit(1)
+        return
+    publish(args, old_text, new_text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""
+Produce assets/data/data-v3.bin from assets/data/data-v2.json: the same data
+in a compact binary encoding (see data_v3.py), a fraction of the size to
+download and far less to parse than the JSON.
+
+Before writing, the encoding is decoded again and checked to reproduce
+data-v2.json byte for byte, so data-v3.bin is never written unless it's a
+lossless copy. --verify checks an existing data-v3.bin the same way without
+writing anything.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from common import LOG
+from data_v3 import decode_data_v3, encode_data_v3
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "assets" / "data"
+SRC = DATA_DIR / "data-v2.json"
+DST = DATA_DIR / "data-v3.bin"
+
+
+def verify_round_trip(blob: bytes, src_text: str) -> bool:
+    """Whether [blob] decodes to exactly [src_text], data-v2.json's content
+    (which make_data_v2.py writes with indent=2). Logs the first difference
+    if not."""
+    decoded = json.dumps(decode_data_v3(blob), indent=2)
+    if decoded == src_text:
+        return True
+    for i, (ours, theirs) in enumerate(zip(decoded, src_text)):
+        if ours != theirs:
+            break
+    else:
+        i = min(len(decoded), len(src_text))
+    LOG.error(
+        f"data-v3 doesn't round-trip, first difference at character {i}: "
+        f"{decoded[max(0, i - 80) : i + 80]!r} vs "
+        f"{src_text[max(0, i - 80) : i + 80]!r}"
+    )
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--src", type=Path, default=SRC)
+    parser.add_argument("--dst", type=Path, default=DST)
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Only check that --dst decodes to exactly --src.",
+    )
+    args = parser.parse_args()
+
+    LOG.setLevel("INFO")
+    src_text = args.src.read_text()
+
+    if args.verify:
+        blob = args.dst.read_bytes()
+        if not verify_round_trip(blob, src_text):
+            sys.exit(1)
+        LOG.info(f"{args.dst} decodes to exactly {args.src}")
+        return
+
+    blob = encode_data_v3(json.loads(src_text))
+    if not verify_round_trip(blob, src_text):
+        sys.exit(1)
+    with open(args.dst, "wb") as f:
+        f.write(blob)
+    LOG.info(
+        f"Wrote {args.dst} ({len(blob)} bytes, "
+        f"{len(blob) / len(src_text.encode()):.0%} of {args.src.name})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+"""
+Produce assets/data/fuzzy_index.json from assets/data/search_index.json: the
+trigram index behind "did you mean" suggestions for misspelled searches (see
+fuzzy_index.py). move_data.sh runs this after make_search_index.py.
+
+Before writing, the index's suggestions are checked against a scan of every
+term for a sample of misspelled terms (sample_queries), so a bad index is
+never written.
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+from common import LOG
+from fuzzy_index import FuzzyIndex, build_fuzzy_index, write_fuzzy_index
+from search_index import SearchIndex
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "assets" / "data"
+SRC = DATA_DIR / "search_index.json"
+DST = DATA_DIR / "fuzzy_index.json"
+
+# How many misspelled terms to check the index with.
+CHECK_QUERIES = 200
+
+_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _misspell(term: str, rng: random.Random) -> str:
+    """[term] with one typo: a letter dropped, added, changed, or two
+    swapped."""
+    i = rng.randrange(len(term))
+    kind = rng.choice(["drop", "add", "change", "swap"])
+    if kind == "drop" and len(term) > 1:
+        return term[:i] + term[i + 1 :]
+    if kind == "add":
+        return term[:i] + rng.choice(_LETTERS) + term[i:]
+    if kind == "swap" and i + 1 < len(term):
+        return term[:i] + term[i + 1] + term[i] + term[i + 2 :]
+    return term[:i] + rng.choice(_LETTERS) + term[i + 1 :]
+
+
+def sample_queries(terms: List[str], count: int, seed: int = 0) -> List[str]:
+    """[count] queries, the same ones every time for a given [seed]: terms
+    with one or two typos, plus a few exact ones."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        query = rng.choice(terms)
+        for _ in range(rng.choice([0, 1, 1, 1, 2, 2])):
+            query = _misspell(query, rng)
+        queries.append(query)
+    return queries
+
+
+def check_fuzzy_index(index: FuzzyIndex, queries: List[str]) -> bool:
+    """Whether [index] suggests the same as a scan of every term does."""
+    for query in queries:
+        if index.did_you_mean(query) != index.did_you_mean_scan(query):
+            LOG.error(f"{query!r} doesn't get the suggestions a scan does")
+            return False
+    LOG.info(f"Checked {len(queries)} misspelled terms against a scan")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--src", type=Path, default=SRC)
+    parser.add_argument("--dst", type=Path, default=DST)
+    args = parser.parse_args()
+
+    LOG.setLevel("INFO")
+    search_index = SearchIndex.load(args.src)
+    index = build_fuzzy_index(
+        {
+            "entries": search_index.entries,
+            "terms": search_index.terms,
+            "term_entries": search_index.term_entries,
+        }
+    )
+    queries = sample_queries(search_index.terms, CHECK_QUERIES)
+    if not check_fuzzy_index(FuzzyIndex(index), queries):
+        sys.exit(1)
+    write_fuzzy_index(args.dst, index)
+    LOG.info(
+        f"Wrote {args.dst} ({len(index['terms'])} terms, "
+        f"{len(index['trigrams'])} trigrams)"
+    )
+
+
+if __name__ == "__main__":
+    main()
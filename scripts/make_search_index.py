@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+"""
+Produce assets/data/search_index.json from assets/data/data-v2.json: the
+prefix and keyword indexes the app would otherwise build on every device,
+ranked by most_common_words.txt (see search_index.py).
+
+Before writing, the index's answers are checked against a plain scan of the
+data for every one and two character prefix and a spread of words, so a bad
+index is never written.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from common import LOG
+from priority import load_common_word_ranks
+from search_index import (
+    SearchIndex,
+    build_search_index,
+    normalise,
+    write_search_index,
+)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "assets" / "data"
+SRC = DATA_DIR / "data-v2.json"
+DST = DATA_DIR / "search_index.json"
+
+# How many words to check the keyword index with.
+CHECK_WORDS = 500
+
+
+def check_search_index(index: SearchIndex, data: dict) -> bool:
+    """Whether [index] finds the same entries as scanning [data] does."""
+    entry_terms = {}
+    for entry in data["data"]:
+        terms = {normalise(entry["entry_in_english"])}
+        for sub_entry in entry["sub_entries"]:
+            terms.update(normalise(keyword) for keyword in sub_entry["keywords"])
+        terms.discard("")
+        entry_terms[entry["entry_in_english"]] = terms
+
+    # As a user would type them: SearchIndex.prefix normalises its query, so
+    # the "t " of "t shirt" is really a search for "t".
+    prefixes = {normalise(term[:length]) for term in index.terms for length in (1, 2)}
+    prefixes.discard("")
+    for prefix in sorted(prefixes):
+        expected = {
+            name
+            for name, terms in entry_terms.items()
+            if any(term.startswith(prefix) for term in terms)
+        }
+        if set(index.prefix(prefix)) != expected:
+            LOG.error(f"Prefix {prefix!r} doesn't find what a scan does")
+            return False
+    entry_words = {
+        name: {word for term in terms for word in term.split()}
+        for name, terms in entry_terms.items()
+    }
+    # Every word would take minutes, so a spread of CHECK_WORDS of them.
+    words = sorted(index.tokens)[:: max(1, len(index.tokens) // CHECK_WORDS)]
+    for word in words:
+        expected = {name for name, in_entry in entry_words.items() if word in in_entry}
+        if set(index.keyword(word)) != expected:
+            LOG.error(f"Keyword {word!r} doesn't find what a scan does")
+            return False
+    LOG.info(
+        f"Checked {len(prefixes)} prefixes and {len(words)} words against "
+        "a scan of the data"
+    )
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--src", type=Path, default=SRC)
+    parser.add_argument("--dst", type=Path, default=DST)
+    args = parser.parse_args()
+
+    LOG.setLevel("INFO")
+    with open(args.src) as f:
+        data = json.load(f)
+    index = build_search_index(data, load_common_word_ranks())
+    if not check_search_index(SearchIndex(index), data):
+        sys.exit(1)
+    write_search_index(args.dst, index)
+    LOG.info(
+        f"Wrote {args.dst} ({len(index['entries'])} entries, "
+        f"{len(index['terms'])} terms, {len(index['tokens'])} words)"
+    )
+
+
+if __name__ == "__main__":
+    main()
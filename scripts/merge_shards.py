@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+"""
+Merges the partial outputs of a sharded scrape into one data file.
+
+`scrape_signbank.py --shard K/N` scrapes only its share of the word pages and
+writes a partial output instead of a data file. Each shard can run in its own
+process or on its own machine, with its own source IP and rate budget. Shards
+split the word pages either by a hash of their URL (--shard-by url, the
+default: even shares, but every shard fetches all the letter pages) or by
+letter (--shard-by letter: each letter page is fetched once, but shares are
+as uneven as the letters).
+
+A partial output records, for each entry, the position its word page has in
+the letter pages (first page of each letter, then the rest, row by row), which
+is the order a single-process scrape processes them in. Merging sorts every
+shard's entries back into that order and applies them over --existing-file,
+so the result is byte-identical to scraping the same letters in one process.
+
+Usage:
+
+    for k in 1 2 3; do
+        uv run python scrape_signbank.py --shard $k/3 \\
+            --categories-file ../assets/data/categories.json \\
+            --existing-file ../assets/data/data.json \\
+            --output-file shard_$k.json &
+    done
+    wait
+    uv run python merge_shards.py shard_*.json \\
+        --categories-file ../assets/data/categories.json \\
+        --existing-file ../assets/data/data.json \\
+        --output-file all_letters.json
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import List, Tuple
+
+from common import LOG
+
+PARTIAL_VERSION = 1
+
+SHARD_BY = ["url", "letter"]
+
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """'K/N' -> (K, N), for argparse."""
+    try:
+        k, n = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected K/N, e.g. 3/8, not {spec!r}")
+    if not 1 <= k <= n:
+        raise argparse.ArgumentTypeError(
+            f"Shard {k}/{n} out of range, need 1 <= K <= N"
+        )
+    return k, n
+
+
+def shard_letters(letters: List[str], shard: Tuple[int, int]) -> List[str]:
+    """The letters shard K of N scrapes with --shard-by letter."""
+    k, n = shard
+    return [letter for i, letter in enumerate(letters) if i % n == k - 1]
+
+
+def url_in_shard(url: str, shard: Tuple[int, int]) -> bool:
+    """Whether shard K of N scrapes [url] with --shard-by url. Stable across
+    processes and machines, unlike hash()."""
+    k, n = shard
+    digest = hashlib.sha256(url.encode()).digest()
+    return int.from_bytes(digest[:8], "big") % n == k - 1
+
+
+def write_partial(
+    path: Path,
+    shard: Tuple[int, int],
+    shard_by: str,
+    letters: List[str],
+    entries: List[Tuple[list, str, dict]],
+):
+    """Write a shard's (position, word page URL, entry info) [entries]."""
+    partial = {
+        "version": PARTIAL_VERSION,
+        "shard": list(shard),
+        "shard_by": shard_by,
+        "letters": letters,
+        "entries": [
+            {"position": position, "url": url, "info": info}
+            for position, url, info in entries
+        ],
+    }
+    with open(path, "w") as f:
+        json.dump(partial, f)
+
+
+def load_partials(paths: List[Path]) -> List[dict]:
+    """
+    Load the partial outputs at [paths], checking they're exactly the N
+    shards of one sharded scrape, so a missing or stray shard can't silently
+    drop or mix in data.
+    """
+    partials = []
+    for path in paths:
+        with open(path) as f:
+            partial = json.load(f)
+        if partial.get("version") != PARTIAL_VERSION:
+            raise RuntimeError(f"{path} isn't a version {PARTIAL_VERSION} partial")
+        partials.append(partial)
+
+    first = partials[0]
+    num_shards = first["shard"][1]
+    for path, partial in zip(paths, partials):
+        for key in ("shard_by", "letters"):
+            if partial[key] != first[key]:
+                raise RuntimeError(
+                    f"{path} has {key} {partial[key]}, but {paths[0]} has {first[key]}"
+                )
+        if partial["shard"][1] != num_shards:
+            raise RuntimeError(
+                f"{path} is one of {partial['shard'][1]} shards, but {paths[0]} "
+                f"is one of {num_shards}"
+            )
+    got = sorted(partial["shard"][0] for partial in partials)
+    if got != list(range(1, num_shards + 1)):
+        raise RuntimeError(f"Expected shards 1..{num_shards} once each, got {got}")
+    return partials
+
+
+def merge_partials(word_to_info: dict, partials: List[dict]):
+    """
+    Apply every shard's entries to [word_to_info] in the order a single
+    process would have: by position, each word page only once.
+    """
+    records = [record for partial in partials for record in partial["entries"]]
+    records.sort(key=lambda record: record["position"])
+    seen = set()
+    for record in records:
+        if record["url"] in seen:
+            continue
+        seen.add(record["url"])
+        info = record["info"]
+        word_to_info[info["entry_in_english"]] = info
+    LOG.info(
+        f"Merged {len(seen)} entries from {len(partials)} shards "
+        f"({len(records) - len(seen)} scraped by more than one)"
+    )
+
+
+def parse_args():
+    from scrape_signbank import add_categories_args
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-d", "--debug", action="store_true")
+    parser.add_argument(
+        "partials", nargs="+", type=Path, help="Every shard's partial output"
+    )
+    add_categories_args(parser)
+    parser.add_argument("--existing-file", help="Start with this file as the base")
+    parser.add_argument("--output-file", required=True)
+    return parser.parse_args()
+
+
+def main():
+    # Imported here since scrape_signbank imports the helpers above.
+    from scrape_signbank import (
+        attach_categories,
+        check_media_bases,
+        dump_output,
+        get_existing_data,
+        load_categories_from_args,
+    )
+
+    args = parse_args()
+
+    if args.debug:
+        LOG.setLevel("DEBUG")
+    else:
+        LOG.setLevel("INFO")
+
+    partials = load_partials(args.partials)
+    word_to_categories = load_categories_from_args(args)
+
+    if args.existing_file:
+        existing_data = get_existing_data(args.existing_file)
+        word_to_info = {d["entry_in_english"]: d for d in existing_data["data"]}
+    else:
+        word_to_info = {}
+
+    merge_partials(word_to_info, partials)
+    attach_categories(word_to_info, word_to_categories)
+    check_media_bases(word_to_info)
+
+    with open(args.output_file, "w") as f:
+        f.write(dump_output(word_to_info))
+    LOG.info(f"Output written to {args.output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,10 +13,40 @@ fi
 
 cd "$(dirname "$0")"
 
+# Keep the data-v2.json being replaced and its version, to publish the patch
+# from it to the new one (see data_delta.py).
+old_version=$(cat ../assets/data/latest_version)
+new_version=$(date +%s)
+old_data=$(mktemp)
+trap 'rm -f "$old_data"' EXIT
+if [ -f ../assets/data/data-v2.json ]; then
+    cp ../assets/data/data-v2.json "$old_data"
+fi
+
 mv all_letters.json ../assets/data/data.json
 
 # Produce the path-based data-v2.json that current app builds read (old builds
 # keep reading the full-URL data.json). Raises if any video moved hosts.
 python make_data_v2.py
 
-date +%s > ../assets/data/latest_version
+# And data-v3.bin, the same data in a compact binary encoding. Only written if
+# it decodes back to exactly data-v2.json.
+python make_data_v3.py
+
+# And search_index.json, the app's prefix and keyword search precomputed.
+python make_search_index.py
+
+# And fuzzy_index.json, for "did you mean" suggestions on misspelled searches.
+python make_fuzzy_index.py
+
+# Add the patch to the chain in ../assets/data/deltas/, so clients on a recent
+# version can fetch a few KB instead of the whole file. Only published if it
+# reproduces data-v2.json exactly.
+python make_data_delta.py --old "$old_data" --old-version "$old_version" \
+    --new-version "$new_version"
+
+# Precompressed variants of every artifact, and manifest.json with their
+# content hashes, so clients and the CDN can skip what hasn't changed.
+python publish_data.py
+
+echo "$new_version" > ../assets/data/latest_version
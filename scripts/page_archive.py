@@ -0,0 +1,151 @@
+"""
+A compressed, content-addressed archive of fetched pages, so a scrape can be
+re-parsed later without touching the network.
+
+An archive is one zip file. Each distinct page body is stored once, deflated,
+under objects/<sha256 of the body>, and index.json maps every fetched URL to
+its body's hash plus what's needed to rebuild the response (final URL and text
+encoding). Pages that come back byte-identical, e.g. the same sub-page reached
+from two words, cost nothing extra.
+
+Recording: configure_page_archive(PageArchiveWriter(path)) makes load_url add
+every page it fetches. Replaying: configure_page_archive(PageArchiveReader(path))
+makes load_url serve pages from the archive instead of the network, raising
+PageNotArchived for anything the archive doesn't have.
+"""
+
+import datetime
+import hashlib
+import json
+import threading
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+INDEX_NAME = "index.json"
+OBJECTS_PREFIX = "objects/"
+
+
+class PageNotArchived(LookupError):
+    """The archive being replayed has no page for this URL. Deliberately not
+    something load_url retries."""
+
+
+def new_archive_path(directory: Path) -> Path:
+    """Where to write this run's archive: one file per run, named by start time."""
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return Path(directory) / f"pages-{stamp}.zip"
+
+
+class PageArchiveWriter:
+    """Records fetched pages into a new archive at [path]. Safe to share
+    between threads. The index is written on close(), so use it as a context
+    manager."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(self.path, "x", compression=zipfile.ZIP_DEFLATED)
+        self._lock = threading.Lock()
+        self._index = {}
+        self._stored = set()
+
+    def add(self, url: str, response: requests.Response):
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            if digest not in self._stored:
+                self._zip.writestr(OBJECTS_PREFIX + digest, body)
+                self._stored.add(digest)
+            self._index[url] = {
+                "sha256": digest,
+                "url": response.url,
+                "encoding": response.encoding,
+                "content_type": response.headers.get("Content-Type"),
+            }
+
+    def close(self):
+        with self._lock:
+            self._zip.writestr(
+                INDEX_NAME, json.dumps(self._index, indent=2, sort_keys=True)
+            )
+            self._zip.close()
+
+    def describe(self) -> str:
+        return (
+            f"{len(self._index)} URLs ({len(self._stored)} distinct pages) "
+            f"archived to {self.path}"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PageArchiveReader:
+    """Serves pages out of an archive written by PageArchiveWriter."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._lock = threading.Lock()
+        self._index = json.loads(self._zip.read(INDEX_NAME))
+
+    def __len__(self):
+        return len(self._index)
+
+    def _read(self, digest: str) -> bytes:
+        # ZipFile reads seek a shared file handle.
+        with self._lock:
+            return self._zip.read(OBJECTS_PREFIX + digest)
+
+    def load(self, url: str) -> requests.Response:
+        """The archived response for [url], as load_url would have returned it."""
+        record = self._index.get(url)
+        if record is None:
+            raise PageNotArchived(f"{url} is not in the page archive {self.path}")
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = record["url"]
+        response.encoding = record["encoding"]
+        if record["content_type"]:
+            response.headers = CaseInsensitiveDict(
+                {"Content-Type": record["content_type"]}
+            )
+        response.request = requests.Request("GET", url).prepare()
+        response._content = self._read(record["sha256"])
+        return response
+
+    def pages(self) -> Iterator[Tuple[str, str]]:
+        """Every archived (url, text), in URL order."""
+        for url in sorted(self._index):
+            yield url, self.load(url).text
+
+    def close(self):
+        self._zip.close()
+
+    def describe(self) -> str:
+        return f"Replayed pages from {self.path} ({len(self)} URLs)"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_corpus(
+    pages_dir: Optional[Path] = None, archive_path: Optional[Path] = None
+) -> List[Tuple[str, str]]:
+    """(name, text) for every page in a directory of saved *.html pages or in
+    a page archive, for tools that run the parsers over a fixed corpus."""
+    if archive_path is not None:
+        with PageArchiveReader(archive_path) as archive:
+            return list(archive.pages())
+    return [(path.name, path.read_text()) for path in sorted(pages_dir.glob("*.html"))]
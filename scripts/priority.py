@@ -0,0 +1,85 @@
+"""
+Ordering word pages so the most valuable ones get scraped first.
+
+A scrape that walks a..z and gets killed or throttled late leaves the words
+people look up most (and, be, ...) stale while zebra is fresh. Ordering the
+word pages by priority instead means a partial or time-boxed run always
+delivers the most valuable updates first.
+
+A word page's priority score comes from the word in its URL:
+
+- its rank in most_common_words.txt, if it's there: COMMON_WEIGHT for the most
+  common word, falling linearly to nearly nothing for the last one,
+- plus CATEGORY_WEIGHT if it's in any category (those are what the app's
+  category browser shows).
+
+So the top half of the common words come first whatever their categories, and
+below that being in a category counts for as much as being a fairly common
+word. Ties, e.g. all the words that are neither, keep their a..z order.
+"""
+
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import unquote, urlsplit
+
+from common import LOG
+
+COMMON_WORDS_FILE = Path(__file__).parent / "most_common_words.txt"
+
+COMMON_WEIGHT = 2.0
+CATEGORY_WEIGHT = 1.0
+
+
+def load_common_word_ranks(path: Path = COMMON_WORDS_FILE) -> Dict[str, int]:
+    """Word -> rank (1 is the most common) from a one-word-per-line file."""
+    ranks = {}
+    with open(path) as f:
+        for line in f:
+            word = line.strip().lower()
+            if word and word not in ranks:
+                ranks[word] = len(ranks) + 1
+    return ranks
+
+
+def word_from_url(url: str) -> str:
+    """The word a word page is for, from its URL, e.g. .../hello-1.html ->
+    hello. Good enough to look it up, before we've fetched the page."""
+    name = unquote(urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1])
+    name = name.removesuffix(".html")
+    word, _, number = name.rpartition("-")
+    if not word or not number.isdigit():
+        word = name
+    return word.lower()
+
+
+def priority_score(
+    word: str, common_word_ranks: Dict[str, int], categorised_words: set
+) -> float:
+    score = 0.0
+    rank = common_word_ranks.get(word)
+    if rank is not None:
+        score += COMMON_WEIGHT * (1 - (rank - 1) / len(common_word_ranks))
+    if word in categorised_words:
+        score += CATEGORY_WEIGHT
+    return score
+
+
+def order_by_priority(
+    urls: List[str],
+    common_word_ranks: Dict[str, int],
+    word_to_categories: Dict[str, List[str]],
+) -> List[str]:
+    """[urls] highest priority first, otherwise in the order given."""
+    categorised_words = {word.lower() for word in word_to_categories}
+    scores = {
+        url: priority_score(word_from_url(url), common_word_ranks, categorised_words)
+        for url in urls
+    }
+    ordered = sorted(urls, key=lambda url: -scores[url])
+    common = sum(word_from_url(url) in common_word_ranks for url in urls)
+    categorised = sum(word_from_url(url) in categorised_words for url in urls)
+    LOG.info(
+        f"Priority order: {len(urls)} word pages, {common} for common words, "
+        f"{categorised} for words in a category"
+    )
+    return ordered
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""
+Write precompressed variants of every data artifact in assets/data and a
+manifest of their content hashes, so clients and the CDN can tell whether
+anything actually changed and serve the smallest encoding.
+
+Each artifact gets a gzip variant (<name>.gz), a zstd one (<name>.zst, with
+Python 3.14's compression.zstd) and, with --brotli, a brotli one (<name>.br,
+which needs `uv run --with brotli ...`). Brotli is asked for explicitly rather
+than used whenever the package happens to be installed, so the manifest only
+lists variants that get published: the workflow doesn't commit .br files.
+Variants of an encoding that isn't being written are removed, so a stale one
+is never left next to the manifest. manifest.json lists, for each artifact,
+the SHA-256 and size of its content and of every variant:
+
+{
+    "content_hash": "<hash of the artifact hashes>",
+    "artifacts": {
+        "data-v2.json": {
+            "sha256": "...",
+            "bytes": 3456789,
+            "encodings": {"gzip": {"file": "data-v2.json.gz", "sha256": "...", "bytes": 456789}, ...}
+        },
+        ...
+    }
+}
+
+Everything is deterministic (no timestamps, not even gzip's), so re-running
+this on identical data writes an identical manifest and identical variants:
+a client comparing content_hash, or an artifact's sha256, with the one it has
+downloads nothing on a week where nothing changed. move_data.sh runs this.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from common import LOG
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "assets" / "data"
+MANIFEST_NAME = "manifest.json"
+
+# The artifacts clients download, published if they exist.
+ARTIFACTS = [
+    "data.json",
+    "data-v2.json",
+    "data-v3.bin",
+    "categories.json",
+    "category_index.json",
+    "search_index.json",
+    "fuzzy_index.json",
+]
+
+
+def _gzip(content: bytes) -> bytes:
+    # mtime=0 and no file name, so the same content always compresses to the
+    # same bytes.
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+# Every variant suffix publish can write, for removing stale ones.
+VARIANT_SUFFIXES = (".gz", ".zst", ".br")
+
+
+def _encoders(with_brotli: bool) -> dict:
+    """Encoding name -> (file suffix, compress function), for the encodings
+    to produce. Raises if [with_brotli] and the brotli package is missing."""
+    encoders = {"gzip": (".gz", _gzip)}
+    try:
+        from compression import zstd
+    except ImportError:
+        LOG.warning("No compression.zstd (needs Python 3.14), skipping zstd")
+    else:
+        encoders["zstd"] = (".zst", lambda content: zstd.compress(content, level=19))
+    if with_brotli:
+        try:
+            import brotli
+        except ImportError as e:
+            raise RuntimeError(
+                "--brotli needs the brotli package (uv run --with brotli)"
+            ) from e
+        encoders["br"] = (".br", lambda content: brotli.compress(content, quality=11))
+    return encoders
+
+
+def _sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def publish(data_dir: Path, with_brotli: bool = False) -> dict:
+    """Write every artifact's variants into [data_dir], returning the
+    manifest."""
+    encoders = _encoders(with_brotli)
+    suffixes = {suffix for suffix, _ in encoders.values()}
+    artifacts = {}
+    for name in ARTIFACTS:
+        path = data_dir / name
+        if not path.exists():
+            continue
+        for suffix in VARIANT_SUFFIXES:
+            stale = data_dir / (name + suffix)
+            if suffix not in suffixes and stale.exists():
+                stale.unlink()
+        content = path.read_bytes()
+        encodings = {}
+        for encoding, (suffix, compress) in encoders.items():
+            compressed = compress(content)
+            variant = data_dir / (name + suffix)
+            if not variant.exists() or variant.read_bytes() != compressed:
+                variant.write_bytes(compressed)
+            encodings[encoding] = {
+                "file": variant.name,
+                "sha256": _sha256(compressed),
+                "bytes": len(compressed),
+            }
+        artifacts[name] = {
+            "sha256": _sha256(content),
+            "bytes": len(content),
+            "encodings": encodings,
+        }
+        smallest = min(encodings.values(), key=lambda e: e["bytes"])
+        LOG.info(
+            f"{name}: {len(content)} bytes, smallest encoded {smallest['file']} "
+            f"{smallest['bytes']} bytes"
+        )
+    hashes = {name: artifact["sha256"] for name, artifact in artifacts.items()}
+    content_hash = _sha256(json.dumps(hashes, sort_keys=True).encode())
+    return {"content_hash": content_hash, "artifacts": artifacts}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument(
+        "--brotli",
+        action="store_true",
+        help="Also write brotli variants (needs uv run --with brotli). Off in "
+        "CI, which doesn't publish them.",
+    )
+    args = parser.parse_args()
+
+    LOG.setLevel("INFO")
+    manifest_path = args.data_dir / MANIFEST_NAME
+    old_hash = None
+    if manifest_path.exists():
+        with open(manifest_path) as f:
+            old_hash = json.load(f).get("content_hash")
+
+    manifest = publish(args.data_dir, args.brotli)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    if manifest["content_hash"] == old_hash:
+        LOG.info(f"Content unchanged ({old_hash[:12]}), {manifest_path} is as it was")
+    else:
+        LOG.info(f"Wrote {manifest_path}, content {manifest['content_hash'][:12]}")
+
+
+if __name__ == "__main__":
+    main()
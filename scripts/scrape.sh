@@ -27,7 +27,15 @@ echo ""
 
 # Step 1: Scrape categories.
 echo "Step 1: Scraping categories..."
-if python scrape_categories.py -d --output-file ../assets/data/categories.json; then
+# Both scrapes keep an on-disk HTTP cache in http_cache/ and revalidate it with
+# conditional GETs, so pages that haven't changed since the last run (the CI
+# workflow restores the directory between runs) aren't downloaded again.
+# Finished categories are checkpointed in categories_journal.jsonl, so if this
+# fails, re-running only redoes the categories that didn't finish.
+if python scrape_categories.py -d --http-cache-dir http_cache \
+    --journal categories_journal.jsonl \
+    --output-file ../assets/data/categories.json \
+    --index-file ../assets/data/category_index.json; then
     echo "Categories scraped successfully."
 else
     echo "ERROR: Failed to scrape categories."
@@ -41,7 +49,7 @@ sleep 10
 # Step 2: Scrape entries.
 echo ""
 echo "Step 2: Scraping entries..."
-./incremental_scrape.sh $ARGS
+./incremental_scrape.sh --category-index ../assets/data/category_index.json $ARGS
 
 # Step 3: Remove videos that 404 on the media host. The prefilter snapshot is
 # taken here (not by the filter) so verify_removed_media.py's "before" input is
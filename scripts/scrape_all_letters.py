@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+
+"""
+Scrapes the signbank one letter at a time, with automatic resume support.
+
+This is what incremental_scrape.sh runs. It scrapes every letter in a single
+process: the progress data, the categories file and the HTTP machinery are
+loaded and set up once, instead of once per letter.
+
+Progress is checkpointed after each letter by appending that letter's entries
+to a journal, rather than by rewriting the whole accumulated data file:
+
+    scrape_progress.json   the data the scrape started from (a copy of
+                           ../assets/data/data.json), never rewritten
+    scrape_journal.jsonl   one line per completed letter: {"letter", "data"},
+                           or with --priority, per batch of word pages:
+                           {"urls", "entries"}
+
+Resuming loads the progress file, replays the journal over it and carries on
+with the letters the journal doesn't have yet. A journal line cut short by a
+crash is dropped, so that letter is just scraped again. The output is only
+serialised once, into all_letters.json at the end, and is identical to
+what running scrape_signbank.py letter by letter over the progress file would
+produce.
+
+With --priority, the word pages of every letter still to do are scraped in
+priority order instead (see priority.py), in batches of --batch-size, each
+checkpointed as it completes. Resuming skips the word pages already in the
+journal. Entries are applied in a..z order at the end, so a run that gets
+through everything gives the same output as one without --priority.
+
+--time-budget stops once that many minutes have passed, and writes the output
+from what's done so far. A letter (or batch) still being scraped then is
+cancelled and left out, so one big letter can't run far past the budget; it's
+scraped again from the start next time. Running again carries on where it
+stopped.
+
+Usage:
+
+    # Start fresh or resume from the last checkpoint.
+    uv run python scrape_all_letters.py
+
+    # Force a fresh start (ignore any existing progress).
+    uv run python scrape_all_letters.py --fresh
+
+    # Start/resume from letter 'd', re-scraping it and every later letter even
+    # if they were already completed.
+    uv run python scrape_all_letters.py --from d
+
+    # Only fetch the word pages that changed since the last run (see
+    # change_state.py).
+    uv run python scrape_all_letters.py --change-state scrape_state.json
+
+    # Most valuable word pages first, stopping after two hours.
+    uv run python scrape_all_letters.py --priority --time-budget 120
+"""
+
+import argparse
+import asyncio
+import shutil
+import string
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from change_state import ChangeState
+from common import LOG, append_journal, forget_recent_pages, load_journal
+from priority import load_common_word_ranks, order_by_priority
+from scrape_signbank import (
+    Scraper,
+    add_categories_args,
+    add_change_detection_args,
+    add_scrape_args,
+    attach_categories,
+    check_media_bases,
+    dump_output,
+    entries_to_dict,
+    get_existing_data,
+    load_categories_from_args,
+    scrape_letters,
+)
+
+PROGRESS_FILE = Path("scrape_progress.json")
+JOURNAL_FILE = Path("scrape_journal.jsonl")
+
+DEFAULT_DATA_FILE = Path("../assets/data/data.json")
+DEFAULT_CATEGORIES_FILE = Path("../assets/data/categories.json")
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def start_fresh(data_file: Path):
+    shutil.copyfile(data_file, PROGRESS_FILE)
+    JOURNAL_FILE.write_text("")
+
+
+class OutOfTime(Exception):
+    """The time budget ran out part way through a letter or batch."""
+
+
+def out_of_time(deadline: Optional[float]) -> bool:
+    if deadline is not None and time.monotonic() >= deadline:
+        LOG.warning("Time budget used up, stopping here. Run again to carry on.")
+        return True
+    return False
+
+
+async def before_deadline(deadline: Optional[float], awaitable):
+    """Await [awaitable], cancelling it and raising OutOfTime if [deadline]
+    passes first. Cancelling the scrape stops its fetches and parses (see
+    scrape_signbank.scrape_entries), and nothing it did is checkpointed."""
+    if deadline is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, deadline - time.monotonic())
+    except TimeoutError:
+        LOG.warning(
+            "Time budget used up part way, dropping what's unfinished. Run "
+            "again to carry on."
+        )
+        raise OutOfTime()
+
+
+async def with_attempts(description: str, args, fn, *fn_args):
+    """Await fn(*fn_args) up to --attempts times, waiting --retry-wait between
+    them. Returns its result, or None if every attempt failed."""
+    for attempt in range(1, args.attempts + 1):
+        LOG.info(f"Attempt {attempt} for {description}...")
+        try:
+            return await fn(*fn_args)
+        except Exception as e:
+            LOG.error(f"Attempt {attempt} failed for {description}: {e}")
+            # Whatever the failed attempt fetched is suspect; fetch it again.
+            forget_recent_pages()
+            if attempt < args.attempts:
+                LOG.info(f"Waiting {args.retry_wait} seconds before retry...")
+                await asyncio.sleep(args.retry_wait)
+    return None
+
+
+async def scrape_letter(
+    scraper: Scraper,
+    letter: str,
+    word_to_info: dict,
+    change_state: Optional[ChangeState],
+    args,
+) -> dict:
+    """
+    Scrape one letter, returning {word: info} for the entries we fetched.
+    With a [change_state] that's only the ones that might have changed; the
+    rest are already in [word_to_info]. A letter that fails check_media_bases
+    raises, so isn't checkpointed.
+    """
+    entries = await scrape_letters(scraper, [letter], word_to_info, change_state, args)
+    return entries_to_dict(entries)
+
+
+async def scrape_batch(
+    scraper: Scraper,
+    urls: List[str],
+    index: list,
+    change_state: Optional[ChangeState],
+    full_refresh: bool,
+) -> Dict[str, dict]:
+    """Scrape one --priority batch of word pages, returning {URL: info}. Like
+    a letter, a batch that fails check_media_bases isn't checkpointed."""
+    entries = await scraper.scrape_entries(urls)
+    check_media_bases(entries_to_dict(entries))
+    if change_state is not None:
+        change_state.record([], index, urls, entries, full_refresh)
+    return {entry.url: entry.get_dict()[entry.entry_in_english] for entry in entries}
+
+
+async def scrape_by_priority(
+    scraper: Scraper,
+    letters: List[str],
+    word_to_info: dict,
+    batch_entries: Dict[str, dict],
+    done_urls: set,
+    word_to_categories: Dict[str, List[str]],
+    change_state: Optional[ChangeState],
+    deadline: Optional[float],
+    args,
+) -> list:
+    """
+    Scrape the word pages of [letters] not in [done_urls] in priority order,
+    in checkpointed batches, adding what they produce to [batch_entries] and
+    [done_urls]. Returns the index of [letters]' word pages, in a..z order,
+    or [] if the time budget runs out while fetching it.
+    """
+    try:
+        index = await before_deadline(
+            deadline, scraper.get_word_page_index(letters=letters)
+        )
+    except OutOfTime:
+        return []
+    # The letter pages come back first pages first; the output wants a..z.
+    index.sort(key=lambda item: letters.index(item[2]))
+
+    # What the data will be once the batches done so far are applied.
+    current = dict(word_to_info)
+    for info in batch_entries.values():
+        current[info["entry_in_english"]] = info
+
+    full_refresh = False
+    if change_state is None:
+        urls = [url for url, _, _ in index]
+    else:
+        full_refresh = args.full_refresh or change_state.full_refresh_due(
+            letters, args.full_refresh_days
+        )
+        urls = change_state.plan(index, current, full_refresh)
+    urls = scraper.select_word_page_urls([url for url in urls if url not in done_urls])
+    urls = order_by_priority(urls, load_common_word_ranks(), word_to_categories)
+
+    batches = [
+        urls[start : start + args.batch_size]
+        for start in range(0, len(urls), args.batch_size)
+    ]
+    finished = True
+    for num, batch in enumerate(batches, 1):
+        if out_of_time(deadline):
+            finished = False
+            break
+        try:
+            entries = await before_deadline(
+                deadline,
+                with_attempts(
+                    f"batch {num}/{len(batches)}",
+                    args,
+                    scrape_batch,
+                    scraper,
+                    batch,
+                    index,
+                    change_state,
+                    full_refresh,
+                ),
+            )
+        except OutOfTime:
+            finished = False
+            break
+        if entries is None:
+            LOG.warning(f"All attempts failed for batch {num}, continuing...")
+            finished = False
+            continue
+        append_journal(JOURNAL_FILE, {"urls": batch, "entries": entries})
+        batch_entries.update(entries)
+        done_urls.update(batch)
+        if change_state is not None:
+            change_state.save()
+
+    if finished and change_state is not None:
+        # Every word page of these letters is accounted for, so forget the
+        # ones no longer listed and stamp any full refresh.
+        change_state.record(letters, index, [], [], full_refresh)
+        change_state.save()
+    return index
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-d", "--debug", action="store_true")
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Force a fresh start, ignoring any existing progress.",
+    )
+    parser.add_argument(
+        "--from",
+        dest="start_from",
+        metavar="LETTER",
+        help="Start from this letter, re-scraping it and every later letter "
+        "even if already completed.",
+    )
+    parser.add_argument(
+        "--data-file",
+        type=Path,
+        default=DEFAULT_DATA_FILE,
+        help=f"Data to start a fresh scrape from (default: {DEFAULT_DATA_FILE}).",
+    )
+    add_categories_args(parser, DEFAULT_CATEGORIES_FILE)
+    parser.add_argument("--output-file", type=Path, default=Path("all_letters.json"))
+    parser.add_argument(
+        "--attempts",
+        type=int,
+        default=3,
+        help="Tries per letter before moving on to the next (default: 3).",
+    )
+    parser.add_argument(
+        "--retry-wait",
+        type=int,
+        default=30,
+        help="Seconds to wait between tries of a letter (default: 30).",
+    )
+    parser.add_argument(
+        "--priority",
+        action="store_true",
+        help="Scrape the most valuable word pages first, across all letters, "
+        "checkpointing in batches. See priority.py.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="With --priority, word pages per checkpointed batch (default: "
+        f"{DEFAULT_BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="MINUTES",
+        help="Stop after this many minutes, cancelling the letter (or batch) "
+        "in progress, and write the output from what's done.",
+    )
+    add_scrape_args(parser)
+    add_change_detection_args(parser)
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    if args.debug:
+        LOG.setLevel("DEBUG")
+    else:
+        LOG.setLevel("INFO")
+
+    deadline = None
+    if args.time_budget is not None:
+        deadline = time.monotonic() + args.time_budget * 60
+
+    # Initialize state.
+    if args.fresh or not JOURNAL_FILE.exists():
+        LOG.info("Starting fresh scrape...")
+        start_fresh(args.data_file)
+    else:
+        LOG.info("Resuming from previous state...")
+        if not PROGRESS_FILE.exists():
+            LOG.warning("Journal exists but progress file is missing. Starting fresh.")
+            start_fresh(args.data_file)
+
+    # Load the starting data once and bring it up to date from the journal.
+    existing_data = get_existing_data(PROGRESS_FILE)
+    word_to_info = {d["entry_in_english"]: d for d in existing_data["data"]}
+    completed = set()
+    # --priority batches: word page URL -> info, and every URL tried.
+    batch_entries = {}
+    done_urls = set()
+    for record in load_journal(JOURNAL_FILE):
+        if "letter" in record:
+            word_to_info.update(record["data"])
+            completed.add(record["letter"])
+        else:
+            batch_entries.update(record["entries"])
+            done_urls.update(record["urls"])
+    if not args.priority:
+        # Without --priority there's no a..z index to put these in order by.
+        for info in batch_entries.values():
+            word_to_info[info["entry_in_english"]] = info
+        batch_entries = {}
+    LOG.info(f"Already completed letters: {' '.join(sorted(completed)) or 'none'}")
+
+    word_to_categories = load_categories_from_args(args)
+    change_state = ChangeState(args.change_state) if args.change_state else None
+
+    letters = []
+    for letter in string.ascii_lowercase:
+        # Skip if we should start from a specific letter.
+        if args.start_from and letter < args.start_from:
+            LOG.info(f"Skipping letter {letter} (starting from {args.start_from})")
+            continue
+
+        # Skip if already completed (unless --from was specified, which
+        # overrides).
+        if not args.start_from and letter in completed:
+            LOG.info(f"Skipping letter {letter} (already completed)")
+            continue
+        letters.append(letter)
+
+    succeeded = []
+    failed = []
+    async with Scraper(args) as scraper:
+        if args.priority:
+            index = []
+            if letters:
+                index = await scrape_by_priority(
+                    scraper,
+                    letters,
+                    word_to_info,
+                    batch_entries,
+                    done_urls,
+                    word_to_categories,
+                    change_state,
+                    deadline,
+                    args,
+                )
+            # Apply the batches in a..z order, as scraping letter by letter
+            # would have.
+            position = {}
+            for url, _, _ in index:
+                position.setdefault(url, len(position))
+            for url in sorted(
+                batch_entries, key=lambda u: position.get(u, len(position))
+            ):
+                info = batch_entries[url]
+                word_to_info[info["entry_in_english"]] = info
+            letters = []
+
+        for letter in letters:
+            if out_of_time(deadline):
+                break
+            LOG.info(f"Processing letter: {letter}")
+            try:
+                data = await before_deadline(
+                    deadline,
+                    with_attempts(
+                        f"letter {letter}",
+                        args,
+                        scrape_letter,
+                        scraper,
+                        letter,
+                        word_to_info,
+                        change_state,
+                        args,
+                    ),
+                )
+            except OutOfTime:
+                break
+            if data is None:
+                LOG.warning(
+                    f"All attempts failed for letter {letter}, continuing to next "
+                    "letter..."
+                )
+                failed.append(letter)
+                continue
+            append_journal(JOURNAL_FILE, {"letter": letter, "data": data})
+            word_to_info.update(data)
+            if change_state is not None:
+                # Only once the letter's data is safely in the journal.
+                change_state.save()
+            LOG.info(f"Successfully scraped letter {letter}")
+            succeeded.append(letter)
+
+    if args.priority:
+        LOG.info(f"Scraping complete! Word pages done: {len(done_urls)}")
+    else:
+        LOG.info(f"Scraping complete! Successful letters: {len(succeeded)}")
+        LOG.info(f"Failed letters: {len(failed)}")
+    if failed:
+        LOG.warning(f"Letters that failed: {' '.join(failed)}")
+        LOG.warning(
+            "You can retry failed letters with: "
+            "uv run ./incremental_scrape.sh --from <letter>"
+        )
+
+    attach_categories(word_to_info, word_to_categories)
+    with open(args.output_file, "w") as f:
+        f.write(dump_output(word_to_info))
+
+    LOG.info(f"Output written to {args.output_file}")
+    LOG.info("If everything looks good, run: ./move_data.sh")
+
+
+def main_wrapper():
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    main_wrapper()
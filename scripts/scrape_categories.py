@@ -7,6 +7,14 @@ with this format:
 {
     "category": ["word1", "word2", "word3"],
 }
+
+Categories are scraped concurrently, --parallel-categories at a time, with at
+most --num-workers page requests in flight across all of them. With
+--journal, each category is checkpointed as soon as all of its pages are in,
+so if one category keeps getting bad pages the others aren't lost: the run
+fails without writing any output, and re-running it only redoes the
+categories that didn't finish. The journal is removed once the output is
+written.
 """
 
 import argparse
@@ -14,14 +22,31 @@ import asyncio
 import json
 import re
 import sys
+import time
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
 from retry import retry
 
-from common import LOG, load_url
+from category_index import build_category_index, write_category_index
+from common import (
+    DEFAULT_PARSER_BACKEND,
+    LOG,
+    PARSER_BACKENDS,
+    add_http_cache_args,
+    add_rate_limit_args,
+    add_retry_guard_args,
+    append_journal,
+    configure_http_cache,
+    configure_rate_limits,
+    configure_retry_guard,
+    load_journal,
+    load_url,
+    log_host_pauses,
+    make_soup,
+    set_parser_backend,
+)
 
 SITE_ROOT = "https://www.auslan.org.au"
 # These should be lower case.
@@ -46,6 +71,14 @@ MAX_LOST_WORDS_TOTAL = 25
 # diagnosed from the artifacts rather than guessed at.
 BAD_PAGES_DIR = Path(__file__).parent / "bad_pages"
 
+# We don't use too many threads to make sure we don't get ratelimited.
+DEFAULT_NUM_WORKERS = 4
+DEFAULT_PARALLEL_CATEGORIES = 4
+
+# A journal older than this is from some earlier, abandoned run, and what it
+# recorded may well have changed on the site since.
+JOURNAL_MAX_AGE_HOURS = 24
+
 # Strings that, when found in a bad response body, identify a known failure
 # mode: either we're being blocked, or the site served its soft-404 page (the
 # proxy returns "page not found" content with a 200 when the backend hiccups,
@@ -85,7 +118,7 @@ def describe_bad_response(response, save_slug: str) -> str:
     scraper is being blocked (WAF, captcha, rate limiting, UA filtering), the
     logs say so directly instead of leaving it to be guessed at.
     """
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = make_soup(response.text)
     title = soup.title.text.strip() if soup.title else "<no title>"
     body_lower = response.text.lower()
     hints = [hint for hint in SUSPICIOUS_BODY_HINTS if hint in body_lower]
@@ -120,17 +153,25 @@ def describe_bad_response(response, save_slug: str) -> str:
 )
 def load_categories() -> Dict[str, str]:
     response = load_url(SITE_ROOT)
+    try:
+        return parse_categories(response.text)
+    except BadResultsPageError as e:
+        raise BadResultsPageError(
+            f"{SITE_ROOT}: {e}. " + describe_bad_response(response, "home")
+        ) from e
+
 
-    # Use BeautifulSoup to parse the HTML content
-    soup = BeautifulSoup(response.text, "html.parser")
+def parse_categories(html_text: str) -> Dict[str, str]:
+    """Parse the category dropdown on the home page into a map of category name
+    to query value. Raises BadResultsPageError if the dropdown is missing or
+    empty.
+    """
+    soup = make_soup(html_text)
 
     # Find the select element by its ID
     category_select = soup.find("select", {"id": "id_menu_category"})
     if category_select is None:
-        raise BadResultsPageError(
-            f"No category dropdown found on the home page {SITE_ROOT}. "
-            + describe_bad_response(response, "home")
-        )
+        raise BadResultsPageError("No category dropdown found on the home page")
 
     # Extract options from the select element
     categories = {}
@@ -142,10 +183,7 @@ def load_categories() -> Dict[str, str]:
         categories[category_name] = query_value
 
     if not categories:
-        raise BadResultsPageError(
-            "The category dropdown had no options. "
-            + describe_bad_response(response, "home")
-        )
+        raise BadResultsPageError("The category dropdown had no options")
 
     return categories
 
@@ -155,7 +193,7 @@ def parse_results_page(html_text: str) -> Tuple[List[str], int]:
     number of pages in the category. Raises BadResultsPageError if the page
     doesn't look like a real, non-empty results page.
     """
-    soup = BeautifulSoup(html_text, "html.parser")
+    soup = make_soup(html_text)
 
     # Find the div that contains the words and extract the text within each
     # word link.
@@ -240,6 +278,77 @@ async def get_words_in_category(executor, category_name, category_query) -> List
     return words
 
 
+def load_finished_categories(journal: Path, fresh: bool) -> Dict[str, List[str]]:
+    """
+    Category query -> words for each category an earlier, interrupted run
+    checkpointed in [journal]. Starts the journal afresh instead if asked to,
+    or if it's too old to trust.
+    """
+    if journal.exists() and not fresh:
+        age_hours = (time.time() - journal.stat().st_mtime) / 3600
+        if age_hours <= JOURNAL_MAX_AGE_HOURS:
+            finished = {
+                record["query"]: record["words"] for record in load_journal(journal)
+            }
+            LOG.info(f"Resuming: {len(finished)} categories already done")
+            return finished
+        LOG.warning(f"Ignoring {journal}, it's {age_hours:.0f} hours old")
+    journal.write_text("")
+    return {}
+
+
+async def scrape_categories(
+    executor,
+    categories: Dict[str, str],
+    parallel_categories: int,
+    journal: Optional[Path],
+    finished: Dict[str, List[str]],
+) -> Dict[str, List[str]]:
+    """
+    Category query -> words for every category in [categories] (name ->
+    query) that isn't already [finished], scraping [parallel_categories] at
+    once. Each one is checkpointed in [journal] as it finishes.
+
+    A category that fails doesn't stop the others: every category is given
+    its chance, then if any failed this raises, so nothing is written with a
+    category missing.
+    """
+    slots = asyncio.Semaphore(parallel_categories)
+
+    async def scrape_category(category_name: str, category_query: str):
+        async with slots:
+            words = await get_words_in_category(executor, category_name, category_query)
+        LOG.info(f"Found {len(words)} words in category {category_name}")
+        if journal is not None:
+            append_journal(
+                journal,
+                {"category": category_name, "query": category_query, "words": words},
+            )
+        return words
+
+    todo = {name: query for name, query in categories.items() if query not in finished}
+    results = await asyncio.gather(
+        *(scrape_category(name, query) for name, query in todo.items()),
+        return_exceptions=True,
+    )
+
+    words_by_query = dict(finished)
+    failed = []
+    for (name, query), result in zip(todo.items(), results):
+        if isinstance(result, BaseException):
+            LOG.error(f"Category {name} failed: {result}")
+            failed.append(name)
+        else:
+            words_by_query[query] = result
+    if failed:
+        resume = " Re-run to retry just those." if journal is not None else ""
+        raise RuntimeError(
+            f"{len(failed)} of {len(categories)} categories failed: "
+            f"{', '.join(failed)}.{resume}"
+        )
+    return words_by_query
+
+
 def load_existing_data(path: str):
     try:
         with open(path) as f:
@@ -285,6 +394,45 @@ def find_data_loss(
     return problems
 
 
+def check_data_loss(args, data: Dict[str, List[str]]) -> bool:
+    """
+    Guard against writing output that silently lost data: whether [data] is
+    fine to write over args.output_file, or --force says to anyway. Only
+    applies to a full scrape over an existing output file; --categories is a
+    test mode.
+
+    If not, the journal is discarded too. It holds the same suspect pages,
+    and a re-run resuming from it would only rebuild the same data and fail
+    again.
+    """
+    if not args.output_file or args.categories:
+        return True
+    old_data = load_existing_data(args.output_file)
+    if old_data is None:
+        return True
+    log_diff_summary(old_data, data)
+    problems = find_data_loss(old_data, data)
+    if not problems:
+        return True
+    for problem in problems:
+        LOG.error(problem)
+    if args.force:
+        LOG.warning("--force given, writing the output anyway")
+        return True
+    LOG.error(
+        "This much data loss usually means the scrape got bad pages rather "
+        "than Signbank genuinely removing content. If the removals are real "
+        "(check the site), re-run with --force."
+    )
+    if args.journal and args.journal.exists():
+        args.journal.unlink()
+        LOG.error(
+            f"Discarded {args.journal}, so a re-run scrapes every category "
+            "again rather than resuming from the same pages"
+        )
+    return False
+
+
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("-d", "--debug", action="store_true")
@@ -295,6 +443,47 @@ def parse_args():
         help="Write the output even if it lost suspiciously many words "
         "compared to the existing output file",
     )
+    parser.add_argument(
+        "--parser",
+        choices=PARSER_BACKENDS,
+        default=DEFAULT_PARSER_BACKEND,
+        help="HTML tree builder to parse pages with (default: "
+        f"{DEFAULT_PARSER_BACKEND}). See check_parser_parity.py.",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=DEFAULT_NUM_WORKERS,
+        help="Most page requests in flight at once, across all categories "
+        f"(default: {DEFAULT_NUM_WORKERS}).",
+    )
+    parser.add_argument(
+        "--parallel-categories",
+        type=int,
+        default=DEFAULT_PARALLEL_CATEGORIES,
+        help="Most categories being scraped at once (default: "
+        f"{DEFAULT_PARALLEL_CATEGORIES}).",
+    )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        help="Checkpoint each finished category here, and resume from it if "
+        "a run fails. Removed once the output is written.",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore any categories checkpointed in --journal.",
+    )
+    parser.add_argument(
+        "--index-file",
+        type=Path,
+        help="Also write the word -> categories reverse index here. See "
+        "category_index.py.",
+    )
+    add_http_cache_args(parser)
+    add_rate_limit_args(parser)
+    add_retry_guard_args(parser)
     output_args = parser.add_mutually_exclusive_group(required=True)
     output_args.add_argument("--output-file")
     output_args.add_argument("--stdout", action="store_true")
@@ -309,8 +498,17 @@ async def main():
     else:
         LOG.setLevel("INFO")
 
-    # We don't use too many thread to make sure we don't get ratelimited.
-    executor = ThreadPoolExecutor(max_workers=4)
+    set_parser_backend(args.parser)
+    http_cache = configure_http_cache(args.http_cache_dir, args.http_cache_max_mb)
+    configure_rate_limits(args.rate, args.rate_burst, args.rate_limit)
+    retry_guard = configure_retry_guard(
+        args.retry_budget,
+        args.retry_budget_min,
+        args.breaker_failures,
+        args.breaker_cooldown,
+    )
+
+    executor = ThreadPoolExecutor(max_workers=args.num_workers)
     loop = asyncio.get_running_loop()
 
     if args.categories:
@@ -322,33 +520,30 @@ async def main():
 
     LOG.info(f"Fetching data for these categories: {list(categories.keys())}")
 
+    finished = {}
+    if args.journal:
+        finished = load_finished_categories(args.journal, args.fresh)
+    try:
+        words_by_query = await scrape_categories(
+            executor, categories, args.parallel_categories, args.journal, finished
+        )
+    except RuntimeError as e:
+        LOG.error(e)
+        sys.exit(1)
+
+    # In the site's order, however the scrapes finished.
     data = {}
     for category_name, category_query in categories.items():
-        words = await get_words_in_category(executor, category_name, category_query)
         category_name = RENAMED_CATEGORY_NAMES.get(category_name.lower(), category_name)
-        data[category_name] = words
-        LOG.info(f"Found {len(words)} words in category {category_name}")
+        data[category_name] = words_by_query[category_query]
+
+    if not check_data_loss(args, data):
+        sys.exit(1)
 
-    # Guard against writing output that silently lost data. Only applies to a
-    # full scrape over an existing output file; --categories is a test mode.
-    if args.output_file and not args.categories:
-        old_data = load_existing_data(args.output_file)
-        if old_data is not None:
-            log_diff_summary(old_data, data)
-            problems = find_data_loss(old_data, data)
-            if problems:
-                for problem in problems:
-                    LOG.error(problem)
-                if args.force:
-                    LOG.warning("--force given, writing the output anyway")
-                else:
-                    LOG.error(
-                        "This much data loss usually means the scrape got bad "
-                        "pages rather than Signbank genuinely removing "
-                        "content. If the removals are real (check the site), "
-                        "re-run with --force."
-                    )
-                    sys.exit(1)
+    if http_cache is not None:
+        http_cache.log_stats()
+    retry_guard.log_stats()
+    log_host_pauses()
 
     # Build and output the JSON.
     json_output = json.dumps(data, indent=4)
@@ -357,6 +552,14 @@ async def main():
     else:
         with open(args.output_file, "w") as f:
             f.write(json_output)
+    if args.index_file:
+        index = build_category_index(data)
+        write_category_index(args.index_file, index)
+        LOG.info(
+            f"Category index version {index['version']} written to {args.index_file}"
+        )
+    if args.journal:
+        args.journal.unlink(missing_ok=True)
 
 
 def main_wrapper():
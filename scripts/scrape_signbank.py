@@ -31,16 +31,59 @@ videos, their own definitions, and so on.
 
 import argparse
 import asyncio
+import contextlib
+import hashlib
+import itertools
 import json
 import string
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Dict, List
-
-from bs4 import BeautifulSoup
-
-from common import LOG, get_pages_html, strip_media_base
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from category_index import index_word_to_categories, load_category_index
+from change_state import DEFAULT_FULL_REFRESH_DAYS, ChangeState
+from common import (
+    DEFAULT_PARSER_BACKEND,
+    LOG,
+    PARSER_BACKENDS,
+    AsyncFetcher,
+    add_concurrency_args,
+    add_http_cache_args,
+    add_http_engine_args,
+    add_page_coalescing_args,
+    add_rate_limit_args,
+    add_retry_guard_args,
+    configure_concurrency,
+    configure_http_cache,
+    configure_page_archive,
+    configure_page_coalescing,
+    configure_rate_limits,
+    configure_retry_guard,
+    fetch_page,
+    forget_recent_page,
+    get_pages_html,
+    log_host_pauses,
+    make_soup,
+    set_parser_backend,
+    strip_media_base,
+)
+from fuzzy_index import FuzzyIndex, build_name_index
+from merge_shards import (
+    SHARD_BY,
+    parse_shard_spec,
+    shard_letters,
+    url_in_shard,
+    write_partial,
+)
+from page_archive import PageArchiveReader, PageArchiveWriter, new_archive_path
+from word_urls import (
+    DEFAULT_KNOWN_BAD_RECHECK_DAYS,
+    KnownBadUrls,
+    canonical_word_url,
+    select_word_page_urls,
+)
 
 SITE_ROOT = "http://www.auslan.org.au"
 LETTER_PAGE_TEMPLATE = SITE_ROOT + "/dictionary/search/?query={letter}&page={page}"
@@ -48,6 +91,9 @@ LETTER_PAGE_TEMPLATE = SITE_ROOT + "/dictionary/search/?query={letter}&page={pag
 # Words to ignore because the page isn't actually there.
 WORDS_PAGE_BASE = r"http://www.auslan.org.au/dictionary/words/"
 
+# Most category words with no entry to log suggestions for.
+MAX_UNMATCHED_CATEGORY_WORDS_LOGGED = 20
+
 
 # IMPORTANT:
 # Keep this in sync with lib/types.dart, the indexes must line up.
@@ -107,6 +153,8 @@ class Entry:
     sub_entries: List["SubEntry"]
     categories: List[str]
     entry_type: str = "WORD"  # They're all words for now.
+    # The word page this was scraped from. Not part of the output.
+    url: Optional[str] = None
 
     # We return the dict inside another dict keyed by entry_in_english. Later on we'll
     # collapse this into a list of dicts but for now this helps when we're starting
@@ -139,6 +187,43 @@ class SubEntry:
         }
 
 
+def parse_letter_page(text: str) -> Tuple[int, List[str]]:
+    """
+    Parse one page of a letter's search results, returning how many result
+    pages the letter has and the word page URLs on this page.
+    """
+    num_pages, rows = parse_letter_page_rows(text)
+    return num_pages, [url for url, _ in rows]
+
+
+def parse_letter_page_rows(text: str) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    parse_letter_page, but with each word page URL paired with a fingerprint
+    of its row in the results (its text and links), for change detection.
+    URLs are in canonical form (see word_urls.py), but a word page can still
+    be listed more than once.
+    """
+    soup = make_soup(text)
+
+    pages_list = soup.find_all("ul")[-1]
+    last_pages_button = pages_list.find_all("li")[-1]
+    try:
+        num_pages = int(last_pages_button.text)
+    except ValueError:
+        num_pages = 1
+
+    rows = []
+    for link in soup.find_all("a"):
+        if "dictionary/words/" not in link["href"]:
+            continue
+        row = link.find_parent("tr") or link.parent
+        content = [" ".join(row.stripped_strings)]
+        content += [a.get("href", "") for a in row.find_all("a")]
+        fingerprint = hashlib.sha256("\n".join(content).encode()).hexdigest()[:16]
+        rows.append((canonical_word_url(link["href"]), fingerprint))
+    return num_pages, rows
+
+
 async def get_word_page_urls(executor, letters=None) -> List[str]:
     """
     This scrapes the site pretty much like this:
@@ -148,6 +233,31 @@ async def get_word_page_urls(executor, letters=None) -> List[str]:
         for results_page in letter:
             for word_url in results_page:
                 words_urls.append(word_url)
+
+    with each word page only listed once, the first time it appears.
+    """
+    index = await get_word_page_index(executor, letters=letters)
+    return select_word_page_urls([url for url, _, _ in index])
+
+
+async def get_word_page_index(executor, letters=None) -> List[Tuple[str, str, str]]:
+    """
+    get_word_page_urls, but returning (word page URL, row fingerprint, letter)
+    for each word page. See parse_letter_page_rows.
+    """
+    index = []
+    for letter, _, rows in await get_letter_pages(executor, letters=letters):
+        index += [(url, fingerprint, letter) for url, fingerprint in rows]
+    return index
+
+
+async def get_letter_pages(
+    executor, letters=None
+) -> List[Tuple[str, int, List[Tuple[str, str]]]]:
+    """
+    (letter, page number, rows from parse_letter_page_rows) for every letter
+    results page, in the order word pages get scraped: the first page of each
+    letter, then the rest of each letter's pages.
     """
 
     letters = letters or string.ascii_lowercase
@@ -160,44 +270,41 @@ async def get_word_page_urls(executor, letters=None) -> List[str]:
 
     # Count how many pages there are for each letter.
     letters_to_num_pages = {}
+    first_letter_pages_rows = []
     for idx, html in enumerate(first_letter_pages_html):
         letter = letters[idx]
-
-        soup = BeautifulSoup(html.text, "html.parser")
-        pages_list = soup.find_all("ul")[-1]
-        last_pages_button = pages_list.find_all("li")[-1]
-        try:
-            num_pages = int(last_pages_button.text)
-        except ValueError:
+        num_pages, rows = parse_letter_page_rows(html.text)
+        if num_pages == 1:
             LOG.debug(f"Only one page for letter {letter}")
-            num_pages = 1
-
         letters_to_num_pages[letter] = num_pages
+        first_letter_pages_rows.append((letter, rows))
 
     # Get the URLs for all of the letter pages.
     other_letter_pages_urls = []
+    other_letter_pages_letters = []
+    other_letter_pages_numbers = []
     for letter in letters:
         num_pages = letters_to_num_pages[letter]
         for page in range(2, num_pages + 1):
             url = LETTER_PAGE_TEMPLATE.format(letter=letter, page=page)
             other_letter_pages_urls.append(url)
+            other_letter_pages_letters.append(letter)
+            other_letter_pages_numbers.append(page)
 
-    # Get the HTML for all of the letter pages.
-    letter_pages_html = first_letter_pages_html
+    # Get the HTML for all of the other letter pages.
     other_letter_pages_html = await get_pages_html(executor, other_letter_pages_urls)
-    letter_pages_html += other_letter_pages_html
 
     # Get the word URLs from all the letter pages' HTML.
-    word_page_urls = []
-    for html in letter_pages_html:
-        soup = BeautifulSoup(html.text, "html.parser")
-        url_suffixes = [
-            u["href"] for u in soup.find_all("a") if "dictionary/words/" in u["href"]
-        ]
-        full_urls = [SITE_ROOT + u for u in url_suffixes]
-        word_page_urls += full_urls
+    pages = [(letter, 1, rows) for letter, rows in first_letter_pages_rows]
+    for letter, page, html in zip(
+        other_letter_pages_letters,
+        other_letter_pages_numbers,
+        other_letter_pages_html,
+    ):
+        _, rows = parse_letter_page_rows(html.text)
+        pages.append((letter, page, rows))
 
-    return word_page_urls
+    return pages
 
 
 def parse_definition(definition_div_html) -> Dict[str, List[str]]:
@@ -217,58 +324,32 @@ def parse_definition(definition_div_html) -> Dict[str, List[str]]:
     return {heading: definitions}
 
 
-async def parse_information(executor, html) -> Entry:
-    soup = BeautifulSoup(html.text, "html.parser")
+def parse_word(soup) -> str:
+    return soup.find_all("em")[0].string
 
-    # Get the word
-    word = soup.find_all("em")[0].string
-
-    # Get the SubWord for this first page
-    first_subword = parse_subpage(html, word)
-    sub_entries = [first_subword]
-
-    # Get links to the subpages
-    subpages_tags = soup.find_all("a", {"class": "btn btn-default navbar-btn"})
-    subpages_urls = [WORDS_PAGE_BASE + t["href"] for t in subpages_tags]
-
-    # Fetch their HTML
-    # TODO: This part is synchronous and slow, surface this and gather it later.
-    if subpages_urls:
-        sub_entries_html = await get_pages_html(executor, subpages_urls)
-    else:
-        sub_entries_html = []
 
-    # Pull subwords information from them
-    additional_subwords = [parse_subpage(html, word) for html in sub_entries_html]
-    sub_entries += additional_subwords
-
-    return Entry(
-        entry_in_english=word,
-        sub_entries=sub_entries,
-        categories=[],  # We fill this in later.
-    )
-
-
-def parse_subpage(html, word_str) -> SubEntry:
-    soup = BeautifulSoup(html.text, "html.parser")
-
-    # Get the keywords
+def parse_keywords(soup, word_str) -> List[str]:
     keywords_div = soup.find("div", {"id": "keywords"})
     keywords_lines = [line.lstrip() for line in keywords_div.text.split("\n")]
     keywords = [keyword.rstrip(",") for keyword in keywords_lines if keyword]
     keywords.remove("Keywords:")
     keywords.remove(word_str)
+    return keywords
 
-    # Get the video links
-    video_links = [t["src"] for t in soup.find_all("source")]
 
-    # Get the definitions
+def parse_video_links(soup) -> List[str]:
+    return [t["src"] for t in soup.find_all("source")]
+
+
+def parse_definitions(soup) -> Dict[str, List[str]]:
     definition_divs_html = soup.find_all("div", {"class": "definition-panel"})
     definitions = {}
     for definition_div_html in definition_divs_html:
         definitions.update(parse_definition(definition_div_html))
+    return definitions
+
 
-    # Get the regions image.
+def parse_regions(soup, url) -> List[int]:
     regions_img_tags = soup.find_all("img", {"alt": "Region"})
 
     try:
@@ -286,23 +367,642 @@ def parse_subpage(html, word_str) -> SubEntry:
             regions = []
     except IndexError:
         # This implies that there is no regions img (which is pretty common), or an issue with the scraper.
-        LOG.debug(f"Failed to get regions information for {html.url}")
+        LOG.debug(f"Failed to get regions information for {url}")
         regions = []
 
+    return regions
+
+
+def parse_subpage_urls(soup) -> List[str]:
+    subpages_tags = soup.find_all("a", {"class": "btn btn-default navbar-btn"})
+    return [WORDS_PAGE_BASE + t["href"] for t in subpages_tags]
+
+
+def parse_sub_entry(soup, word_str, url) -> SubEntry:
+    """
+    Run every sub-entry extractor over one already-built tree. Building the
+    tree is by far the most expensive part of parsing a page, so each page is
+    only ever turned into a tree once.
+    """
     return SubEntry(
-        video_links=video_links,
-        keywords=keywords,
-        definitions=definitions,
-        regions=regions,
+        video_links=parse_video_links(soup),
+        keywords=parse_keywords(soup, word_str),
+        definitions=parse_definitions(soup),
+        regions=parse_regions(soup, url),
     )
 
 
+def parse_word_page(text: str, url: str) -> Tuple[str, SubEntry, List[str]]:
+    """
+    Parse a word page, returning the word, the SubEntry shown on the page itself
+    and the URLs of the word's other sub-entry pages. Fetching those is left to
+    the caller so they can share the work queue with every other page.
+    """
+    soup = make_soup(text)
+    word = parse_word(soup)
+    return word, parse_sub_entry(soup, word, url), parse_subpage_urls(soup)
+
+
+def parse_subpage(text: str, url: str, word_str: str) -> SubEntry:
+    """Parse one of a word's other sub-entry pages."""
+    soup = make_soup(text)
+    return parse_sub_entry(soup, word_str, url)
+
+
+# Priorities for the scrape work queue. Sub-pages jump ahead of word pages so
+# that entries are put back together (and their state dropped) as early as
+# possible rather than all at the end.
+SUB_PAGE_PRIORITY = 0
+WORD_PAGE_PRIORITY = 1
+
+
+@dataclass
+class PendingEntry:
+    """An entry whose word page has been parsed but whose sub-pages haven't
+    all arrived yet."""
+
+    url: str
+    word: str
+    sub_entries: List[Optional[SubEntry]]
+    remaining: int
+    failed: bool = False
+
+
+async def scrape_entries(
+    executor,
+    urls: List[str],
+    num_workers: int,
+    parse_executor=None,
+    parse_workers: int = 0,
+    unparseable: Optional[List[str]] = None,
+) -> List[Entry]:
+    """
+    Fetch and parse every word page in [urls] along with all of their sub-entry
+    pages.
+
+    Word pages and sub-pages all go onto one work queue drained by
+    [num_workers] workers, so the executor (a thread pool, or an AsyncFetcher)
+    stays busy instead of going idle while each word waits on its own
+    sub-pages. An Entry is assembled once its
+    last sub-page arrives. The result is in the same order as [urls] no matter
+    what order the fetches complete in, so the output stays deterministic.
+
+    Pages are parsed on the event loop, or in [parse_executor] (a
+    ProcessPoolExecutor with [parse_workers] processes) if given, so parsing
+    doesn't hold the GIL against the fetch threads. Either way fetching
+    carries on while pages are being parsed.
+
+    Failing to fetch a word page after retries aborts the scrape, like
+    get_pages_html. A word page (or one of its sub-pages) that doesn't parse is
+    logged and skipped. Word pages that don't parse are also added to
+    [unparseable], if given.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.PriorityQueue()
+    seq = itertools.count()
+    entries: List[Optional[Entry]] = [None] * len(urls)
+    pending: Dict[int, PendingEntry] = {}
+    done = 0
+
+    def finish(index: int, entry: Optional[Entry]):
+        nonlocal done
+        entries[index] = entry
+        done += 1
+        if done % 100 == 0 or done == len(urls):
+            LOG.info(f"Progress: {done}/{len(urls)} word pages")
+
+    async def parse(fn, *args):
+        if parse_executor is None:
+            return fn(*args)
+        return await loop.run_in_executor(parse_executor, fn, *args)
+
+    async def handle_word_page(index: int, url: str, text: str):
+        try:
+            word, first_sub_entry, subpages_urls = await parse(
+                parse_word_page, text, url
+            )
+        except Exception as e:
+            # Some of the URLs we get are not valid (e.g. end with .html/) and lead to
+            # a 404 page (which annoyingly actually returns a 200). Just ignoring this
+            # case is simplest for now. Unfortunately it seems like their index pages
+            # are not generated atomically based on the actual data. Ideally one day
+            # they just give us a dump.
+            LOG.warning(f"Failed to parse information for {url}: {e}")
+            forget_recent_page(url)
+            if unparseable is not None:
+                unparseable.append(url)
+            finish(index, None)
+            return
+        if not subpages_urls:
+            finish(index, Entry(word, [first_sub_entry], categories=[], url=url))
+            return
+        pending[index] = PendingEntry(
+            url=url,
+            word=word,
+            sub_entries=[first_sub_entry] + [None] * len(subpages_urls),
+            remaining=len(subpages_urls),
+        )
+        for sub_index, subpage_url in enumerate(subpages_urls, start=1):
+            queue.put_nowait(
+                (SUB_PAGE_PRIORITY, next(seq), index, sub_index, subpage_url)
+            )
+
+    async def handle_sub_page(index: int, sub_index: int, url: str, text):
+        entry = pending[index]
+        if text is not None and not entry.failed:
+            try:
+                entry.sub_entries[sub_index] = await parse(
+                    parse_subpage, text, url, entry.word
+                )
+            except Exception as e:
+                LOG.warning(f"Failed to parse information for {entry.url}: {e}")
+                forget_recent_page(url)
+                entry.failed = True
+        entry.remaining -= 1
+        if entry.remaining == 0:
+            del pending[index]
+            if entry.failed:
+                finish(index, None)
+            else:
+                finish(
+                    index,
+                    Entry(entry.word, entry.sub_entries, categories=[], url=entry.url),
+                )
+
+    async def fetch_sub_page(index: int, url: str) -> Optional[str]:
+        entry = pending[index]
+        # Once one sub-page has failed the entry is dropped anyway, so don't
+        # spend requests on its siblings.
+        if entry.failed:
+            return None
+        try:
+            html = await fetch_page(executor, url)
+        except Exception as e:
+            LOG.warning(f"Failed to parse information for {entry.url}: {e}")
+            entry.failed = True
+            return None
+        return html.text
+
+    # Parsing runs as its own task so a worker can go straight back to fetching
+    # while the page is parsed (in another process with --parse-workers). The
+    # semaphore bounds how many fetched-but-unparsed pages we hold at once.
+    parse_slots = asyncio.Semaphore(2 * (parse_workers or 1))
+    parse_tasks = set()
+
+    async def parse_then_release(item, text):
+        _, _, index, sub_index, url = item
+        try:
+            if sub_index is None:
+                await handle_word_page(index, url, text)
+            else:
+                await handle_sub_page(index, sub_index, url, text)
+        finally:
+            parse_slots.release()
+            queue.task_done()
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            _, _, index, sub_index, url = item
+            try:
+                if sub_index is None:
+                    try:
+                        html = await fetch_page(executor, url)
+                    except Exception as e:
+                        raise RuntimeError(
+                            f"Failed to fetch {url} after retries: {e}"
+                        ) from e
+                    text = html.text
+                else:
+                    text = await fetch_sub_page(index, url)
+                await parse_slots.acquire()
+            except BaseException:
+                queue.task_done()
+                raise
+            task = asyncio.create_task(parse_then_release(item, text))
+            parse_tasks.add(task)
+            task.add_done_callback(parse_tasks.discard)
+
+    for index, url in enumerate(urls):
+        queue.put_nowait((WORD_PAGE_PRIORITY, next(seq), index, None, url))
+
+    workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+    join = asyncio.create_task(queue.join())
+    try:
+        finished, _ = await asyncio.wait(
+            [join, *workers], return_when=asyncio.FIRST_COMPLETED
+        )
+        # Workers only ever finish by raising, e.g. a word page that couldn't
+        # be fetched after retries. Surface that rather than carrying on.
+        for task in finished:
+            task.result()
+    finally:
+        tasks = [join, *workers, *parse_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [entry for entry in entries if entry is not None]
+
+
+def init_parse_worker(parser_backend: str, log_level: int):
+    """Set up a --parse-workers process to parse like the main process does."""
+    set_parser_backend(parser_backend)
+    LOG.setLevel(log_level)
+
+
 def get_existing_data(filename):
     with open(filename, "r") as f:
         existing_data = json.loads(f.read())
     return existing_data
 
 
+def load_word_to_categories(categories_file) -> Dict[str, List[str]]:
+    """Invert a categories file from scrape_categories.py into word ->
+    categories."""
+    category_data = get_existing_data(categories_file)
+    word_to_categories = {}
+    for category, words in category_data.items():
+        for word in words:
+            if word not in word_to_categories:
+                word_to_categories[word] = []
+            word_to_categories[word].append(category)
+    return word_to_categories
+
+
+def load_categories_from_args(args) -> Dict[str, List[str]]:
+    """Word -> categories from --category-index if given, else from
+    --categories-file. See add_categories_args."""
+    if args.category_index:
+        return index_word_to_categories(load_category_index(args.category_index))
+    return load_word_to_categories(args.categories_file)
+
+
+def add_categories_args(parser, default_categories_file: Optional[Path] = None):
+    """--categories-file (required unless there's a default) or
+    --category-index, both from scrape_categories.py."""
+    categories_args = parser.add_mutually_exclusive_group(
+        required=default_categories_file is None
+    )
+    categories_args.add_argument(
+        "--categories-file",
+        type=Path,
+        default=default_categories_file,
+        help="Output of scrape_categories.py"
+        + (
+            f" (default: {default_categories_file})."
+            if default_categories_file
+            else "."
+        ),
+    )
+    categories_args.add_argument(
+        "--category-index",
+        type=Path,
+        help="The word -> categories index scrape_categories.py --index-file "
+        "writes, instead of --categories-file. See category_index.py.",
+    )
+
+
+def attach_categories(word_to_info: dict, word_to_categories: Dict[str, List[str]]):
+    """
+    Set each entry's categories, only touching the ones that changed.
+
+    Every entry is compared, even on a run that scraped a handful of them:
+    that's about 1ms for 8000 entries. Skipping the carried-over entries when
+    the category index's version hasn't changed would need that version
+    recorded alongside the data, and kept in step with it through resumed and
+    failed runs, to save next to nothing.
+    """
+    patched = 0
+    for word, info in word_to_info.items():
+        categories = word_to_categories.get(word, [])
+        if info.get("categories") != categories:
+            info["categories"] = categories
+            patched += 1
+    LOG.debug(f"Patched categories on {patched} of {len(word_to_info)} entries")
+    log_unmatched_category_words(word_to_info, word_to_categories)
+
+
+def log_unmatched_category_words(
+    word_to_info: dict, word_to_categories: Dict[str, List[str]]
+):
+    """
+    Log the category words that aren't the name of any entry, with the
+    entries spelled most like them (see fuzzy_index.py). Those words are
+    dropped from their categories, and usually they're a word Signbank
+    spells differently on its category pages, so this says which entry was
+    probably meant. Nothing is attached by guesswork.
+
+    This runs on every scrape and merge, so the fuzzy index is only built
+    when there's something to look up, and only over the entries' names.
+    """
+    unmatched = sorted(word_to_categories.keys() - word_to_info.keys())
+    if not unmatched or not word_to_info:
+        return
+    LOG.info(f"{len(unmatched)} category words aren't the name of any entry")
+    index = FuzzyIndex(build_name_index(sorted(word_to_info)))
+    for word in unmatched[:MAX_UNMATCHED_CATEGORY_WORDS_LOGGED]:
+        names = []
+        for term, _ in index.did_you_mean(word, limit=3):
+            names.extend(n for n in index.entries_for(term) if n not in names)
+        categories = ", ".join(word_to_categories[word])
+        if names:
+            suggestions = ", ".join(repr(name) for name in names[:3])
+            LOG.info(
+                f"Category word {word!r} ({categories}): did you mean {suggestions}?"
+            )
+        else:
+            LOG.info(f"Category word {word!r} ({categories}): no entry is close")
+
+
+def check_media_bases(word_to_info: dict):
+    """
+    Fail loudly if any video is served from an unexpected base. The app
+    ships AUSLAN_MEDIA_BASE_URL and stores only the path after it (see
+    make_data_v2.py + lib/main.dart), so a video from a new host would
+    silently break playback. data.json itself keeps the full URLs (old app
+    builds read it); this is purely a guardrail.
+    """
+    for word, info in word_to_info.items():
+        for sub_entry in info["sub_entries"]:
+            for url in sub_entry["video_links"]:
+                strip_media_base(url)  # Raises on an unexpected base.
+
+
+def entries_to_dict(entries: List[Entry]) -> dict:
+    """{word: info} for [entries], later ones winning."""
+    word_to_info = {}
+    for entry in entries:
+        word_to_info.update(entry.get_dict())
+    return word_to_info
+
+
+def dump_output(word_to_info: dict) -> str:
+    """The output JSON: the data flattened into a list inside "data"."""
+    out = {"data": list(word_to_info.values())}
+    return json.dumps(out, indent=2)
+
+
+def add_scrape_args(parser):
+    """Arguments for how pages are fetched and parsed, shared with
+    scrape_all_letters.py. See Scraper."""
+    add_http_cache_args(parser)
+    add_rate_limit_args(parser)
+    add_concurrency_args(parser)
+    add_http_engine_args(parser)
+    add_page_coalescing_args(parser)
+    add_retry_guard_args(parser)
+    archive_args = parser.add_mutually_exclusive_group()
+    archive_args.add_argument(
+        "--archive-dir",
+        type=Path,
+        help="Record every fetched page into a new archive in this directory "
+        "(one per run), for re-parsing later with --from-archive.",
+    )
+    archive_args.add_argument(
+        "--from-archive",
+        type=Path,
+        help="Re-parse the pages recorded in this archive instead of fetching "
+        "anything. Fails if a page the scrape needs isn't in it.",
+    )
+    parser.add_argument(
+        "--known-bad-file",
+        type=Path,
+        help="Remember word pages that don't parse (e.g. Signbank's 'page not "
+        "found' pages, served with a 200) in this file, and skip them on later "
+        "runs once they've failed on two separate runs. Also applies to --urls. "
+        "Created if missing. See word_urls.py.",
+    )
+    parser.add_argument(
+        "--known-bad-recheck-days",
+        type=int,
+        default=DEFAULT_KNOWN_BAD_RECHECK_DAYS,
+        help="Try known bad word pages again after this many days (default: "
+        f"{DEFAULT_KNOWN_BAD_RECHECK_DAYS}).",
+    )
+    parser.add_argument("--num-workers", type=int, default=8)
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Parse pages in this many worker processes instead of on the "
+        "main thread (default: 0, parse in-process). Worth it when the scrape "
+        "is CPU-bound on parsing.",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=PARSER_BACKENDS,
+        default=DEFAULT_PARSER_BACKEND,
+        help="HTML tree builder to parse pages with (default: "
+        f"{DEFAULT_PARSER_BACKEND}). See check_parser_parity.py.",
+    )
+
+
+def add_change_detection_args(parser):
+    parser.add_argument(
+        "--change-state",
+        type=Path,
+        help="Only fetch word pages that are new or whose row in the letter "
+        "pages changed since the run that wrote this state file, carrying the "
+        "rest over from the existing data. Created if missing. See "
+        "change_state.py.",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="With --change-state, fetch every word page anyway (and record "
+        "that we did).",
+    )
+    parser.add_argument(
+        "--full-refresh-days",
+        type=int,
+        default=DEFAULT_FULL_REFRESH_DAYS,
+        help="With --change-state, do a full refresh of any letter that "
+        f"hasn't had one in this many days (default: {DEFAULT_FULL_REFRESH_DAYS}).",
+    )
+
+
+async def scrape_shard(
+    scraper: "Scraper", letters: List[str], shard: Tuple[int, int], shard_by: str
+) -> List[Tuple[list, str, dict]]:
+    """
+    Scrape shard K of N of [letters]' word pages (see merge_shards.py),
+    returning (position, word page URL, entry info) for each entry.
+    """
+    if shard_by == "letter":
+        pages = await scraper.get_letter_pages(letters=shard_letters(letters, shard))
+    else:
+        pages = await scraper.get_letter_pages(letters=letters)
+
+    # Where each word page comes in a single-process scrape of [letters]. The
+    # pages are in that order, so the first time we see a URL is its place.
+    positions = {}
+    for letter, page, rows in pages:
+        for row, (url, _) in enumerate(rows):
+            if shard_by == "url" and not url_in_shard(url, shard):
+                continue
+            positions.setdefault(url, [int(page > 1), letters.index(letter), page, row])
+
+    urls = scraper.select_word_page_urls(list(positions))
+    entries = await scraper.scrape_entries(urls)
+    check_media_bases(entries_to_dict(entries))
+    return [
+        (positions[entry.url], entry.url, entry.get_dict()[entry.entry_in_english])
+        for entry in entries
+    ]
+
+
+async def scrape_letters(
+    scraper: "Scraper",
+    letters: List[str],
+    word_to_info: dict,
+    change_state: Optional[ChangeState],
+    args,
+) -> List[Entry]:
+    """
+    Scrape every word page of [letters], or with a [change_state], only the
+    ones that might have changed from what's in [word_to_info]. Either way
+    each is fetched once, and known bad ones not at all. The entries
+    are checked with check_media_bases before the change state records them,
+    so ones that fail it are fetched again next time.
+    """
+    index = await scraper.get_word_page_index(letters=letters)
+    if change_state is None:
+        urls = [url for url, _, _ in index]
+    else:
+        full_refresh = args.full_refresh or change_state.full_refresh_due(
+            letters, args.full_refresh_days
+        )
+        urls = change_state.plan(index, word_to_info, full_refresh)
+    urls = scraper.select_word_page_urls(urls)
+    entries = await scraper.scrape_entries(urls)
+    check_media_bases(entries_to_dict(entries))
+    if change_state is not None:
+        change_state.record(letters, index, urls, entries, full_refresh)
+    return entries
+
+
+class Scraper:
+    """
+    Fetches and parses Signbank pages as configured by the add_scrape_args
+    arguments: sets up the parser backend, HTTP cache, rate limits,
+    concurrency, fetch engine, parse processes and page archive on entry, and
+    tears them down (logging their stats) on exit. One Scraper can run any
+    number of scrapes, so a multi-letter driver pays for the setup once.
+
+        async with Scraper(args) as scraper:
+            urls = await scraper.get_word_page_urls(["a"])
+            entries = await scraper.scrape_entries(urls)
+    """
+
+    def __init__(self, args):
+        self.args = args
+
+    async def __aenter__(self):
+        args = self.args
+        set_parser_backend(args.parser)
+        self.http_cache = configure_http_cache(
+            args.http_cache_dir, args.http_cache_max_mb
+        )
+        configure_rate_limits(args.rate, args.rate_burst, args.rate_limit)
+        self.page_coalescer = configure_page_coalescing(
+            args.recent_pages_ttl, args.recent_pages_max_mb
+        )
+        self.retry_guard = configure_retry_guard(
+            args.retry_budget,
+            args.retry_budget_min,
+            args.breaker_failures,
+            args.breaker_cooldown,
+        )
+        self.concurrency = configure_concurrency(
+            args.adaptive_concurrency, args.num_workers, args.max_concurrency
+        )
+
+        # With asyncio the fetcher stands in for the thread pool, and the queue
+        # gets one worker per request it lets in flight. With adaptive
+        # concurrency the pool is sized for the most the controller may allow,
+        # and the controller decides how many of its threads are fetching at
+        # any moment.
+        if args.http_engine == "asyncio":
+            self.executor = AsyncFetcher(max_in_flight=args.max_in_flight)
+            self.num_workers = args.max_in_flight
+        else:
+            self.num_workers = (
+                args.max_concurrency if self.concurrency else args.num_workers
+            )
+            self.executor = ThreadPoolExecutor(max_workers=self.num_workers)
+        self.parse_executor = None
+        if args.parse_workers:
+            self.parse_executor = ProcessPoolExecutor(
+                max_workers=args.parse_workers,
+                initializer=init_parse_worker,
+                initargs=(args.parser, LOG.level),
+            )
+
+        if args.from_archive:
+            self.page_archive = PageArchiveReader(args.from_archive)
+        elif args.archive_dir:
+            self.page_archive = PageArchiveWriter(new_archive_path(args.archive_dir))
+        else:
+            self.page_archive = None
+        configure_page_archive(self.page_archive)
+
+        self.known_bad = KnownBadUrls(args.known_bad_file, args.known_bad_recheck_days)
+
+        self._exit_stack = contextlib.AsyncExitStack()
+        if isinstance(self.executor, AsyncFetcher):
+            try:
+                await self._exit_stack.enter_async_context(self.executor)
+            except BaseException:
+                await self._close()
+                raise
+        return self
+
+    async def _close(self):
+        await self._exit_stack.aclose()
+        if self.parse_executor is not None:
+            self.parse_executor.shutdown(cancel_futures=True)
+        if self.page_archive is not None:
+            self.page_archive.close()
+            LOG.info(self.page_archive.describe())
+
+    async def __aexit__(self, *exc):
+        await self._close()
+        self.known_bad.save()
+        if self.http_cache is not None:
+            self.http_cache.log_stats()
+        if self.concurrency is not None:
+            self.concurrency.log_stats()
+        self.page_coalescer.log_stats()
+        self.retry_guard.log_stats()
+        log_host_pauses()
+
+    async def get_word_page_urls(self, letters=None) -> List[str]:
+        return await get_word_page_urls(self.executor, letters=letters)
+
+    async def get_word_page_index(self, letters=None) -> List[Tuple[str, str, str]]:
+        return await get_word_page_index(self.executor, letters=letters)
+
+    async def get_letter_pages(self, letters=None):
+        return await get_letter_pages(self.executor, letters=letters)
+
+    def select_word_page_urls(self, urls: List[str]) -> List[str]:
+        return select_word_page_urls(urls, self.known_bad)
+
+    async def scrape_entries(self, urls: List[str]) -> List[Entry]:
+        unparseable = []
+        entries = await scrape_entries(
+            self.executor,
+            urls,
+            self.num_workers,
+            parse_executor=self.parse_executor,
+            parse_workers=self.args.parse_workers,
+            unparseable=unparseable,
+        )
+        self.known_bad.record(urls, unparseable)
+        return entries
+
+
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("-d", "--debug", action="store_true")
@@ -312,13 +1012,27 @@ def parse_args():
         "--urls-file", help="File containing specific URLs to look at"
     )
     parser.add_argument("--letters", nargs="*", help="Fetch only these letters")
-    # This should come from running scrape_categories.py
-    parser.add_argument("--categories-file", required=True)
+    add_categories_args(parser)
     output_args = parser.add_mutually_exclusive_group(required=True)
     output_args.add_argument("--output-file")
     output_args.add_argument("--stdout", action="store_true")
     parser.add_argument("--existing-file", help="Start with this file as the base")
-    parser.add_argument("--num-workers", type=int, default=8)
+    parser.add_argument(
+        "--shard",
+        type=parse_shard_spec,
+        metavar="K/N",
+        help="Only scrape shard K of N of the word pages, writing a partial "
+        "output to --output-file for merge_shards.py to combine.",
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=SHARD_BY,
+        default="url",
+        help="Split word pages between shards by a hash of their URL, or by "
+        "letter (default: url). See merge_shards.py.",
+    )
+    add_scrape_args(parser)
+    add_change_detection_args(parser)
     return parser.parse_args()
 
 
@@ -331,13 +1045,7 @@ async def main():
         LOG.setLevel("INFO")
 
     # Load up category data.
-    category_data = get_existing_data(args.categories_file)
-    word_to_categories = {}
-    for category, words in category_data.items():
-        for word in words:
-            if word not in word_to_categories:
-                word_to_categories[word] = []
-            word_to_categories[word].append(category)
+    word_to_categories = load_categories_from_args(args)
 
     # Load up data from the existing file if given. We turn the data inside "data" into
     # a dict where the key is entry_in_english. The upside of this approach is we fail
@@ -352,55 +1060,61 @@ async def main():
     if args.existing_file == args.output_file and args.existing_file is not None:
         raise RuntimeError("--existing-file and --output-file cannot be the same file")
 
-    executor = ThreadPoolExecutor(max_workers=args.num_workers)
-
-    # Get the URLs for all the word pages.
-    if args.urls:
-        urls = args.urls
-    elif args.urls_file:
-        with open(args.urls_file, "r") as f:
-            urls = f.read().splitlines()
-    else:
-        urls = await get_word_page_urls(executor, letters=args.letters)
-
-    # Get the HTML for each of the word pages.
-    word_pages_html = await get_pages_html(executor, urls)
-
-    # Parse the information in each of the pages.
-    for html in word_pages_html:
-        try:
-            word = await parse_information(executor, html)
-        except Exception as e:
-            # Some of the URLs we get are not valid (e.g. end with .html/) and lead to
-            # a 404 page (which annoyingly actually returns a 200). Just ignoring this
-            # case is simplest for now. Unfortunately it seems like their index pages
-            # are not generated atomically based on the actual data. Ideally one day
-            # they just give us a dump.
-            LOG.warning(f"Failed to parse information for {html.url}: {e}")
-            continue
-        word_dict = word.get_dict()
-        word_to_info.update(word_dict)
+    if args.shard:
+        if not args.output_file:
+            raise RuntimeError("--shard needs --output-file for its partial output")
+        if args.urls or args.urls_file or args.change_state:
+            raise RuntimeError(
+                "--shard only applies when scraping letters, without --change-state"
+            )
+
+    change_state = None
+    if args.change_state:
+        if not args.existing_file:
+            raise RuntimeError("--change-state needs --existing-file to carry over")
+        if args.urls or args.urls_file:
+            raise RuntimeError("--change-state only applies when scraping letters")
+        change_state = ChangeState(args.change_state)
+
+    async with Scraper(args) as scraper:
+        if args.shard:
+            letters = args.letters or list(string.ascii_lowercase)
+            entries = await scrape_shard(scraper, letters, args.shard, args.shard_by)
+            write_partial(args.output_file, args.shard, args.shard_by, letters, entries)
+            LOG.info(
+                f"Partial output for shard {'/'.join(map(str, args.shard))} written to "
+                f"{args.output_file}"
+            )
+            return
+
+        # Get the URLs for all the word pages.
+        if args.urls or args.urls_file:
+            if args.urls:
+                urls = args.urls
+            else:
+                with open(args.urls_file, "r") as f:
+                    urls = f.read().splitlines()
+            # Fetch and parse each of the word pages, along with their sub-pages.
+            urls = scraper.select_word_page_urls(urls)
+            entries = await scraper.scrape_entries(urls)
+        else:
+            letters = args.letters or list(string.ascii_lowercase)
+            entries = await scrape_letters(
+                scraper, letters, word_to_info, change_state, args
+            )
+
+    for entry in entries:
+        word_to_info.update(entry.get_dict())
 
     # Attach category data.
-    for word, info in word_to_info.items():
-        categories = word_to_categories.get(word, [])
-        info["categories"] = categories
-
-    # Fail loudly if any video is served from an unexpected base. The app
-    # ships AUSLAN_MEDIA_BASE_URL and stores only the path after it (see
-    # make_data_v2.py + lib/main.dart), so a video from a new host would
-    # silently break playback. data.json itself keeps the full URLs (old app
-    # builds read it); this is purely a guardrail.
-    for word, info in word_to_info.items():
-        for sub_entry in info["sub_entries"]:
-            for url in sub_entry["video_links"]:
-                strip_media_base(url)  # Raises on an unexpected base.
+    attach_categories(word_to_info, word_to_categories)
 
-    # Flatten the data, structure inside "data".
-    out = {"data": list(word_to_info.values())}
+    check_media_bases(word_to_info)
 
     # Build and output the JSON.
-    json_output = json.dumps(out, indent=2)
+    json_output = dump_output(word_to_info)
+    if change_state is not None:
+        change_state.save()
     if args.stdout:
         print(json_output)
     else:
@@ -0,0 +1,165 @@
+"""
+A precomputed search index over the entries in data-v2.json, so the lookup
+structures are built once per data release instead of on every device after
+it loads the data.
+
+Entries are found by their entry_in_english and their keywords, both
+normalised (normalise: case-folded, apostrophes dropped, other punctuation
+and symbols turned into spaces, whitespace collapsed). Entries are numbered
+in rank order: by the rank of their normalised entry_in_english in
+most_common_words.txt, then the rest alphabetically. Every list of entry ids is in ascending order, so in
+rank order, and results never need sorting.
+
+{
+    "version": "<hash of the rest>",
+    "entries": ["be", "and", ...],
+    "terms": ["a", "a lot", "aardvark", ...],
+    "term_entries": [[1], [17, 402], ...],
+    "tokens": {"aardvark": [3051], "lot": [17, 940], ...}
+}
+
+- terms: every normalised entry_in_english and keyword, sorted, so all the
+  terms with a given prefix are one contiguous run (the prefix index).
+- term_entries: for each term, the entries it's the name or a keyword of.
+- tokens: for each word in any term, the entries with a term containing it
+  (the inverted keyword index).
+
+SearchIndex is the query API.
+"""
+
+import bisect
+import hashlib
+import json
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_APOSTROPHES = re.compile("['\u2019]")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalise(text: str) -> str:
+    """Case-folded, with apostrophes dropped (so don't is dont) and other
+    punctuation and symbols as single spaces."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _APOSTROPHES.sub("", text)
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+def _version(index: dict) -> str:
+    content = json.dumps(
+        {key: value for key, value in index.items() if key != "version"},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def build_search_index(data: dict, common_word_ranks: Dict[str, int]) -> dict:
+    """The index for [data], data-v2.json as json.load gives it, ranked by
+    [common_word_ranks] (see priority.load_common_word_ranks)."""
+    names = [entry["entry_in_english"] for entry in data["data"]]
+    unranked = len(common_word_ranks) + 1
+
+    def rank(i: int):
+        name = normalise(names[i])
+        return (common_word_ranks.get(name, unranked), name, names[i])
+
+    order = sorted(range(len(names)), key=rank)
+
+    term_entries: Dict[str, set] = {}
+    for entry_id, i in enumerate(order):
+        entry = data["data"][i]
+        terms = {normalise(entry["entry_in_english"])}
+        for sub_entry in entry["sub_entries"]:
+            terms.update(normalise(keyword) for keyword in sub_entry["keywords"])
+        terms.discard("")
+        for term in terms:
+            term_entries.setdefault(term, set()).add(entry_id)
+
+    terms = sorted(term_entries)
+    tokens: Dict[str, set] = {}
+    for term in terms:
+        for token in term.split():
+            tokens.setdefault(token, set()).update(term_entries[term])
+
+    index = {
+        "entries": [names[i] for i in order],
+        "terms": terms,
+        "term_entries": [sorted(term_entries[term]) for term in terms],
+        "tokens": {token: sorted(tokens[token]) for token in sorted(tokens)},
+    }
+    return {"version": _version(index), **index}
+
+
+def write_search_index(path: Path, index: dict):
+    with open(path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+
+class SearchIndex:
+    """Queries over a search index, built by build_search_index or loaded
+    with SearchIndex.load. Results are entry_in_english values, best first."""
+
+    def __init__(self, index: dict):
+        self.version = index["version"]
+        self.entries: List[str] = index["entries"]
+        self.terms: List[str] = index["terms"]
+        self.term_entries: List[List[int]] = index["term_entries"]
+        self.tokens: Dict[str, List[int]] = index["tokens"]
+
+    @classmethod
+    def load(cls, path: Path) -> "SearchIndex":
+        """Load an index, raising if its content doesn't match its version."""
+        with open(path) as f:
+            index = json.load(f)
+        if _version(index) != index["version"]:
+            raise ValueError(f"{path} doesn't match its version, it's been modified")
+        return cls(index)
+
+    def _names(self, entry_ids, limit: Optional[int]) -> List[str]:
+        return [self.entries[i] for i in sorted(entry_ids)[:limit]]
+
+    def prefix(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Entries with a name or keyword starting with [query], those that
+        match it exactly first."""
+        query = normalise(query)
+        if not query:
+            return []
+        start = bisect.bisect_left(self.terms, query)
+        # Every term starting with query sorts before query + the highest
+        # code point.
+        end = bisect.bisect_left(self.terms, query + "\U0010ffff", lo=start)
+        exact = set()
+        if start < end and self.terms[start] == query:
+            exact.update(self.term_entries[start])
+        rest = set()
+        for i in range(start, end):
+            rest.update(self.term_entries[i])
+        rest -= exact
+        return (self._names(exact, limit) + self._names(rest, limit))[:limit]
+
+    def keyword(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Entries with every word of [query] somewhere in their name or
+        keywords."""
+        words = normalise(query).split()
+        if not words:
+            return []
+        matches = None
+        for word in words:
+            entry_ids = set(self.tokens.get(word, ()))
+            matches = entry_ids if matches is None else matches & entry_ids
+        return self._names(matches, limit)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Prefix matches, then keyword matches that aren't among them."""
+        results = self.prefix(query, limit)
+        seen = set(results)
+        for name in self.keyword(query):
+            if limit is not None and len(results) >= limit:
+                break
+            if name not in seen:
+                results.append(name)
+                seen.add(name)
+        return results
@@ -50,7 +50,20 @@ import requests
 from botocore.config import Config
 from retry import retry
 
-from common import LOG, DEFAULT_TIMEOUT, MEDIA_BASE_URL, _rate_limit
+from common import (
+    LOG,
+    DEFAULT_TIMEOUT,
+    MEDIA_BASE_URL,
+    _rate_limit,
+    add_concurrency_args,
+    add_hedging_args,
+    add_rate_limit_args,
+    concurrency_slot,
+    configure_concurrency,
+    configure_hedging,
+    configure_rate_limits,
+    hedged_get,
+)
 
 # data-v2.json (paths, read by current app builds) is the source of truth for
 # what media the app references. scripts/ -> repo root -> assets/data.
@@ -151,8 +164,12 @@ def list_existing_keys(s3, bucket: str) -> set:
 def _download_to(url: str, tmp_path: Path, timeout: int) -> int:
     """Stream a source video to tmp_path, returning the byte count. A 404 raises
     VideoNotFound (not retried); other non-200s retry with backoff."""
-    _rate_limit()
-    with requests.get(url, stream=True, timeout=timeout) as response:
+    _rate_limit(url)
+    with (
+        concurrency_slot(url) as slot,
+        hedged_get(url, timeout) as response,
+    ):
+        slot.response = response
         if response.status_code == 404:
             raise VideoNotFound(url)
         if response.status_code != 200:
@@ -252,12 +269,21 @@ def main():
         default=DEFAULT_TIMEOUT,
         help=f"Per-request timeout in seconds (default: {DEFAULT_TIMEOUT}).",
     )
+    add_rate_limit_args(parser)
+    add_concurrency_args(parser)
+    add_hedging_args(parser)
     parser.add_argument(
         "-d", "--debug", action="store_true", help="Enable debug logging."
     )
     args = parser.parse_args()
 
     LOG.setLevel(logging.DEBUG if args.debug else logging.INFO)
+    configure_rate_limits(args.rate, args.rate_burst, args.rate_limit)
+    concurrency = configure_concurrency(
+        args.adaptive_concurrency, args.num_workers, args.max_concurrency
+    )
+    num_threads = args.max_concurrency if concurrency else args.num_workers
+    hedger = configure_hedging(args.hedge, args.hedge_budget, num_threads)
 
     if not args.data_file.exists():
         parser.error(f"Data file not found: {args.data_file}")
@@ -295,14 +321,25 @@ def main():
     def run(path):
         return process_path(path, s3, args.bucket, args.dry_run, args.timeout)
 
-    with ThreadPoolExecutor(max_workers=args.num_workers) as executor:
-        futures = {executor.submit(run, p): p for p in todo}
-        for future in as_completed(futures):
-            records.append(future.result())
-            with lock:
-                done += 1
-                if done % 100 == 0 or done == total:
-                    LOG.info(f"Progress: {done}/{total}")
+    # With adaptive concurrency the controller decides how many of these
+    # threads are downloading at any moment.
+    try:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            futures = {executor.submit(run, p): p for p in todo}
+            for future in as_completed(futures):
+                records.append(future.result())
+                with lock:
+                    done += 1
+                    if done % 100 == 0 or done == total:
+                        LOG.info(f"Progress: {done}/{total}")
+    finally:
+        if hedger is not None:
+            hedger.close()
+
+    if concurrency is not None:
+        concurrency.log_stats()
+    if hedger is not None:
+        hedger.log_stats()
 
     summary = {
         "considered": len(paths),
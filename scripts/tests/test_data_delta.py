@@ -0,0 +1,129 @@
+import argparse
+import json
+
+import pytest
+
+from data_delta import (
+    DELTAS_INDEX_NAME,
+    MAX_DELTAS,
+    apply_delta,
+    load_deltas_index,
+    make_delta,
+    plan_update,
+    update_data,
+)
+from make_data_delta import publish, verify
+
+
+def entry(word, video="1.mp4", categories=()):
+    return {
+        "entry_in_english": word,
+        "sub_entries": [
+            {
+                "video_links": [video],
+                "keywords": [],
+                "definitions": {},
+                "regions": [0],
+            }
+        ],
+        "categories": list(categories),
+        "entry_type": "WORD",
+    }
+
+
+def version_data(n: int) -> dict:
+    """Version [n] of some data: each version changes one entry and adds
+    another."""
+    entries = [entry(f"word{i}") for i in range(50)]
+    entries[n % 50] = entry(f"word{n % 50}", video=f"v{n}.mp4")
+    entries += [entry(f"new{i}") for i in range(n)]
+    return {"data": entries}
+
+
+def test_round_trip():
+    old = version_data(0)
+    new = {"data": [entry("aardvark")] + old["data"][1:30] + old["data"][31:]}
+    new["data"][10] = entry("word10", categories=["Animals"])
+    patch = make_delta(old, new, "1", "2")
+    assert apply_delta(old, patch) == new
+    assert json.dumps(apply_delta(old, patch), indent=2) == json.dumps(new, indent=2)
+    # Unchanged runs are copied rather than repeated.
+    assert any(op[0] == "copy" for op in patch["ops"])
+    assert sum(len(op[1]) for op in patch["ops"] if op[0] == "insert") == 2
+
+
+def test_round_trip_from_and_to_nothing():
+    old = version_data(3)
+    assert apply_delta({"data": []}, make_delta({"data": []}, old, "1", "2")) == old
+    assert apply_delta(old, make_delta(old, {"data": []}, "1", "2")) == {"data": []}
+
+
+def test_apply_rejects_the_wrong_data():
+    old = version_data(0)
+    patch = make_delta(old, version_data(1), "1", "2")
+    with pytest.raises(ValueError):
+        apply_delta({"data": old["data"][:10]}, patch)
+    with pytest.raises(ValueError):
+        apply_delta(old, {**patch, "format": 99})
+
+
+def publish_versions(deltas_dir, count: int):
+    """Publish versions 0..[count] one after another, as move_data.sh does
+    each week."""
+    for n in range(1, count + 1):
+        args = argparse.Namespace(
+            deltas_dir=deltas_dir, old_version=str(n - 1), new_version=str(n)
+        )
+        old_text = json.dumps(version_data(n - 1), indent=2)
+        new_text = json.dumps(version_data(n), indent=2)
+        publish(args, old_text, new_text)
+        assert verify(args, old_text, new_text)
+
+
+def test_chain_is_trimmed_to_max_deltas(tmp_path):
+    deltas_dir = tmp_path / "deltas"
+    publish_versions(deltas_dir, MAX_DELTAS + 3)
+    index = load_deltas_index(deltas_dir)
+    latest = MAX_DELTAS + 3
+    assert index["latest_version"] == str(latest)
+    assert [d["to"] for d in index["deltas"]] == [
+        str(n) for n in range(latest - MAX_DELTAS + 1, latest + 1)
+    ]
+    # Trimmed patches are deleted too.
+    files = {path.name for path in deltas_dir.iterdir()} - {DELTAS_INDEX_NAME}
+    assert files == {d["file"] for d in index["deltas"]}
+
+
+def test_update_from_any_version_in_the_chain(tmp_path):
+    deltas_dir = tmp_path / "deltas"
+    latest = MAX_DELTAS + 3
+    publish_versions(deltas_dir, latest)
+    for version in range(latest - MAX_DELTAS, latest + 1):
+        updated = update_data(version_data(version), str(version), deltas_dir)
+        assert updated == version_data(latest)
+    # Too far behind: download the full file.
+    assert update_data(version_data(1), "1", deltas_dir) is None
+
+
+def test_plan_update_prefers_the_full_file_when_smaller():
+    index = {
+        "latest_version": "3",
+        "deltas": [
+            {"from": "1", "to": "2", "file": "1-2.json", "bytes": 600},
+            {"from": "2", "to": "3", "file": "2-3.json", "bytes": 600},
+        ],
+    }
+    assert plan_update(index, "3") == []
+    assert [d["file"] for d in plan_update(index, "1")] == ["1-2.json", "2-3.json"]
+    assert plan_update(index, "1", full_bytes=1000) is None
+    assert plan_update(index, "2", full_bytes=1000) == index["deltas"][1:]
+    assert plan_update(index, "0") is None
+    assert plan_update(None, "1") is None
+
+
+def test_no_previous_version_drops_the_chain(tmp_path):
+    deltas_dir = tmp_path / "deltas"
+    publish_versions(deltas_dir, 2)
+    args = argparse.Namespace(deltas_dir=deltas_dir, old_version="", new_version="3")
+    publish(args, "", json.dumps(version_data(3), indent=2))
+    assert load_deltas_index(deltas_dir) == {"latest_version": "3", "deltas": []}
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from data_v3 import decode_data_v3, encode_data_v3
+from make_data_v3 import verify_round_trip
+
+
+def entry(word, sub_entries, categories=(), entry_type="WORD"):
+    return {
+        "entry_in_english": word,
+        "sub_entries": sub_entries,
+        "categories": list(categories),
+        "entry_type": entry_type,
+    }
+
+
+def sub_entry(videos, keywords=(), definitions=None, regions=(0,)):
+    return {
+        "video_links": list(videos),
+        "keywords": list(keywords),
+        "definitions": definitions or {},
+        "regions": list(regions),
+    }
+
+
+DATA = {
+    "data": [
+        entry(
+            "run",
+            [
+                sub_entry(
+                    ["mp4video/12/12345_1.mp4", "mp4video/12/12345_2.mp4"],
+                    ["jog", "sprint"],
+                    {
+                        "As Verb": ["To move fast on foot.", "To operate."],
+                        "As Noun": ["A time spent running."],
+                    },
+                    [1, 2, 3],
+                ),
+                sub_entry(
+                    ["mp4video/13/13000_1.mp4"],
+                    ["jog"],
+                    {"As Modifier": ["Running water."], "As Verb": ["To flow."]},
+                ),
+            ],
+            ["Sport", "Actions"],
+        ),
+        entry(
+            "café",
+            [
+                sub_entry(
+                    ["mp4video/99/99001_1.mp4"],
+                    ["coffee shop", "coffee"],
+                    {"As Noun": ["A place to buy coffee."]},
+                    [],
+                )
+            ],
+            ["Food & drink"],
+            "PHRASE",
+        ),
+        entry(
+            "jog",
+            [sub_entry(["mp4video/12/12399_1.mp4"], ["run"], {"Interactive": []})],
+            ["Sport"],
+        ),
+        entry("zero", [], []),
+    ]
+}
+
+
+def test_round_trip():
+    assert decode_data_v3(encode_data_v3(DATA)) == DATA
+
+
+def test_round_trip_keeps_key_order():
+    text = json.dumps(DATA, indent=2)
+    assert verify_round_trip(encode_data_v3(json.loads(text)), text)
+
+
+def test_common_strings_get_the_smallest_ids():
+    # "jog" is the most used keyword and "Sport" the most used category, so
+    # each is first in its table and so the first string stored.
+    blob = encode_data_v3(DATA)
+    assert blob.index(b"jog") < blob.index(b"sprint")
+    assert blob.index(b"Sport") < blob.index(b"Actions")
+    assert blob.index(b"As Verb") < blob.index(b"Interactive")
+
+
+def test_rejects_what_it_cant_hold():
+    with pytest.raises(ValueError):
+        encode_data_v3({"data": [dict(DATA["data"][0], extra=1)]})
+    with pytest.raises(ValueError):
+        encode_data_v3({"data": [entry("x", [sub_entry(["a/b.mp4"], regions=[-1])])]})
+    with pytest.raises(ValueError):
+        decode_data_v3(b"ADV2")
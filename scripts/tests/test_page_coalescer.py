@@ -0,0 +1,44 @@
+import asyncio
+
+from common import PageCoalescer
+
+
+class Response:
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+def run(coalescer, requests):
+    """Make each batch of [requests] (lists of URLs) concurrently, one batch
+    after another. Returns how many fetches that took."""
+    fetches = 0
+
+    async def fetch():
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0.01)
+        return Response(b"page")
+
+    async def main():
+        for batch in requests:
+            await asyncio.gather(*(coalescer.get(url, fetch) for url in batch))
+
+    asyncio.run(main())
+    return fetches
+
+
+def test_concurrent_requests_share_a_fetch():
+    assert run(PageCoalescer(0, 1 << 20), [["a", "a", "a", "b"]]) == 2
+
+
+def test_nothing_is_remembered_by_default():
+    assert run(PageCoalescer(0, 1 << 20), [["a"], ["a"]]) == 2
+
+
+def test_recent_pages_and_forgetting():
+    coalescer = PageCoalescer(60, 1 << 20)
+    assert run(coalescer, [["a"], ["a"]]) == 1
+    coalescer.forget("a")
+    assert run(coalescer, [["a"], ["a"]]) == 1
+    coalescer.forget_all()
+    assert run(coalescer, [["a"]]) == 1
@@ -0,0 +1,109 @@
+"""
+Every parser backend extracts exactly what html.parser does from the saved
+pages in fixtures/pages (see check_parser_parity.py): letter result pages,
+word and sub-entry pages, category result pages and the home page's category
+dropdown.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from check_parser_parity import run_extractors
+from common import (
+    DEFAULT_PARSER_BACKEND,
+    MEDIA_BASE_URL,
+    PARSER_BACKENDS,
+    set_parser_backend,
+)
+from page_archive import load_corpus
+from scrape_signbank import Region, SubEntry
+
+PAGES_DIR = Path(__file__).parent / "fixtures" / "pages"
+
+# The extractor each page is for, by the start of its file name.
+PAGE_KINDS = {
+    "letter-": "letter_page",
+    "word-": "word_page",
+    "category-": "category_results_page",
+    "home": "categories_dropdown",
+}
+
+
+@pytest.fixture(scope="module")
+def pages():
+    return load_corpus(PAGES_DIR)
+
+
+@pytest.fixture(autouse=True)
+def default_backend():
+    yield
+    set_parser_backend(DEFAULT_PARSER_BACKEND)
+
+
+def test_every_page_parses_as_its_kind(pages):
+    outcomes = run_extractors(pages, DEFAULT_PARSER_BACKEND)
+    for name, _ in pages:
+        kinds = [kind for prefix, kind in PAGE_KINDS.items() if name.startswith(prefix)]
+        for kind in kinds:
+            assert outcomes[(name, kind)][0] == "ok", name
+    assert outcomes[("soft-404.html", "word_page")][0] == "error"
+
+
+def test_word_and_sub_entry_pages(pages):
+    outcomes = run_extractors(pages, DEFAULT_PARSER_BACKEND)
+    word, sub_entry, subpage_urls = outcomes[("word-hello-1.html", "word_page")][1]
+    assert word == "hello"
+    assert sub_entry == SubEntry(
+        video_links=[f"{MEDIA_BASE_URL}/mp4video/63/63850_1.mp4"],
+        keywords=["hi", "g'day", "greetings"],
+        definitions={
+            "As Modifier": [
+                "A greeting, used when you meet someone.",
+                "Used to attract someone's attention & start talking.",
+            ],
+            "Interactive": ["Hello! How are you?"],
+        },
+        regions=list(Region),
+    )
+    assert subpage_urls == [
+        "http://www.auslan.org.au/dictionary/words/hello-2.html",
+        "http://www.auslan.org.au/dictionary/words/hello-3.html",
+    ]
+
+    word, sub_entry, _ = outcomes[("word-hello-2.html", "word_page")][1]
+    assert word == "hello"
+    assert sub_entry.keywords == ["hi"]
+    assert Region.SOUTHERN in sub_entry.regions
+
+
+def test_category_pages(pages):
+    outcomes = run_extractors(pages, DEFAULT_PARSER_BACKEND)
+    assert outcomes[("category-animals-page1.html", "category_results_page")] == (
+        "ok",
+        (["ant", "bird", "cat", "dog", "emu"], 3),
+    )
+    assert outcomes[("category-colours-page1.html", "category_results_page")] == (
+        "ok",
+        (["blue", "red"], 1),
+    )
+    assert outcomes[("home.html", "categories_dropdown")] == (
+        "ok",
+        {
+            "Animal": "animal",
+            "Colour": "colour",
+            "Body part": "body part",
+            "Food & drink": "food & drink",
+            "Number": "number",
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [backend for backend in PARSER_BACKENDS if backend != DEFAULT_PARSER_BACKEND],
+)
+def test_backend_matches_default(pages, backend):
+    assert run_extractors(pages, backend) == run_extractors(
+        pages, DEFAULT_PARSER_BACKEND
+    )
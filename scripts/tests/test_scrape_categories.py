@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import time
+
+from common import append_journal
+from scrape_categories import (
+    JOURNAL_MAX_AGE_HOURS,
+    MAX_LOST_WORDS_PER_CATEGORY,
+    check_data_loss,
+    load_finished_categories,
+)
+
+
+def write_journal(path, records):
+    path.write_text("")
+    for record in records:
+        append_journal(path, record)
+
+
+def test_resumes_from_a_recent_journal(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    write_journal(journal, [{"query": "animal", "words": ["cat", "dog"]}])
+    assert load_finished_categories(journal, fresh=False) == {"animal": ["cat", "dog"]}
+
+
+def test_ignores_a_stale_journal(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    write_journal(journal, [{"query": "animal", "words": ["cat", "dog"]}])
+    stale = time.time() - (JOURNAL_MAX_AGE_HOURS + 1) * 3600
+    os.utime(journal, (stale, stale))
+    assert load_finished_categories(journal, fresh=False) == {}
+    assert journal.read_text() == ""
+
+
+def test_fresh_ignores_the_journal(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    write_journal(journal, [{"query": "animal", "words": ["cat", "dog"]}])
+    assert load_finished_categories(journal, fresh=True) == {}
+    assert journal.read_text() == ""
+
+
+def make_args(tmp_path, old_data, force=False):
+    output_file = tmp_path / "categories.json"
+    output_file.write_text(json.dumps(old_data))
+    journal = tmp_path / "journal.jsonl"
+    write_journal(journal, [{"query": "animal", "words": ["cat"]}])
+    return argparse.Namespace(
+        output_file=str(output_file), categories=None, force=force, journal=journal
+    )
+
+
+def test_data_loss_discards_the_journal(tmp_path):
+    words = [f"word{i}" for i in range(MAX_LOST_WORDS_PER_CATEGORY + 5)]
+    args = make_args(tmp_path, {"Animals": words})
+    assert not check_data_loss(args, {"Animals": words[:2]})
+    assert not args.journal.exists()
+
+
+def test_data_loss_with_force(tmp_path):
+    words = [f"word{i}" for i in range(MAX_LOST_WORDS_PER_CATEGORY + 5)]
+    args = make_args(tmp_path, {"Animals": words}, force=True)
+    assert check_data_loss(args, {"Animals": words[:2]})
+    assert args.journal.exists()
+
+
+def test_small_changes_pass(tmp_path):
+    args = make_args(tmp_path, {"Animals": ["cat", "dog"]})
+    assert check_data_loss(args, {"Animals": ["cat", "emu"]})
+    assert args.journal.exists()
@@ -0,0 +1,114 @@
+import pytest
+
+from make_search_index import check_search_index
+from search_index import SearchIndex, build_search_index, normalise, write_search_index
+
+
+def entry(word, *keywords):
+    return {
+        "entry_in_english": word,
+        "sub_entries": [{"keywords": list(keywords)}],
+    }
+
+
+DATA = {
+    "data": [
+        entry("hello", "hi", "g'day"),
+        entry("help", "assist"),
+        entry("Helicopter"),
+        entry("how much", "price", "cost"),
+        entry("don't", "do not"),
+        entry("hi-fi", "stereo"),
+        entry("be", "exist"),
+    ]
+}
+# Common word ranks, as priority.load_common_word_ranks gives them.
+RANKS = {"be": 0, "help": 1, "hello": 2}
+
+
+@pytest.fixture
+def index():
+    return SearchIndex(build_search_index(DATA, RANKS))
+
+
+@pytest.mark.parametrize(
+    "text, normalised",
+    [
+        ("Hello", "hello"),
+        ("don't", "dont"),
+        ("Don’t", "dont"),
+        ("hi-fi", "hi fi"),
+        ("  how   much?! ", "how much"),
+        ("Straße", "strasse"),
+        ("ｈｅｌｌｏ", "hello"),
+        ("?!", ""),
+    ],
+)
+def test_normalise(text, normalised):
+    assert normalise(text) == normalised
+
+
+def test_entries_are_in_rank_order(index):
+    assert index.entries[:3] == ["be", "help", "hello"]
+    # The rest alphabetically, by their normalised names.
+    assert index.entries[3:] == ["don't", "Helicopter", "hi-fi", "how much"]
+
+
+def test_prefix(index):
+    assert index.prefix("hel") == ["help", "hello", "Helicopter"]
+    # Exact matches first, however they rank.
+    assert index.prefix("hi") == ["hello", "hi-fi"]
+    assert index.prefix("HI") == ["hello", "hi-fi"]
+    assert index.prefix("dont") == ["don't"]
+    assert index.prefix("do") == ["don't"]
+    assert index.prefix("hel", limit=2) == ["help", "hello"]
+    assert index.prefix("zebra") == []
+    assert index.prefix("?") == []
+
+
+def test_keyword(index):
+    assert index.keyword("much") == ["how much"]
+    assert index.keyword("fi") == ["hi-fi"]
+    assert index.keyword("not do") == ["don't"]
+    # Every word somewhere in the entry's name or keywords.
+    assert index.keyword("much price") == ["how much"]
+    assert index.keyword("much stereo") == []
+
+
+def test_search(index):
+    assert index.search("hi") == ["hello", "hi-fi"]
+    assert index.search("much") == ["how much"]
+    assert index.search("h", limit=2) == ["help", "hello"]
+
+
+def test_load_checks_the_version(tmp_path):
+    path = tmp_path / "search_index.json"
+    built = build_search_index(DATA, RANKS)
+    write_search_index(path, built)
+    assert SearchIndex.load(path).prefix("hel") == ["help", "hello", "Helicopter"]
+
+    write_search_index(path, {**built, "entries": list(reversed(built["entries"]))})
+    with pytest.raises(ValueError):
+        SearchIndex.load(path)
+
+
+def test_check_search_index(index):
+    assert check_search_index(index, DATA)
+    index.term_entries[0] = []
+    assert not check_search_index(index, DATA)
+
+
+def test_check_search_index_with_one_letter_words():
+    # "t shirt" and "x ray" have "t " and "x " as two character prefixes,
+    # which SearchIndex.prefix searches for as "t" and "x", so also finding
+    # tea and xylophone.
+    data = {
+        "data": [
+            *DATA["data"],
+            entry("T-shirt"),
+            entry("tea"),
+            entry("x-ray"),
+            entry("xylophone"),
+        ]
+    }
+    assert check_search_index(SearchIndex(build_search_index(data, RANKS)), data)
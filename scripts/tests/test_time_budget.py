@@ -0,0 +1,42 @@
+"""
+scrape_all_letters --time-budget: a letter or batch still running when the
+budget runs out is cancelled, not waited for.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from scrape_all_letters import OutOfTime, before_deadline
+
+
+async def slow(seconds: float, result: str) -> str:
+    await asyncio.sleep(seconds)
+    return result
+
+
+def test_finishes_without_a_deadline():
+    assert asyncio.run(before_deadline(None, slow(0.01, "done"))) == "done"
+
+
+def test_finishes_before_the_deadline():
+    deadline = time.monotonic() + 5
+    assert asyncio.run(before_deadline(deadline, slow(0.01, "done"))) == "done"
+
+
+def test_cancels_at_the_deadline():
+    cancelled = []
+
+    async def letter():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    started = time.monotonic()
+    with pytest.raises(OutOfTime):
+        asyncio.run(before_deadline(started + 0.05, letter()))
+    assert cancelled == [True]
+    assert time.monotonic() - started < 1
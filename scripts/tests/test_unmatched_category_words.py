@@ -0,0 +1,45 @@
+"""
+log_unmatched_category_words, which scrapes and merges run after attaching
+categories: the category words that aren't an entry's name get the entry
+names spelled most like them.
+"""
+
+import logging
+
+from common import LOG
+from scrape_signbank import log_unmatched_category_words
+
+WORD_TO_INFO = {name: {} for name in ["hello", "help", "kangaroo", "cat", "dog"]}
+
+
+def test_suggests_the_nearest_names(caplog):
+    with caplog.at_level(logging.INFO, logger=LOG.name):
+        log_unmatched_category_words(
+            WORD_TO_INFO,
+            {
+                "helo": ["Greeting"],
+                "Kangaro": ["Australia"],
+                "kangaro": ["Animal"],
+                "xylophone": ["Music"],
+                "cat": ["Animal"],
+            },
+        )
+    assert "4 category words aren't the name of any entry" in caplog.messages
+    assert (
+        "Category word 'helo' (Greeting): did you mean 'hello', 'help'?"
+        in caplog.messages
+    )
+    assert (
+        "Category word 'kangaro' (Animal): did you mean 'kangaroo'?" in caplog.messages
+    )
+    assert (
+        "Category word 'Kangaro' (Australia): did you mean 'kangaroo'?"
+        in caplog.messages
+    )
+    assert "Category word 'xylophone' (Music): no entry is close" in caplog.messages
+
+
+def test_logs_nothing_when_every_word_matches(caplog):
+    with caplog.at_level(logging.INFO, logger=LOG.name):
+        log_unmatched_category_words(WORD_TO_INFO, {"cat": ["Animal"]})
+    assert caplog.messages == []
@@ -0,0 +1,53 @@
+from word_urls import KnownBadUrls, canonical_word_url, select_word_page_urls
+
+BAD = "http://www.auslan.org.au/dictionary/words/gone-1.html"
+GOOD = "http://www.auslan.org.au/dictionary/words/hello-1.html"
+
+
+def test_canonical_word_url():
+    assert canonical_word_url("/dictionary/words/hello-1.html/") == GOOD
+    assert (
+        canonical_word_url("https://auslan.org.au//dictionary/words/hello-1.html")
+        == GOOD
+    )
+    assert (
+        canonical_word_url("/dictionary/words/how much-1.html#top")
+        == "http://www.auslan.org.au/dictionary/words/how%20much-1.html"
+    )
+
+
+def test_known_bad_after_two_runs(tmp_path):
+    path = tmp_path / "known_bad_urls.json"
+
+    # One failure, even seen twice in the run, isn't enough to skip it.
+    known_bad = KnownBadUrls(path, recheck_days=14)
+    known_bad.record([BAD, GOOD], [BAD])
+    known_bad.record([BAD], [BAD])
+    known_bad.save()
+    assert not known_bad.should_skip(BAD)
+    assert select_word_page_urls([BAD, GOOD], known_bad) == [BAD, GOOD]
+
+    known_bad = KnownBadUrls(path, recheck_days=14)
+    assert not known_bad.should_skip(BAD)
+    known_bad.record([BAD], [BAD])
+    known_bad.save()
+    assert known_bad.should_skip(BAD)
+    assert select_word_page_urls([BAD, GOOD], known_bad) == [GOOD]
+
+    # Rechecked once the recheck window is up, and forgotten if it parses.
+    known_bad = KnownBadUrls(path, recheck_days=0)
+    assert not known_bad.should_skip(BAD)
+    known_bad.record([BAD], [])
+    assert BAD not in known_bad.urls
+
+
+def test_known_bad_file_without_runs(tmp_path):
+    path = tmp_path / "known_bad_urls.json"
+    path.write_text(
+        f'{{"{BAD}": {{"first_seen": "2026-01-01T00:00:00+00:00", '
+        '"last_seen": "2099-01-01T00:00:00+00:00"}}'
+    )
+    known_bad = KnownBadUrls(path, recheck_days=14)
+    assert not known_bad.should_skip(BAD)
+    known_bad.record([BAD], [BAD])
+    assert known_bad.should_skip(BAD)
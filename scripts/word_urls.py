@@ -0,0 +1,145 @@
+"""
+Canonicalising and deduplicating word page URLs before they're fetched, and
+remembering the ones that are known to be bad across runs.
+
+The letter result pages list some word pages more than once (once per keyword,
+say), and some in variant forms, e.g. with a trailing slash after ".html".
+Signbank answers those variants with a "page not found" page, with a 200, so
+each one used to cost a fetch, a parse and a warning. Collapsing every
+variant to one canonical URL and fetching each of those once avoids that.
+
+Word pages that still don't parse are recorded in a small JSON file
+(--known-bad-file). Once one has failed on KNOWN_BAD_MIN_RUNS separate runs,
+so a single transient failure doesn't count, it's skipped on later runs until
+--known-bad-recheck-days have passed and it's tried again, since the index
+sometimes runs ahead of the pages it links to.
+"""
+
+import datetime
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote, unquote, urljoin, urlsplit, urlunsplit
+
+from common import LOG
+
+SITE_ROOT = "http://www.auslan.org.au"
+
+# Hosts that serve the same site as SITE_ROOT.
+SITE_HOSTS = {"auslan.org.au", "www.auslan.org.au"}
+
+DEFAULT_KNOWN_BAD_RECHECK_DAYS = 14
+
+# How many separate runs a word page has to fail to parse on before it's
+# skipped.
+KNOWN_BAD_MIN_RUNS = 2
+
+# Characters left as they are when re-quoting a path.
+_PATH_SAFE = "/:@!$&'()*+,;=-._~"
+
+
+def canonical_word_url(href: str) -> str:
+    """
+    The canonical form of a word page link, which may be relative to the site
+    root: on SITE_ROOT's scheme and host, with duplicate slashes, a trailing
+    slash after ".html" and any fragment dropped, and percent-encoding
+    normalised.
+    """
+    scheme, netloc, path, query, _ = urlsplit(urljoin(SITE_ROOT + "/", href))
+    if netloc.lower() in SITE_HOSTS:
+        scheme, netloc = urlsplit(SITE_ROOT)[:2]
+    path = re.sub("/{2,}", "/", path)
+    if path.endswith(".html/"):
+        path = path.rstrip("/")
+    path = quote(unquote(path), safe=_PATH_SAFE)
+    return urlunsplit((scheme.lower(), netloc.lower(), path, query, ""))
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class KnownBadUrls:
+    """
+    The known-bad file at [path]: word page URL -> {"first_seen",
+    "last_seen", "runs"}, when it first and last failed to parse and on how
+    many runs. Missing means none are known. Without a [path] nothing is
+    remembered between runs. One instance is one run.
+    """
+
+    def __init__(self, path: Optional[Path], recheck_days: int):
+        self.path = Path(path) if path else None
+        self.recheck_days = recheck_days
+        self.urls: Dict[str, dict] = {}
+        if self.path and self.path.exists():
+            with open(self.path) as f:
+                self.urls = json.load(f)
+        # Failures already counted this run, so a page that fails twice in
+        # one run (e.g. when a letter is retried) only counts once.
+        self._counted = set()
+
+    def should_skip(self, url: str) -> bool:
+        known = self.urls.get(url)
+        # Files from before "runs" was kept only recorded a single failure.
+        if known is None or known.get("runs", 1) < KNOWN_BAD_MIN_RUNS:
+            return False
+        last_seen = datetime.datetime.fromisoformat(known["last_seen"])
+        return _now() - last_seen < datetime.timedelta(days=self.recheck_days)
+
+    def record(self, fetched: Iterable[str], unparseable: Iterable[str]):
+        """After a scrape: [unparseable] are the word pages among [fetched]
+        that didn't parse. The others are no longer bad, if they were."""
+        stamp = _now().isoformat(timespec="seconds")
+        unparseable = set(unparseable)
+        for url in fetched:
+            if url in unparseable:
+                known = self.urls.setdefault(url, {"first_seen": stamp, "runs": 0})
+                known["last_seen"] = stamp
+                if url not in self._counted:
+                    self._counted.add(url)
+                    known["runs"] = known.get("runs", 1) + 1
+            elif self.urls.pop(url, None) is not None:
+                LOG.info(f"{url} parses again, no longer known bad")
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".part")
+        with open(tmp_path, "w") as f:
+            json.dump(self.urls, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def select_word_page_urls(
+    urls: List[str], known_bad: Optional[KnownBadUrls] = None
+) -> List[str]:
+    """
+    Canonicalise [urls], drop duplicates (keeping the first, so the order is
+    as before) and, with [known_bad], the ones that are known to be bad and
+    not due a recheck. Logs how many fetches that saves.
+    """
+    selected = []
+    seen = set()
+    rewritten = duplicates = skipped = 0
+    for url in urls:
+        canonical = canonical_word_url(url)
+        if canonical != url:
+            rewritten += 1
+        if canonical in seen:
+            duplicates += 1
+            continue
+        seen.add(canonical)
+        if known_bad is not None and known_bad.should_skip(canonical):
+            skipped += 1
+            continue
+        selected.append(canonical)
+    saved = len(urls) - len(selected)
+    if saved or rewritten:
+        LOG.info(
+            f"Word page URLs: {len(urls)} listed, {rewritten} canonicalised, "
+            f"{duplicates} duplicates and {skipped} known bad skipped; fetching "
+            f"{len(selected)}, saving {saved} word page fetches"
+        )
+    return selected